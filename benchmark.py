@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""Measures the performance of the Lemke-Howson algorithm on generated
+games and writes the results in JSON, so they can be compared across
+commits.
+"""
+
+
+import getopt
+import os
+import platform
+import subprocess
+import sys
+import time
+
+
+USAGE = """Measures the performance of the Lemke-Howson algorithm on generated games.
+
+Usage: python benchmark.py [options]
+       python benchmark.py --compare old.json new.json
+
+Options:
+    -h, --help             Print this help and exit.
+    -b, --backends NAMES   Comma-separated list of backends to be measured
+                           (default: all available backends).
+    -F, --fields NAMES     Comma-separated list of number fields to be
+                           measured with every backend (rational, fraction,
+                           float, gmpy); combinations that are not supported
+                           are skipped (default: the default field of every
+                           backend).
+    -g, --games NAMES      Comma-separated list of game generators:
+                             random             - random payoffs
+                             coordination       - coordination games
+                             savani-von-stengel - games with exponentially
+                                                  long paths (even sizes only)
+                           (default: all generators).
+    -s, --sizes SIZES      Comma-separated list of numbers of strategies
+                           of both players (default: sizes listed below).
+    -r, --repeat N         Number of measured runs of every game; the best
+                           time is reported (default: 3).
+    -t, --time-limit SECS  Larger games of a generator are skipped for
+                           a backend once a game takes more than SECS seconds
+                           (default: 10).
+    -p, --max-pivots N     A game is considered failed (and larger games
+                           of the same generator are skipped for the backend)
+                           when it needs more than N pivoting steps, which
+                           may happen when a floating-point backend cycles
+                           because of rounding errors (default: 100000).
+    -o, --output FILE      Write the results into FILE instead of
+                           the standard output.
+    --compare OLD NEW      Compare two result files and print the speedup
+                           of every measured game.
+
+Default sizes:
+    random, coordination:  5, 10, 20, 50, 100, 200, 500
+    savani-von-stengel:    4, 6, 8, 10, 12, 14, 16
+"""
+
+# Default sizes of games (for every generator)
+DEFAULT_SIZES = {
+    'random': [5, 10, 20, 50, 100, 200, 500],
+    'coordination': [5, 10, 20, 50, 100, 200, 500],
+    'savani-von-stengel': [4, 6, 8, 10, 12, 14, 16],
+}
+
+
+def countPivots(m1, m2, backend, field, maxPivots):
+    """Returns the number of pivoting steps made by lh.lemkeHowson() on
+    the selected game.
+
+    Raises pathlimits.PivotLimitExceededError if more than maxPivots steps
+    are needed. Raises ValueError if the path does not end in an equilibrium
+    (e.g. when a floating-point backend loses precision).
+    """
+    import src.lh
+    import src.pathlimits
+
+    engine = src.lh.getEngine(backend, field=field)
+    t = engine.createTableaux(m1, m2, engine.getNormalizationConstant(m1, m2))
+    pivots = 0
+    for step in src.lh.followPathSteps(engine, t, m1.getNumRows(), 1,
+            limits=src.pathlimits.PathLimits(maxPivots=maxPivots)):
+        pivots += 1
+    engine.getEquilibrium(t, m1.getNumRows())
+    return pivots
+
+
+def measure(m1, m2, backend, field, repeat):
+    """Returns the lowest time (in seconds) of repeat runs of lh.lemkeHowson()
+    on the selected game."""
+    import src.lh
+
+    times = []
+    for i in xrange(0, repeat):
+        startTime = time.time()
+        src.lh.lemkeHowson(m1, m2, backend, field=field)
+        times.append(time.time() - startTime)
+    return min(times)
+
+
+def getCommit():
+    """Returns the current git commit or None if it cannot be obtained."""
+    try:
+        p = subprocess.Popen(['git', 'rev-parse', 'HEAD'],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.abspath(__file__)))
+        out = p.communicate()[0]
+        if p.returncode == 0:
+            return out.strip()
+    except OSError:
+        pass
+    return None
+
+
+def runBenchmarks(configs, generators, sizes, repeat, timeLimit, maxPivots,
+        log):
+    """Runs the selected benchmarks and returns a list of results
+    (dictionaries with keys game, size, backend, field, seconds and pivots;
+    seconds and pivots are None and there is an additional key error
+    if the game could not be solved). configs is a list of tuples (backend,
+    field), where field is None for the default field of the backend.
+    Progress is written into log."""
+    import src.games
+    import src.lh
+    import src.pathlimits
+
+    results = []
+    for gameName in generators:
+        generator = src.games.GENERATORS[gameName]
+        gameSizes = sizes or DEFAULT_SIZES[gameName]
+        for (backend, field) in configs:
+            name = backend if field is None else '%s/%s' % (backend, field)
+            for size in gameSizes:
+                try:
+                    (m1, m2) = generator(size)
+                except ValueError:
+                    # The generator does not support this size
+                    continue
+                result = {'game': gameName, 'size': size, 'backend': backend,
+                    'field': field, 'seconds': None, 'pivots': None}
+                results.append(result)
+                try:
+                    result['pivots'] = countPivots(m1, m2, backend, field,
+                        maxPivots)
+                except (src.pathlimits.PivotLimitExceededError, ValueError), e:
+                    result['error'] = str(e)
+                    log.write('%s\t%d\t%s\terror\t%s\n' % (gameName, size,
+                        name, e))
+                    break
+                result['seconds'] = measure(m1, m2, backend, field, repeat)
+                log.write('%s\t%d\t%s\t%.6f\t%d\n' % (gameName, size,
+                    name, result['seconds'], result['pivots']))
+                if result['seconds'] > timeLimit:
+                    break
+    return results
+
+
+def compareResults(oldFileName, newFileName, stream):
+    """Prints the speedup of every game measured in both selected result
+    files."""
+    import json
+
+    def load(fileName):
+        f = open(fileName)
+        try:
+            data = json.load(f)
+        finally:
+            f.close()
+        return dict([((r['game'], r['size'], r['backend'], r.get('field')), r)
+            for r in data['results']])
+
+    old = load(oldFileName)
+    new = load(newFileName)
+    stream.write('game\tsize\tbackend\told\tnew\tspeedup\n')
+    for key in sorted(set(old) & set(new)):
+        (oldSecs, newSecs) = (old[key]['seconds'], new[key]['seconds'])
+        if oldSecs is None or newSecs is None:
+            continue
+        speedup = oldSecs / newSecs if newSecs > 0 else float('inf')
+        (gameName, size, backend, field) = key
+        if field is not None:
+            backend = '%s/%s' % (backend, field)
+        stream.write('%s\t%d\t%s\t%.6f\t%.6f\t%.2f\n' % (gameName, size,
+            backend, oldSecs, newSecs, speedup))
+
+
+def main():
+    try:
+        # These imports must be here because of possible
+        # SyntaxError exceptions in different versions of python
+        # (this program needs python 2.6 because of the json module)
+        import json
+        import src.games
+        import src.lh
+        import src.numfields
+
+        # Check program arguments
+        try:
+            opts, args = getopt.getopt(sys.argv[1:], 'hb:F:g:s:r:t:p:o:',
+                ['help', 'backends=', 'fields=', 'games=', 'sizes=',
+                 'repeat=', 'time-limit=', 'max-pivots=', 'output=',
+                 'compare'])
+        except getopt.GetoptError:
+            sys.stderr.write(USAGE)
+            return 1
+        backends = None
+        fields = [None]
+        generators = sorted(src.games.GENERATORS.keys())
+        sizes = None
+        repeat = 3
+        timeLimit = 10.0
+        maxPivots = 100000
+        outFileName = None
+        compare = False
+        for opt, val in opts:
+            if opt in ['-h', '--help']:
+                sys.stdout.write(USAGE)
+                return 1
+            elif opt in ['-b', '--backends']:
+                backends = val.split(',')
+            elif opt in ['-F', '--fields']:
+                fields = val.split(',')
+            elif opt in ['-g', '--games']:
+                generators = val.split(',')
+            elif opt in ['-s', '--sizes']:
+                sizes = [int(size) for size in val.split(',')]
+            elif opt in ['-r', '--repeat']:
+                repeat = int(val)
+            elif opt in ['-t', '--time-limit']:
+                timeLimit = float(val)
+            elif opt in ['-p', '--max-pivots']:
+                maxPivots = int(val)
+            elif opt in ['-o', '--output']:
+                outFileName = val
+            elif opt == '--compare':
+                compare = True
+
+        if compare:
+            if len(args) != 2:
+                sys.stderr.write(USAGE)
+                return 1
+            compareResults(args[0], args[1], sys.stdout)
+            return 0
+        if args:
+            sys.stderr.write(USAGE)
+            return 1
+
+        for gameName in generators:
+            if gameName not in src.games.GENERATORS:
+                raise ValueError, 'Unknown game generator: %s.' % gameName
+        # Use all combinations of backends and fields whose dependencies
+        # are installed (unknown backends and fields are errors)
+        for backend in backends or []:
+            if backend not in src.lh.BACKENDS:
+                raise ValueError, 'Unknown backend: %s.' % backend
+        for field in fields:
+            if field is not None and field not in src.numfields.FIELDS:
+                raise ValueError, 'Unknown number field: %s.' % field
+        configs = []
+        for backend in backends or src.lh.BACKENDS:
+            for field in fields:
+                try:
+                    src.lh.getEngine(backend, field=field)
+                    configs.append((backend, field))
+                except ImportError:
+                    sys.stderr.write('Skipping backend %s with field %s ' \
+                        '(missing dependency).\n' % (backend, field))
+                except ValueError, e:
+                    sys.stderr.write('Skipping backend %s with field %s ' \
+                        '(%s)\n' % (backend, field, e))
+
+        results = runBenchmarks(configs, generators, sizes, repeat,
+            timeLimit, maxPivots, sys.stderr)
+        data = {'commit': getCommit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+            'maxPivots': maxPivots,
+            'results': results}
+
+        if outFileName is not None:
+            f = open(outFileName, 'w')
+        else:
+            f = sys.stdout
+        try:
+            json.dump(data, f, indent=1, sort_keys=True)
+            f.write('\n')
+        finally:
+            if f is not sys.stdout:
+                f.close()
+
+        return 0
+    except SyntaxError:
+        sys.stderr.write('Need python 2.6 to run this program.\n')
+    except Exception, e:
+        sys.stderr.write('Error: ' + str(e) + '\n')
+        return 1
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""Converts a game from the text format into a binary game file."""
+
+
+import getopt
+import sys
+
+
+USAGE = """Converts a game from the text format into a binary game file.
+
+Usage: python convert-game.py [-t TYPE] inputgame.txt outputgame.lhg
+
+Options:
+    -h, --help             Print this help and exit.
+    -t, --type TYPE        Type of stored payoffs:
+                             int64    - 64-bit signed integers (default)
+                             float64  - 64-bit floating-point numbers
+                             rational - pairs of 64-bit signed integers
+"""
+
+
+def main():
+    try:
+        # These imports must be here because of possible
+        # SyntaxError exceptions in different versions of python
+        # (this program needs python 2.5)
+        import src.io
+
+        # Check program arguments
+        try:
+            opts, args = getopt.getopt(sys.argv[1:], 'ht:', ['help', 'type='])
+        except getopt.GetoptError:
+            sys.stderr.write(USAGE)
+            return 1
+        if len(args) != 2:
+            sys.stderr.write(USAGE)
+            return 1
+        itemType = 'int64'
+        for opt, val in opts:
+            if opt in ['-h', '--help']:
+                sys.stdout.write(USAGE)
+                return 1
+            elif opt in ['-t', '--type']:
+                itemType = val
+        if itemType not in src.io.BINARY_ITEM_TYPES:
+            raise ValueError, 'Invalid item type: %s.' % itemType
+        (inFileName, outFileName) = args
+
+        m1, m2 = src.io.readGameFile(inFileName)
+        f = open(outFileName, 'wb')
+        try:
+            src.io.writeBinaryGame(m1, m2, f, itemType)
+        finally:
+            f.close()
+
+        return 0
+    except SyntaxError:
+        sys.stderr.write('Need python 2.5 to run this program.\n')
+    except Exception, e:
+        sys.stderr.write('Error: ' + str(e) + '\n')
+        return 1
+
+
+if __name__ == '__main__':
+    main()
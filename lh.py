@@ -10,6 +10,7 @@ using the Lemke-Howson algorithm.
 """
 
 
+import getopt
 import sys
 
 
@@ -21,22 +22,142 @@ def main():
         import src.io
         import src.lh
 
-        # Check program arguments (there should be none)
-        if len(sys.argv) > 1:
-            stream = sys.stderr
-            if sys.argv[1] in ['-h', '--help']:
-                stream = sys.stdout
-            src.io.printHelp(stream)
+        # Check program arguments
+        try:
+            opts, args = getopt.getopt(sys.argv[1:], 'hb:aj:f:',
+                ['help', 'backend=', 'all-labels', 'jobs=', 'batch', 'file=',
+                 'stats=', 'field=', 'max-pivots=', 'timeout=',
+                 'detect-cycles', 'serve='])
+        except getopt.GetoptError:
+            src.io.printHelp(sys.stderr)
             return 1
+        if args:
+            src.io.printHelp(sys.stderr)
+            return 1
+        backend = 'auto'
+        allLabels = False
+        batch = False
+        jobs = 1
+        fileName = None
+        statsFileName = None
+        field = None
+        maxPivots = None
+        timeout = None
+        detectCycles = False
+        serveAddress = None
+        for opt, val in opts:
+            if opt in ['-h', '--help']:
+                src.io.printHelp(sys.stdout)
+                return 1
+            elif opt in ['-b', '--backend']:
+                backend = val
+            elif opt in ['-a', '--all-labels']:
+                allLabels = True
+            elif opt == '--batch':
+                batch = True
+            elif opt in ['-j', '--jobs']:
+                try:
+                    jobs = int(val)
+                except ValueError:
+                    jobs = 0
+                if jobs <= 0:
+                    raise ValueError, 'Invalid number of jobs: %s.' % val
+            elif opt in ['-f', '--file']:
+                fileName = val
+            elif opt == '--stats':
+                statsFileName = val
+            elif opt == '--field':
+                field = val
+            elif opt == '--max-pivots':
+                maxPivots = int(val)
+            elif opt == '--timeout':
+                timeout = float(val)
+            elif opt == '--detect-cycles':
+                detectCycles = True
+            elif opt == '--serve':
+                serveAddress = val
+
+        # Paths are limited only when some limit is selected
+        limits = None
+        if maxPivots is not None or timeout is not None or detectCycles:
+            import src.pathlimits
+            limits = src.pathlimits.PathLimits(maxPivots, timeout,
+                detectCycles)
+
+        if serveAddress is not None:
+            # Solve games sent over a socket until the program is interrupted
+            if allLabels or batch or fileName is not None or \
+                    statsFileName is not None:
+                raise ValueError, '--serve cannot be used with ' +\
+                    '--all-labels, --batch, --file or --stats.'
+            import src.server
+            server = src.server.SolverServer(
+                src.server.parseAddress(serveAddress), backend,
+                field=field, limits=limits, processes=jobs)
+            try:
+                sys.stderr.write('Listening on %s.\n' % (server.address,))
+                server.serveForever()
+            except KeyboardInterrupt:
+                pass
+            server.close()
+            return 0
+
+        if batch:
+            # Solve all games from the standard input and print one line
+            # per game
+            if allLabels:
+                raise ValueError, '--batch cannot be used with --all-labels.'
+            if fileName is not None:
+                raise ValueError, '--batch cannot be used with --file.'
+            if statsFileName is not None:
+                raise ValueError, '--batch cannot be used with --stats.'
+            import src.batch
+            failures = src.batch.runBatch(sys.stdin, sys.stdout, backend,
+                processes=jobs, field=field, limits=limits)
+            return 1 if failures > 0 else 0
+
+        # Obtain input matrices from the selected file or from the standard
+        # input
+        if fileName is not None:
+            m1, m2 = src.io.readGameFile(fileName)
+        else:
+            m1, m2 = src.io.readInputMatrices(sys.stdin)
+
+        # Pivoting steps are recorded only when they are needed
+        stats = None
+        if statsFileName is not None:
+            if allLabels and jobs > 1:
+                raise ValueError, '--stats cannot be used with --all-labels ' +\
+                    'and --jobs.'
+            import src.pivotstats
+            stats = src.pivotstats.PivotStats()
 
-        # Obtain input matrices from the standard input
-        m1, m2 = src.io.parseInputMatrices(sys.stdin.read())
+        if allLabels:
+            # Compute equilibria from all labels and print both matrices
+            # and the results
+            if jobs > 1:
+                import src.parallel
+                eqs = src.parallel.lemkeHowsonAllLabels(m1, m2, backend,
+                    processes=jobs, field=field, limits=limits)
+            else:
+                eqs = src.lh.lemkeHowsonAllLabels(m1, m2, backend,
+                    stats=stats, field=field, limits=limits)
+            src.io.printAllLabelsGameInfo(m1, m2, eqs, sys.stdout)
+        else:
+            # Compute the equilibirum
+            eq = src.lh.lemkeHowson(m1, m2, backend, stats=stats,
+                field=field, limits=limits)
 
-        # Compute the equilibirum
-        eq = src.lh.lemkeHowson(m1, m2)
+            # Print both matrices and the result
+            src.io.printGameInfo(m1, m2, eq, sys.stdout)
 
-        # Print both matrices and the result
-        src.io.printGameInfo(m1, m2, eq, sys.stdout)
+        # Write the recorded pivoting steps
+        if stats is not None:
+            f = open(statsFileName, 'w')
+            try:
+                stats.writeJson(f)
+            finally:
+                f.close()
 
         return 0
     except SyntaxError:
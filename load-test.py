@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""Measures the latency and the throughput of a solver server (see
+lh.py --serve) by sending random games over concurrent connections.
+"""
+
+
+import getopt
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+USAGE = """Measures the latency and the throughput of a solver server.
+
+Usage: python load-test.py [options] [ADDRESS]
+
+ADDRESS is the address of a running server (see lh.py --serve). If it is
+omitted, a server is started in this process on a temporary Unix domain socket.
+
+Options:
+    -h, --help             Print this help and exit.
+    -c, --connections N    Number of concurrent connections (default: 4).
+    -n, --requests N       Number of requests sent over every connection
+                           (default: 100).
+    -s, --size N           Number of strategies of both players in sent
+                           games (default: 10).
+    --json                 Send requests in the JSON format instead of
+                           the text format.
+    -j, --jobs N           Number of worker processes of the started server
+                           (only when ADDRESS is omitted, default: 1).
+"""
+
+
+def percentile(sortedValues, p):
+    """Returns the pth percentile (0 <= p <= 100) of the selected sorted
+    values."""
+    k = int(round(p / 100.0 * (len(sortedValues) - 1)))
+    return sortedValues[k]
+
+
+def runConnection(address, games, useJson, latencies, errors):
+    """Sends the selected games over a single connection and appends
+    latencies of all requests (and the number of errors) into the selected
+    lists."""
+    import src.server
+
+    client = src.server.SolverClient(address)
+    try:
+        for (m1, m2) in games:
+            startTime = time.time()
+            if useJson:
+                rows = [m.getNumRows() for m in (m1, m2)]
+                request = dict([(name,
+                    [m.getRow(i) for i in xrange(1, rows[k] + 1)])
+                    for (k, (name, m)) in enumerate((('m1', m1), ('m2', m2)))])
+                status = client.solveJson(request)['status']
+            else:
+                status = client.solveGame(m1, m2)[0]
+            latencies.append(time.time() - startTime)
+            if status != 'ok':
+                errors.append(status)
+    finally:
+        client.close()
+
+
+def main():
+    try:
+        # These imports must be here because of possible
+        # SyntaxError exceptions in different versions of python
+        # (this program needs python 2.6 because of the json module)
+        import src.games
+        import src.server
+
+        # Check program arguments
+        try:
+            opts, args = getopt.getopt(sys.argv[1:], 'hc:n:s:j:',
+                ['help', 'connections=', 'requests=', 'size=', 'json',
+                 'jobs='])
+        except getopt.GetoptError:
+            sys.stderr.write(USAGE)
+            return 1
+        if len(args) > 1:
+            sys.stderr.write(USAGE)
+            return 1
+        connections = 4
+        requests = 100
+        size = 10
+        useJson = False
+        jobs = 1
+        for opt, val in opts:
+            if opt in ['-h', '--help']:
+                sys.stdout.write(USAGE)
+                return 1
+            elif opt in ['-c', '--connections']:
+                connections = int(val)
+            elif opt in ['-n', '--requests']:
+                requests = int(val)
+            elif opt in ['-s', '--size']:
+                size = int(val)
+            elif opt == '--json':
+                useJson = True
+            elif opt in ['-j', '--jobs']:
+                jobs = int(val)
+        if connections <= 0 or requests <= 0 or size <= 0 or jobs <= 0:
+            raise ValueError, 'All numbers have to be positive.'
+
+        # Start a server in this process if there is no running server
+        server = None
+        if args:
+            address = src.server.parseAddress(args[0])
+        else:
+            tempDir = tempfile.mkdtemp()
+            server = src.server.SolverServer(os.path.join(tempDir, 'lh.sock'),
+                processes=jobs)
+            address = server.address
+            serverThread = threading.Thread(target=server.serveForever)
+            serverThread.setDaemon(True)
+            serverThread.start()
+
+        # Every connection sends different games
+        latencies = []
+        errors = []
+        threads = []
+        for c in xrange(0, connections):
+            games = [src.games.randomGame(size, size, 100,
+                seed=c * requests + k) for k in xrange(0, requests)]
+            threads.append(threading.Thread(target=runConnection,
+                args=(address, games, useJson, latencies, errors)))
+        startTime = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.time() - startTime
+
+        if server is not None:
+            server.shutdown()
+            server.close()
+            os.rmdir(tempDir)
+
+        latencies.sort()
+        if len(latencies) != connections * requests:
+            raise ValueError, 'Some connections failed.'
+        sys.stdout.write('requests:    %d (%d errors)\n' % (len(latencies),
+            len(errors)))
+        sys.stdout.write('time:        %.3f s\n' % seconds)
+        sys.stdout.write('throughput:  %.1f requests/s\n' %
+            (len(latencies) / seconds))
+        sys.stdout.write('latency:     mean %.2f ms, p50 %.2f ms, ' %
+            (1000 * sum(latencies) / len(latencies),
+             1000 * percentile(latencies, 50)) +
+            'p95 %.2f ms, max %.2f ms\n' %
+            (1000 * percentile(latencies, 95), 1000 * latencies[-1]))
+
+        return 0
+    except SyntaxError:
+        sys.stderr.write('Need python 2.6 to run this program.\n')
+    except Exception, e:
+        sys.stderr.write('Error: ' + str(e) + '\n')
+        return 1
+
+
+if __name__ == '__main__':
+    main()
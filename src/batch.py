@@ -0,0 +1,150 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module solves many games from a single input (batch mode).
+
+Games are read from the input one at a time and solved one by one or
+in a pool of worker processes. A failure of one game does not stop
+the batch - it is reported in the result of that game instead.
+"""
+
+
+import collections
+import time
+
+import io
+import lh
+import solver
+
+
+def solveGame(game, backend=lh.AUTO_BACKEND, tol=None, field=None,
+        limits=None, solvers=None, initBasisVar=1):
+    """Computes the equilibrium of the selected game.
+
+    game - tuple of two matrices (m1, m2) or an exception raised while
+           the game was being read (see io.iterInputGames())
+    backend - pivoting engine to be used (see lh.lemkeHowson())
+    tol - tolerance used by floating-point backends (see lh.lemkeHowson())
+    field - number field used by the backend (see lh.lemkeHowson())
+    limits - limits of the path (see lh.lemkeHowson()); a game that exceeds
+             them is reported as an error
+    solvers - solvers reused for games of the same size (dictionary
+              (rows, cols, backend) -> solver.LemkeHowsonSolver, new solvers
+              are added into it) or None if a new tableaux should be created
+              for every game
+    initBasisVar - the initially dropped label (see lh.lemkeHowson())
+
+    Returns a tuple (eq, error, seconds), where eq is the found equilibrium
+    (None if the game could not be solved), error is the error message
+    (None if the game was solved) and seconds is the time spent
+    on solving the game (number).
+    """
+    if isinstance(game, Exception):
+        return (None, str(game), 0.0)
+
+    startTime = time.time()
+    try:
+        (m1, m2) = game
+        if solvers is None:
+            eq = lh.lemkeHowson(m1, m2, backend, tol, initBasisVar,
+                field=field, limits=limits)
+        else:
+            (rows, cols) = (m1.getNumRows(), m1.getNumCols())
+            gameBackend = lh.selectBackend(m1, m2, backend)
+            key = (rows, cols, gameBackend)
+            if key not in solvers:
+                solvers[key] = solver.LemkeHowsonSolver(rows, cols,
+                    gameBackend, tol, field)
+            eq = solvers[key].solve(m1, m2, initBasisVar, limits=limits)
+        return (eq, None, time.time() - startTime)
+    except Exception, e:
+        return (None, str(e), time.time() - startTime)
+
+
+def solveGames(games, backend=lh.AUTO_BACKEND, tol=None, processes=1,
+        field=None, limits=None):
+    """Solves the selected games and yields their results (see solveGame())
+    in the same order as the games were given.
+
+    games - iterable of games (see solveGame())
+    backend - pivoting engine to be used (see lh.lemkeHowson())
+    tol - tolerance used by floating-point backends (see lh.lemkeHowson())
+    processes - number of worker processes (number); if it is 1, games
+                are solved one by one in the current process
+    field - number field used by the backend (see lh.lemkeHowson())
+    limits - limits of every path (see solveGame())
+
+    When games are solved in the current process, solvers (and their
+    tableaux) are reused for games of the same size (see solveGame()).
+    When a pool of worker processes is used, at most 2 * processes games
+    are being solved at once, so games are taken from the selected iterable
+    only when they are needed.
+    """
+    if processes == 1:
+        solvers = {}
+        for game in games:
+            yield solveGame(game, backend, tol, field, limits, solvers)
+        return
+
+    # This import must be here because of python 2.5 (it does not have
+    # the multiprocessing module)
+    import multiprocessing
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        pending = collections.deque()
+        for game in games:
+            pending.append(pool.apply_async(solveGame,
+                (game, backend, tol, field, limits)))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+
+
+def printResult(gameNum, result, stream):
+    """Prints the selected result of a game as a single line to the selected
+    stream. The line contains tab-separated game number, status (ok or
+    error), time spent on the game in seconds and either the found
+    equilibrium or the error message.
+
+    gameNum - number of the game (number)
+    result - result of the game (see solveGame())
+    stream - stream into which the result will be printed
+    """
+    (eq, error, seconds) = result
+    if error is None:
+        fields = (gameNum, 'ok', seconds, io.equilibriumToStr(eq))
+    else:
+        fields = (gameNum, 'error', seconds, error.replace('\n', ' '))
+    stream.write('%d\t%s\t%.6f\t%s\n' % fields)
+
+
+def runBatch(inStream, outStream, backend=lh.AUTO_BACKEND, tol=None, processes=1,
+        field=None, limits=None):
+    """Solves all games from the selected stream and prints one result line
+    per game (see printResult()) in the input order. Games are read one
+    at a time while the previous ones are being solved. Returns the number
+    of games that could not be solved.
+
+    inStream - stream containing games (see io.iterInputGames())
+    outStream - stream into which results will be printed
+    backend - pivoting engine to be used (see lh.lemkeHowson())
+    tol - tolerance used by floating-point backends (see lh.lemkeHowson())
+    processes - number of worker processes (see solveGames())
+    field - number field used by the backend (see lh.lemkeHowson())
+    limits - limits of every path (see solveGame())
+    """
+    failures = 0
+    games = io.iterInputGames(inStream, yieldErrors=True)
+    results = solveGames(games, backend, tol, processes, field, limits)
+    for (gameNum, result) in enumerate(results):
+        if result[1] is not None:
+            failures += 1
+        printResult(gameNum + 1, result, outStream)
+    return failures
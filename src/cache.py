@@ -0,0 +1,258 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains a cache of equilibria found by lh.lemkeHowson().
+
+Games are identified by a fingerprint (SHA-1 hash) of the game shifted
+so that its lowest payoff is 1 (i.e. of x - min + 1 for every payoff x,
+where min is the lowest payoff of both matrices), the initially dropped
+label and the parameters of the backend (the name of the number field
+is used, not the field object). Adding a constant to all payoffs does not
+change equilibria, so games whose payoffs differ only by a constant share
+their entry. Optionally, rows and columns of every game are put into
+a canonical order before the fingerprint is computed, so games that differ
+only by the order of strategies share their entry as well.
+
+The most recently used entries are kept in memory up to the selected size.
+Optionally, all entries are also stored in a file (by the shelve module),
+so they are kept between runs of the program.
+"""
+
+
+import hashlib
+import pickle
+import shelve
+
+import lh
+import numfields
+
+
+# Default maximal size of entries kept in memory (in bytes)
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+def getCanonicalOrder(m1, m2):
+    """Returns a canonical order of rows and columns of the selected game
+    as a tuple (rowOrder, colOrder), where rowOrder (colOrder) is a list
+    of zero-based indices of rows (columns) in the canonical order.
+
+    m1 - first matrix (Matrix)
+    m2 - second matrix (Matrix)
+
+    Rows (columns) are ordered by the sorted payoff pairs (m1_ij, m2_ij)
+    in them, rows (columns) with the same pairs are ordered by the pairs
+    in the order of columns (rows). Games that differ only by the order
+    of strategies have the same canonical form unless they have rows
+    or columns with the same pairs (such games are recognized only
+    sometimes).
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+    """
+    rows = m1.getNumRows()
+    cols = m1.getNumCols()
+    pairs = zip(m1.getItems(), m2.getItems())
+    rowPairs = [pairs[i * cols:(i + 1) * cols] for i in xrange(0, rows)]
+    colPairs = [pairs[j::cols] for j in xrange(0, cols)]
+
+    # Keys that do not depend on the order of strategies
+    rowKeys = [sorted(p) for p in rowPairs]
+    colKeys = [sorted(p) for p in colPairs]
+    rowOrder = sorted(xrange(0, rows), key=lambda i: rowKeys[i])
+    colOrder = sorted(xrange(0, cols), key=lambda j: colKeys[j])
+
+    # Break ties by the payoffs in the order of the other player's strategies
+    rowOrder.sort(key=lambda i: (rowKeys[i],
+        [rowPairs[i][j] for j in colOrder]))
+    colOrder.sort(key=lambda j: (colKeys[j],
+        [colPairs[j][i] for i in rowOrder]))
+    return (rowOrder, colOrder)
+
+
+def _itemToStr(x):
+    """Returns the textual representation of the selected payoff used
+    in fingerprints (floats are represented exactly by repr())."""
+    if isinstance(x, float):
+        return repr(x)
+    return str(x)
+
+
+class SolutionCache(object):
+    """Cache of equilibria found by lh.lemkeHowson() (see the module
+    description).
+
+    Attributes:
+        hits - number of games answered from memory (number)
+        diskHits - number of games answered from the file (number)
+        misses - number of games that had to be solved (number)
+        size - estimated size of entries kept in memory (in bytes)
+    """
+
+    def __init__(self, maxBytes=DEFAULT_MAX_BYTES, fileName=None,
+            canonicalizePermutations=False):
+        """Creates the cache.
+
+        maxBytes - maximal size of entries kept in memory (in bytes, the size
+                   of an entry is the size of its fingerprint and its pickled
+                   equilibrium); the least recently used entries are evicted
+                   when the size is exceeded
+        fileName - name of the file in which all entries are stored (string)
+                   or None if entries should be kept only in memory
+        canonicalizePermutations - if True, strategies of every game are put
+                   into a canonical order (see getCanonicalOrder()), so games
+                   that differ only by the order of strategies share their
+                   entry; for degenerate games, the returned equilibrium
+                   might then differ from the one lh.lemkeHowson() would
+                   find (but it is still an equilibrium of the game)
+        """
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+        self.size = 0
+        self.__maxBytes = maxBytes
+        self.__canonicalizePermutations = canonicalizePermutations
+        # Entries in memory - fingerprint -> [prev, next, fingerprint, eq,
+        # size], the entries form a circular doubly linked list ordered
+        # from the least recently used one (after the root)
+        self.__entries = {}
+        self.__root = []
+        self.__root[:] = [self.__root, self.__root, None, None, 0]
+        self.__shelf = None
+        if fileName is not None:
+            self.__shelf = shelve.open(fileName, protocol=2)
+
+    def __len__(self):
+        """Returns the number of entries kept in memory."""
+        return len(self.__entries)
+
+    def lemkeHowson(self, m1, m2, backend=lh.AUTO_BACKEND, tol=None,
+            initBasisVar=1, field=None, limits=None):
+        """Returns the equilibrium of the selected game from the cache.
+        If it is not in the cache, it is found by lh.lemkeHowson() and stored
+        into the cache.
+
+        See lh.lemkeHowson() for the description of parameters, preconditions
+        and raised exceptions (limits are used only when the game has to be
+        solved).
+        """
+        if m1.getNumRows() != m2.getNumRows() or \
+                m1.getNumCols() != m2.getNumCols():
+            raise ValueError, 'Selected matrices does not have the same ' +\
+                'number of rows and columns'
+        rows = m1.getNumRows()
+        if initBasisVar <= 0 or initBasisVar > rows + m1.getNumCols():
+            raise ValueError, 'Invalid initial basis variable.'
+        backend = lh.selectBackend(m1, m2, backend)
+        fieldName = numfields.getField(field).name
+
+        if self.__canonicalizePermutations:
+            (rowOrder, colOrder) = getCanonicalOrder(m1, m2)
+        else:
+            (rowOrder, colOrder) = (range(0, rows), range(0, m1.getNumCols()))
+        # Positions of strategies in the canonical order
+        rowPos = len(rowOrder) * [0]
+        for (pos, i) in enumerate(rowOrder):
+            rowPos[i] = pos
+        colPos = len(colOrder) * [0]
+        for (pos, j) in enumerate(colOrder):
+            colPos[j] = pos
+        if initBasisVar <= rows:
+            label = rowPos[initBasisVar - 1] + 1
+        else:
+            label = rows + colPos[initBasisVar - rows - 1] + 1
+
+        fingerprint = self.__getFingerprint(m1, m2, rowOrder, colOrder,
+            label, (backend, tol, fieldName))
+        eq = self.__get(fingerprint)
+        if eq is None:
+            self.misses += 1
+            eq = lh.lemkeHowson(m1, m2, backend, tol, initBasisVar,
+                field=field, limits=limits)
+            # The canonical form of the equilibrium is stored
+            self.__put(fingerprint, (tuple([eq[0][i] for i in rowOrder]),
+                tuple([eq[1][j] for j in colOrder])))
+            return eq
+        return (tuple([eq[0][pos] for pos in rowPos]),
+            tuple([eq[1][pos] for pos in colPos]))
+
+    def clear(self):
+        """Removes all entries from memory (entries in the file are kept)."""
+        self.__entries.clear()
+        self.__root[:] = [self.__root, self.__root, None, None, 0]
+        self.size = 0
+
+    def close(self):
+        """Closes the file with entries (if there is any). The cache
+        cannot be used after it is closed."""
+        if self.__shelf is not None:
+            self.__shelf.close()
+            self.__shelf = None
+
+    def __getFingerprint(self, m1, m2, rowOrder, colOrder, label, params):
+        """Returns the fingerprint of the selected game whose strategies
+        are in the selected order."""
+        cols = m1.getNumCols()
+        # The canonical shift makes the lowest payoff of the game 1
+        # (rationals do not support subtraction)
+        cnst = -min(min(m1.getItems()), min(m2.getItems())) + 1
+        parts = [repr(params), str(label), str(len(rowOrder)), str(cols)]
+        for m in (m1, m2):
+            items = m.getItems()
+            parts.append(' '.join([_itemToStr(items[i * cols + j] + cnst)
+                for i in rowOrder for j in colOrder]))
+        return hashlib.sha1('\n'.join(parts)).hexdigest()
+
+    def __get(self, fingerprint):
+        """Returns the equilibrium with the selected fingerprint or None
+        if it is not in the cache."""
+        entry = self.__entries.get(fingerprint)
+        if entry is not None:
+            self.hits += 1
+            # Move the entry to the end of the list (most recently used)
+            self.__unlink(entry)
+            self.__link(entry)
+            return entry[3]
+        if self.__shelf is not None and fingerprint in self.__shelf:
+            self.diskHits += 1
+            eq = self.__shelf[fingerprint]
+            self.__putToMemory(fingerprint, eq)
+            return eq
+        return None
+
+    def __put(self, fingerprint, eq):
+        """Stores the equilibrium with the selected fingerprint."""
+        if self.__shelf is not None:
+            self.__shelf[fingerprint] = eq
+        self.__putToMemory(fingerprint, eq)
+
+    def __putToMemory(self, fingerprint, eq):
+        """Stores the equilibrium with the selected fingerprint into memory
+        and evicts the least recently used entries if it is needed."""
+        size = len(fingerprint) + len(pickle.dumps(eq, 2))
+        if size > self.__maxBytes:
+            return
+        entry = [None, None, fingerprint, eq, size]
+        self.__link(entry)
+        self.__entries[fingerprint] = entry
+        self.size += size
+        while self.size > self.__maxBytes:
+            lruEntry = self.__root[1]
+            self.__unlink(lruEntry)
+            del self.__entries[lruEntry[2]]
+            self.size -= lruEntry[4]
+
+    def __link(self, entry):
+        """Inserts the selected entry at the end of the list."""
+        last = self.__root[0]
+        entry[0] = last
+        entry[1] = self.__root
+        last[1] = entry
+        self.__root[0] = entry
+
+    def __unlink(self, entry):
+        """Removes the selected entry from the list."""
+        entry[0][1] = entry[1]
+        entry[1][0] = entry[0]
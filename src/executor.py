@@ -0,0 +1,415 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains an executor which solves games in the background
+by worker threads or worker processes, so the solver can be used
+by services built around an event loop without blocking the loop.
+
+A game is submitted by SolverExecutor.submit(), which returns a SolveFuture.
+The future can be waited for or a function can be registered which is called
+when the game is solved. Such functions are called by threads
+of the executor, so they should only pass the result to the event loop
+in a thread-safe way (e.g. by reactor.callFromThread() in Twisted).
+
+A submitted game can be cancelled. A game that is waiting for a free worker
+is never solved, a game that is being solved is stopped before the next
+pivoting step (see pathlimits.PathLimits), so cancelled games do not keep
+workers busy.
+
+At most workers + maxQueued games can be submitted and not finished
+at the same time. When there are more, submit() waits (or raises Queue.Full),
+so the queue of games cannot grow without bounds.
+
+Worker processes require python 2.6 (the multiprocessing module).
+"""
+
+
+import pickle
+import Queue
+import threading
+import traceback
+
+import lh
+import pathlimits
+
+
+# Kinds of workers of SolverExecutor
+EXECUTOR_KINDS = ('thread', 'process')
+
+# States of SolveFuture
+_PENDING = 0
+_CANCELLED = 1
+_FINISHED = 2
+
+
+class CancelledError(Exception):
+    """Exception to be raised when the result of a cancelled game
+    is requested."""
+    pass
+
+
+class TimeoutError(Exception):
+    """Exception to be raised when a game is not solved in the selected
+    time."""
+    pass
+
+
+def _solve(params, m1, m2, initBasisVar, limitsParams, isCancelled):
+    """Solves the selected game by lh.lemkeHowson() and returns
+    the found equilibrium. The path is stopped when isCancelled()
+    returns True."""
+    (backend, tol, field) = params
+    (maxPivots, timeout, detectCycles) = limitsParams
+    limits = pathlimits.PathLimits(maxPivots, timeout, detectCycles,
+        isCancelled)
+    return lh.lemkeHowson(m1, m2, backend, tol, initBasisVar, field=field,
+        limits=limits)
+
+
+def _processWorker(tasks, results, cancelled, params):
+    """Solves games from the selected task queue in a worker process
+    and puts their results into the selected result queue as tuples
+    (taskId, eq, exception). A game is cancelled when the item of cancelled
+    at the position of its slot is set to its identifier."""
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        (taskId, slot, m1, m2, initBasisVar, limitsParams) = task
+        isCancelled = lambda: cancelled[slot] == taskId
+        try:
+            if isCancelled():
+                raise pathlimits.PathCancelledError, 'Game cancelled.'
+            results.put((taskId, _solve(params, m1, m2, initBasisVar,
+                limitsParams, isCancelled), None))
+        except Exception, e:
+            # Exceptions which cannot be sent to the parent process
+            # are replaced by their messages
+            try:
+                pickle.dumps(e, 2)
+            except Exception:
+                e = Exception(str(e))
+            results.put((taskId, None, e))
+
+
+class SolveFuture(object):
+    """Result of a game submitted to SolverExecutor."""
+
+    def __init__(self, onCancel):
+        """Creates a pending future. The selected function (without
+        arguments) is called when the future is cancelled."""
+        self.__condition = threading.Condition()
+        self.__state = _PENDING
+        self.__eq = None
+        self.__exception = None
+        self.__callbacks = []
+        self.__onCancel = onCancel
+
+    def cancel(self):
+        """Cancels the game. Returns False if the game has already been
+        solved (or its solving has failed), True otherwise."""
+        self.__condition.acquire()
+        try:
+            if self.__state == _FINISHED:
+                return False
+            if self.__state == _CANCELLED:
+                return True
+            self.__state = _CANCELLED
+            self.__condition.notifyAll()
+        finally:
+            self.__condition.release()
+        self.__onCancel()
+        self.__runCallbacks()
+        return True
+
+    def cancelled(self):
+        """Returns True if the game has been cancelled, False otherwise."""
+        return self.__state == _CANCELLED
+
+    def done(self):
+        """Returns True if the game has been solved, its solving has failed
+        or it has been cancelled, False otherwise."""
+        return self.__state != _PENDING
+
+    def result(self, timeout=None):
+        """Waits until the game is solved and returns the found
+        equilibrium (see lh.lemkeHowson()).
+
+        timeout - maximal time of waiting (in seconds) or None
+                  to wait without limits
+
+        Raises the exception raised by lh.lemkeHowson() if solving
+        of the game has failed, CancelledError if the game has been
+        cancelled and TimeoutError if the game has not been solved
+        in the selected time.
+        """
+        exception = self.exception(timeout)
+        if exception is not None:
+            raise exception
+        return self.__eq
+
+    def exception(self, timeout=None):
+        """Waits until the game is solved and returns the exception raised
+        by lh.lemkeHowson() or None if the game has been solved
+        successfully.
+
+        timeout - maximal time of waiting (in seconds) or None
+                  to wait without limits
+
+        Raises CancelledError if the game has been cancelled
+        and TimeoutError if the game has not been solved in the selected
+        time.
+        """
+        self.__condition.acquire()
+        try:
+            if self.__state == _PENDING:
+                if timeout is None:
+                    while self.__state == _PENDING:
+                        self.__condition.wait()
+                else:
+                    self.__condition.wait(timeout)
+            if self.__state == _PENDING:
+                raise TimeoutError, 'Game not solved in %s seconds.' % timeout
+            if self.__state == _CANCELLED:
+                raise CancelledError, 'Game cancelled.'
+            return self.__exception
+        finally:
+            self.__condition.release()
+
+    def addDoneCallback(self, fn):
+        """Registers the selected function which is called with this future
+        as its only argument when the game is solved, its solving fails
+        or it is cancelled. If this has already happened, the function
+        is called immediately."""
+        self.__condition.acquire()
+        try:
+            if self.__state == _PENDING:
+                self.__callbacks.append(fn)
+                return
+        finally:
+            self.__condition.release()
+        fn(self)
+
+    def _finish(self, eq, exception):
+        """Sets the result of the game (called by SolverExecutor).
+        The result of a cancelled game is ignored."""
+        self.__condition.acquire()
+        try:
+            if self.__state != _PENDING:
+                return
+            self.__eq = eq
+            self.__exception = exception
+            self.__state = _FINISHED
+            self.__condition.notifyAll()
+        finally:
+            self.__condition.release()
+        self.__runCallbacks()
+
+    def __runCallbacks(self):
+        """Calls all registered functions. Their exceptions are printed
+        to the standard error output, so they do not stop workers."""
+        (callbacks, self.__callbacks) = (self.__callbacks, [])
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                traceback.print_exc()
+
+
+class SolverExecutor(object):
+    """Executor solving games by worker threads or worker processes (see
+    the module description).
+
+    Attributes:
+        kind - kind of workers (see EXECUTOR_KINDS)
+        workers - number of workers (number)
+        maxQueued - maximal number of games waiting for a free worker
+                    (number)
+    """
+
+    def __init__(self, kind='thread', workers=1, maxQueued=100,
+            backend=lh.AUTO_BACKEND, tol=None, field=None):
+        """Creates the executor and starts its workers.
+
+        kind - 'thread' to solve games by threads of this process (they
+               do not run in parallel, but cancelled games are stopped
+               sooner) or 'process' to solve games by worker processes
+        workers - number of workers (number)
+        maxQueued - maximal number of games waiting for a free worker
+                    (number)
+        backend - pivoting engine to be used (see lh.lemkeHowson())
+        tol - tolerance used by floating-point backends (see
+              lh.lemkeHowson())
+        field - number field used by the backend (see lh.lemkeHowson())
+
+        Raises ValueError if the selected kind, backend or field does
+        not exist, if the backend does not support the field or if
+        the number of workers is not positive.
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError, 'Invalid kind of workers: %s' % kind
+        if workers <= 0 or maxQueued < 0:
+            raise ValueError, 'Invalid number of workers or queued games.'
+        # Check the backend and the field before any game is submitted
+        if backend == lh.AUTO_BACKEND:
+            for autoBackend in ('rational', 'sparse'):
+                lh.getEngine(autoBackend, tol, field)
+        else:
+            lh.getEngine(backend, tol, field)
+        self.kind = kind
+        self.workers = workers
+        self.maxQueued = maxQueued
+        self.__params = (backend, tol, field)
+        self.__closed = False
+
+        # Every submitted game that is not finished occupies one slot
+        slots = workers + maxQueued
+        self.__slots = threading.BoundedSemaphore(slots)
+        self.__freeSlots = range(0, slots)
+        self.__lock = threading.Lock()
+        self.__lastTaskId = 0
+
+        if kind == 'thread':
+            self.__tasks = Queue.Queue()
+            self.__threads = [threading.Thread(target=self.__threadWorker)
+                for i in xrange(0, workers)]
+            self.__processes = []
+        else:
+            # This import must be here because of python 2.5 (it does not
+            # have the multiprocessing module)
+            import multiprocessing
+
+            # Slot -> identifier of the cancelled game in that slot
+            self.__cancelled = multiprocessing.RawArray('l', slots)
+            # Identifier -> (future, slot) of games being solved
+            self.__futures = {}
+            self.__tasks = multiprocessing.Queue()
+            self.__results = multiprocessing.Queue()
+            self.__processes = [multiprocessing.Process(target=_processWorker,
+                args=(self.__tasks, self.__results, self.__cancelled,
+                self.__params)) for i in xrange(0, workers)]
+            self.__threads = [threading.Thread(target=self.__collectResults)]
+        for process in self.__processes:
+            process.daemon = True
+            process.start()
+        for thread in self.__threads:
+            thread.setDaemon(True)
+            thread.start()
+
+    def submit(self, m1, m2, initBasisVar=1, limits=None, block=True):
+        """Submits the selected game and returns its SolveFuture.
+
+        m1 - matrix of profits of the first player (Matrix)
+        m2 - matrix of profits of the second player (Matrix)
+        initBasisVar - the initially dropped label (see lh.lemkeHowson())
+        limits - limits of the path (see lh.lemkeHowson()); they are copied,
+                 so the same instance can be used for many games
+        block - if True and there are too many unfinished games, waits until
+                some of them is finished; if False, Queue.Full is raised
+                instead
+
+        Raises ValueError if the executor has been shut down.
+        """
+        if self.__closed:
+            raise ValueError, 'Executor has been shut down.'
+        if not self.__slots.acquire(block):
+            raise Queue.Full, 'Too many unfinished games.'
+        self.__lock.acquire()
+        try:
+            self.__lastTaskId += 1
+            taskId = self.__lastTaskId
+            slot = self.__freeSlots.pop()
+        finally:
+            self.__lock.release()
+        if limits is None:
+            limitsParams = (None, None, False)
+        else:
+            limitsParams = (limits.maxPivots, limits.timeout,
+                limits.detectCycles)
+
+        if self.kind == 'thread':
+            future = SolveFuture(lambda: None)
+            self.__tasks.put((future, slot, m1, m2, initBasisVar,
+                limitsParams))
+        else:
+            future = SolveFuture(lambda: self.__cancelInWorker(taskId, slot))
+            self.__lock.acquire()
+            try:
+                self.__futures[taskId] = (future, slot)
+            finally:
+                self.__lock.release()
+            self.__tasks.put((taskId, slot, m1, m2, initBasisVar,
+                limitsParams))
+        return future
+
+    def shutdown(self, wait=True):
+        """Stops accepting new games. Workers are stopped after they finish
+        all submitted games (cancel their futures to stop them sooner).
+
+        wait - if True, waits until all workers are stopped
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        for i in xrange(0, self.workers):
+            self.__tasks.put(None)
+        if not wait:
+            return
+        for process in self.__processes:
+            process.join()
+        if self.kind == 'process':
+            # All results have been sent, so the collector can be stopped
+            self.__results.put(None)
+        for thread in self.__threads:
+            thread.join()
+
+    def __threadWorker(self):
+        """Solves games from the task queue by a worker thread."""
+        while True:
+            task = self.__tasks.get()
+            if task is None:
+                return
+            (future, slot, m1, m2, initBasisVar, limitsParams) = task
+            try:
+                if not future.cancelled():
+                    try:
+                        future._finish(_solve(self.__params, m1, m2,
+                            initBasisVar, limitsParams, future.cancelled),
+                            None)
+                    except Exception, e:
+                        future._finish(None, e)
+            finally:
+                self.__releaseSlot(slot)
+
+    def __collectResults(self):
+        """Passes results sent by worker processes to futures."""
+        while True:
+            result = self.__results.get()
+            if result is None:
+                return
+            (taskId, eq, exception) = result
+            self.__lock.acquire()
+            try:
+                (future, slot) = self.__futures.pop(taskId)
+            finally:
+                self.__lock.release()
+            try:
+                future._finish(eq, exception)
+            finally:
+                self.__releaseSlot(slot)
+
+    def __cancelInWorker(self, taskId, slot):
+        """Tells worker processes that the selected game is cancelled."""
+        self.__cancelled[slot] = taskId
+
+    def __releaseSlot(self, slot):
+        """Makes the selected slot free for another game."""
+        self.__lock.acquire()
+        try:
+            self.__freeSlots.append(slot)
+        finally:
+            self.__lock.release()
+        self.__slots.release()
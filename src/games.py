@@ -0,0 +1,162 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains generators of games that can be used for measuring
+the performance of the Lemke-Howson algorithm (see benchmark.py).
+
+Every generator returns a game as a tuple of two matrices (m1, m2).
+"""
+
+
+import random
+
+import matrix
+import rational
+
+
+def randomGame(rows, cols, maxPayoff=1000, seed=None):
+    """Returns a game with payoffs chosen uniformly at random.
+
+    rows - number of strategies of the first player (number)
+    cols - number of strategies of the second player (number)
+    maxPayoff - payoffs are integers from 0 to maxPayoff (number)
+    seed - seed of the random number generator (the same seed gives
+           the same game) or None for a random seed
+
+    Preconditions:
+        - rows > 0 and cols > 0
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    if rows <= 0 or cols <= 0:
+        raise ValueError, 'Invalid number of strategies.'
+
+    rng = random.Random(seed)
+    ms = []
+    for k in xrange(0, 2):
+        items = [rng.randint(0, maxPayoff) for i in xrange(0, rows * cols)]
+        ms.append(matrix.Matrix(rows, cols, items))
+    return tuple(ms)
+
+
+def coordinationGame(n):
+    """Returns an n x n coordination game (both players get 1 if they play
+    strategies with the same index, 0 otherwise). The game has 2^n - 1
+    equilibria.
+
+    n - number of strategies of both players (number)
+
+    Preconditions:
+        - n > 0
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    if n <= 0:
+        raise ValueError, 'Invalid number of strategies.'
+
+    m = matrix.Matrix(n, n)
+    for i in xrange(1, n + 1):
+        m.setItem(i, i, 1)
+    return (m, m.copy())
+
+
+def _solveLinearSystems(a, b):
+    """Returns the solution X of the system of linear equations a * X = b
+    (list of rows of Rationals).
+
+    a - regular square matrix (list of rows of numbers)
+    b - right-hand sides (list of rows of numbers)
+    """
+    n = len(a)
+    rows = [[rational.Rational(x) for x in a[i] + b[i]] for i in xrange(0, n)]
+    # Gauss-Jordan elimination
+    for c in xrange(0, n):
+        p = c
+        while rows[p][c] == 0:
+            p += 1
+        (rows[c], rows[p]) = (rows[p], rows[c])
+        pivotRow = [x / rows[c][c] for x in rows[c]]
+        rows[c] = pivotRow
+        for i in xrange(0, n):
+            coeff = rows[i][c]
+            if i != c and coeff != 0:
+                rows[i] = [x + -coeff * y for (x, y) in zip(rows[i], pivotRow)]
+    return [row[n:] for row in rows]
+
+
+def savaniVonStengelGame(d):
+    """Returns a d x d game in which all Lemke-Howson paths are exponentially
+    long in d (see B. Savani and B. von Stengel: Hard-to-Solve Bimatrix
+    Games, Econometrica 74, 2006).
+
+    d - number of strategies of both players (number)
+
+    The game is an imitation game (the payoff matrix of the first player
+    is the identity matrix). The best response polytope of the second player
+    is a dual cyclic polytope with 2d facets. Its facets are labeled
+    in the cyclic order by the labels of Morris (1, ..., d for the first
+    half and d, d - 2, d - 1, d - 4, d - 3, ..., 2, 3, 1 for the second
+    half), which leads to exponentially long paths.
+
+    Preconditions:
+        - d > 0 and d is even
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    if d <= 0 or d % 2 != 0:
+        raise ValueError, 'Number of strategies must be positive and even.'
+
+    # Normals of the facets of the dual cyclic polytope {x | a_k * x <= 1},
+    # which is the polar of the cyclic polytope with vertices on the moment
+    # curve (t, t^2, ..., t^d), t = 1, ..., 2d (shifted by the centroid
+    # and scaled by 2d so the origin is inside and all normals are integers)
+    moments = [[t ** e for e in xrange(1, d + 1)] for t in xrange(1, 2 * d + 1)]
+    sums = [sum([m[e] for m in moments]) for e in xrange(0, d)]
+    normals = [[2 * d * m[e] - sums[e] for e in xrange(0, d)] for m in moments]
+
+    # The first d facets meet in a vertex. The substitution y = 1 - M * x,
+    # where M contains normals of these facets, moves this vertex
+    # to the origin and these facets to y >= 0. The remaining facets then
+    # become c_k * y <= 1, where c_k = -z_k / (1 - sum(z_k)) and z_k is
+    # the solution of M^T * z_k = a_k.
+    mT = [[normals[i][j] for i in xrange(0, d)] for j in xrange(0, d)]
+    aT = [[normals[d + k][j] for k in xrange(0, d)] for j in xrange(0, d)]
+    z = _solveLinearSystems(mT, aT)
+    c = []
+    for k in xrange(0, d):
+        zk = [z[j][k] for j in xrange(0, d)]
+        scale = -(1 + -sum(zk, rational.Rational(0))).recip()
+        c.append([x * scale for x in zk])
+
+    # Multiply all items by the least common multiple of their denominators
+    # (this does not change the combinatorial structure of the polytope)
+    lcm = 1
+    for row in c:
+        for x in row:
+            lcm = lcm * x.denom() // rational._gcd(lcm, x.denom())
+
+    # Facets d + 1, ..., 2d get Morris labels (strategies of the second
+    # player are ordered by them)
+    labels = [d]
+    for k in xrange(d - 2, 1, -2):
+        labels.extend([k, k + 1])
+    labels.append(1)
+
+    m1 = matrix.Matrix(d, d)
+    m2 = matrix.Matrix(d, d)
+    for k in xrange(0, d):
+        m1.setItem(k + 1, k + 1, 1)
+        for i in xrange(0, d):
+            m2.setItem(i + 1, labels[k], (c[k][i] * lcm).nom())
+    return (m1, m2)
+
+
+# Available game generators (name: function(n) returning an n x n game)
+GENERATORS = {
+    'random': lambda n: randomGame(n, n, seed=n),
+    'coordination': coordinationGame,
+    'savani-von-stengel': savaniVonStengelGame,
+}
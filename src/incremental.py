@@ -0,0 +1,291 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains a solver which keeps the final tableaux of a solved
+game, so the game can be re-solved cheaply after some of its payoffs
+are changed (e.g. in a sensitivity analysis).
+
+Every part of a split tableaux (see lh.SplitTableaux) represents the system
+B^-1 * [1 | -N], where B and N are columns of the basis and nonbasic
+variables of the system s + M * y = 1 (s are slack variables, M is
+the normalized payoff matrix of the player and y are strategies of the
+other player). Columns of nonbasic slack variables therefore contain
+the negated columns of B^-1. A change of a payoff, of a row or of a column
+of a payoff matrix changes the system by a rank-one matrix d * c^T, so
+the tableaux can be updated by the Sherman-Morrison formula
+
+    (B + d * c^T)^-1 = B^-1 - (B^-1 * d) * (c^T * B^-1) / (1 + c^T * B^-1 * d)
+
+in O(number of items of the part) operations. Payoffs of a player are
+multiplied by their common denominator when the tableaux is created (see
+rational.scaleToIntegers()), so changes of payoffs are multiplied by the same
+number. The basis stays
+complementary, so when it also stays feasible, it still gives
+an equilibrium of the changed game and no pivoting step is needed.
+Otherwise (or when a new payoff is not an integer after it is multiplied
+by that number), the changed game is solved from scratch.
+"""
+
+
+import lh
+import rational
+
+
+class IncrementalSolver(object):
+    """Lemke-Howson solver that supports changes of payoffs of the solved
+    game (see the module description).
+
+    Attributes:
+        m1 - current matrix of profits of the first player (Matrix,
+             it must not be changed directly)
+        m2 - current matrix of profits of the second player (Matrix,
+             it must not be changed directly)
+        updates - number of payoff changes made so far (number)
+        resolves - number of payoff changes after which the game had to be
+                   solved from scratch (number)
+    """
+
+    def __init__(self, m1, m2, initBasisVar=1, field=None):
+        """Solves the selected game.
+
+        m1 - matrix of profits of the first player (Matrix)
+        m2 - matrix of profits of the second player (Matrix)
+        initBasisVar - the initially dropped label used whenever the game
+                       is solved from scratch (see lh.lemkeHowson())
+        field - number field of the tableaux (one of numfields.FIELDS
+                or None for numfields.DEFAULT_FIELD)
+
+        Preconditions:
+            - m1 must have the same number of rows and columns as m2
+            - 0 < initBasisVar <= m1.getNumRows() + m1.getNumCols()
+
+        Raises ValueError if some of the preconditions are not met or if
+        there is no such field.
+        """
+        if m1.getNumRows() != m2.getNumRows() or \
+                m1.getNumCols() != m2.getNumCols():
+            raise ValueError, 'Selected matrices does not have the same ' +\
+                'number of rows and columns'
+        if initBasisVar <= 0 or initBasisVar > m1.getNumRows() + \
+                m1.getNumCols():
+            raise ValueError, 'Invalid initial basis variable.'
+
+        self.m1 = m1.copy()
+        self.m2 = m2.copy()
+        self.updates = 0
+        self.resolves = 0
+        self.__engine = lh.RationalEngine(field)
+        self.__field = self.__engine.field
+        self.__p1SCount = m1.getNumRows()
+        self.__initBasisVar = initBasisVar
+        self.__solve()
+
+    def getEquilibrium(self):
+        """Returns the equilibrium of the current game (see
+        lh.lemkeHowson())."""
+        return self.__engine.getEquilibrium(self.__t, self.__p1SCount)
+
+    def getBasis(self):
+        """Returns the basis of the current tableaux (see
+        lh.RationalEngine.getBasis())."""
+        return self.__engine.getBasis(self.__t)
+
+    def setPayoff(self, player, i, j, value):
+        """Changes the payoff of the selected player in the cell (i, j)
+        and updates the equilibrium.
+
+        player - 1 for the first player, 2 for the second player
+        i - row of the cell (number)
+        j - column of the cell (number)
+        value - new payoff (number)
+
+        Raises ValueError if player is invalid. Raises IndexError
+        if the cell is invalid.
+        """
+        m = self.__getMatrix(player)
+        delta = self.__delta(player - 1, m.getItem(i, j), value)
+        m.setItem(i, j, value)
+        if player == 1:
+            self.__update(0, {-i: self.__field.one},
+                {self.__p1SCount + j: delta}, [value])
+        else:
+            self.__update(1, {-(self.__p1SCount + j): self.__field.one},
+                {i: delta}, [value])
+
+    def setPayoffRow(self, player, i, values):
+        """Changes payoffs of the selected player in the ith row
+        and updates the equilibrium.
+
+        player - 1 for the first player, 2 for the second player
+        i - row number
+        values - new payoffs (sequence of numbers)
+
+        Raises ValueError if player is invalid. Raises IndexError
+        if the row is invalid or if the number of values is not the number
+        of columns.
+        """
+        m = self.__getMatrix(player)
+        if len(values) != m.getNumCols():
+            raise IndexError, 'Invalid number of values.'
+        deltas = [self.__delta(player - 1, x, y)
+            for (x, y) in zip(m.getRow(i), values)]
+        m.setRow(i, list(values))
+        p1SCount = self.__p1SCount
+        if player == 1:
+            # The row of the slack variable of the ith strategy
+            self.__update(0, {-i: self.__field.one},
+                dict([(p1SCount + j + 1, delta)
+                    for (j, delta) in enumerate(deltas)]), values)
+        else:
+            # The column of the ith strategy
+            self.__update(1,
+                dict([(-(p1SCount + j + 1), delta)
+                    for (j, delta) in enumerate(deltas)]),
+                {i: self.__field.one}, values)
+
+    def setPayoffCol(self, player, j, values):
+        """Changes payoffs of the selected player in the jth column
+        and updates the equilibrium.
+
+        player - 1 for the first player, 2 for the second player
+        j - column number
+        values - new payoffs (sequence of numbers)
+
+        Raises ValueError if player is invalid. Raises IndexError
+        if the column is invalid or if the number of values is not
+        the number of rows.
+        """
+        m = self.__getMatrix(player)
+        if len(values) != m.getNumRows():
+            raise IndexError, 'Invalid number of values.'
+        deltas = [self.__delta(player - 1, x, y) for (x, y) in
+            zip(m.getColSlice(j, 1, m.getNumRows()), values)]
+        m.setColSlice(j, 1, list(values))
+        p1SCount = self.__p1SCount
+        if player == 1:
+            # The column of the jth strategy
+            self.__update(0,
+                dict([(-(i + 1), delta) for (i, delta) in enumerate(deltas)]),
+                {p1SCount + j: self.__field.one}, values)
+        else:
+            # The row of the slack variable of the jth strategy
+            self.__update(1, {-(p1SCount + j): self.__field.one},
+                dict([(i + 1, delta) for (i, delta) in enumerate(deltas)]),
+                values)
+
+    def __getMatrix(self, player):
+        """Returns the payoff matrix of the selected player."""
+        if player == 1:
+            return self.m1
+        elif player == 2:
+            return self.m2
+        raise ValueError, 'Invalid player: %s.' % player
+
+    def __delta(self, k, oldValue, newValue):
+        """Returns (newValue - oldValue) multiplied by the scale of payoffs
+        in the kth part of the tableaux as a number of the field
+        of the tableaux."""
+        convert = self.__field.convert
+        scale = self.__scales[k]
+        return convert(newValue * scale) + -convert(oldValue * scale)
+
+    def __solve(self):
+        """Solves the current game from scratch."""
+        engine = self.__engine
+        # The constant added to payoffs by the normalization
+        self.__cnst = engine.getNormalizationConstant(self.m1, self.m2)
+        # Numbers by which the tableaux multiplies normalized payoffs
+        # of both players (see rational.scaleToIntegers())
+        self.__scales = [rational.commonDenominator(
+            [x + self.__cnst for x in m.getItems()])
+            for m in (self.m1, self.m2)]
+        self.__t = engine.createTableaux(self.m1, self.m2, self.__cnst)
+        lh.followPath(engine, self.__t, self.__p1SCount, self.__initBasisVar)
+
+    def __update(self, k, d, c, values):
+        """Changes the system of the kth part of the tableaux by d * c^T
+        and solves the game from scratch if it is needed.
+
+        k - part of the tableaux (0 or 1)
+        d - nonzero items of d (dictionary slack variable -> number,
+            slack variables identify rows of the system)
+        c - nonzero items of c (dictionary variable -> number)
+        values - the changed payoffs (list of numbers)
+        """
+        self.updates += 1
+        normalized = [x + self.__cnst for x in values]
+        # The normalized payoffs have to stay positive and they have to be
+        # integers after they are scaled (otherwise, the scale changes)
+        if min(normalized) <= 0 or \
+                self.__scales[k] % rational.commonDenominator(normalized) or \
+                not self.__updateTableaux(k, d, c) or \
+                not self.__isFeasible(k):
+            self.resolves += 1
+            self.__solve()
+
+    def __updateTableaux(self, k, d, c):
+        """Updates the kth part of the tableaux by the Sherman-Morrison
+        formula (see the module description). Returns False if the new
+        basis is singular (the tableaux is not changed in such a case),
+        True otherwise."""
+        zero = self.__field.zero
+        part = self.__t.parts[k]
+        nonbasis = self.__t.nonbasis[k]
+        rows = part.getNumRows()
+        basis = part.getColSlice(1, 1, rows)
+        varCols = dict([(var, pos + 3) for (pos, var) in enumerate(nonbasis)])
+
+        # w = B^-1 * d (the column of B^-1 of a basis slack variable
+        # is a unit vector)
+        w = rows * [zero]
+        for (slackVar, x) in d.items():
+            if x == 0:
+                continue
+            if slackVar in varCols:
+                col = part.getColSlice(varCols[slackVar], 1, rows)
+                w = [y + -(x * z) for (y, z) in zip(w, col)]
+            else:
+                r = basis.index(slackVar)
+                w[r] = w[r] + x
+
+        # Basis variables whose columns are changed (by rows)
+        cBasis = [(r, c[var]) for (r, var) in enumerate(basis)
+            if c.get(var, 0) != 0]
+        denom = self.__field.one
+        for (r, x) in cBasis:
+            denom = denom + x * w[r]
+        if cBasis and denom == 0:
+            return False
+
+        # Columns of nonbasic variables: -B^-1 * (a + d * c_v)
+        for (var, x) in c.items():
+            if x != 0 and var in varCols:
+                col = varCols[var]
+                for r in xrange(0, rows):
+                    if w[r] != 0:
+                        part.setItem(r + 1, col,
+                            part.getItem(r + 1, col) + -(x * w[r]))
+
+        # The basis matrix: T = T - w * (c_B^T * T) / denom
+        if cBasis:
+            z = (part.getNumCols() - 1) * [zero]
+            for (r, x) in cBasis:
+                z = [y + x * v for (y, v) in zip(z, part.getRow(r + 1, 2))]
+            z = [y / denom for y in z]
+            for r in xrange(0, rows):
+                if w[r] != 0:
+                    part.setRow(r + 1, [y + -(w[r] * v) for (y, v) in
+                        zip(part.getRow(r + 1, 2), z)], 2)
+        return True
+
+    def __isFeasible(self, k):
+        """Returns True if values of the basis variables in the kth part
+        of the tableaux are nonnegative, False otherwise."""
+        part = self.__t.parts[k]
+        for value in part.getColSlice(2, 1, part.getNumRows()):
+            if value < 0:
+                return False
+        return True
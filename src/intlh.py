@@ -0,0 +1,386 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains an exact integer pivoting (fraction-free) engine
+for the Lemke-Howson algorithm.
+
+The tableaux contains only integers. Every part of the tableaux (one part
+per player) has a common denominator (the determinant of the current basis),
+so the value of an item is the stored integer divided by that determinant.
+Pivoting steps are done by using the integer pivoting rule
+
+    a_ij = (a_rc * a_ij - a_ic * a_rj) / det
+
+where r and c are the pivot row and column and det is the determinant
+before the step (the division is always exact). The determinant
+then becomes a_rc. Therefore, no greatest common divisors need to be
+computed while pivoting.
+"""
+
+
+import matrix
+import numfields
+import pivotstats
+import rational
+
+
+class IntegerTableaux(object):
+    """Integer tableaux used by the integer pivoting engine.
+
+    The tableaux is stored in a Matrix with S rows and S + 2 columns, where
+    S is the total number of strategies of both players. Rows 1..p1SCount
+    belong to the first part of the tableaux, the rest to the second part.
+    The first column contains indices of the basis variables (in the same
+    form as in lh.createTableaux()), the second column contains their values
+    and the remaining columns contain coefficients of all variables (label
+    l is in the column l + 2). Unlike lh.createTableaux(), the tableaux
+    represents equations (basis columns form a unit matrix multiplied
+    by the determinant).
+
+    Attributes:
+        m - the matrix described above (Matrix)
+        dets - determinants of both parts of the tableaux (list of two
+               numbers)
+    """
+
+    __slots__ = ('m', 'dets')
+
+    def __init__(self, m, dets):
+        """Creates the tableaux from the selected matrix and determinants."""
+        self.m = m
+        self.dets = dets
+
+
+def createTableaux(m1, m2, cnst=0):
+    """Creates an integer tableaux from the two selected matrices
+    (IntegerTableaux instance).
+
+    m1 - first matrix (Matrix instance with integer items)
+    m2 - second matrix (Matrix instance with integer items)
+    cnst - constant added to all payoffs (see lh.createTableaux())
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    if m1.getNumRows() != m2.getNumRows() or m1.getNumCols() != m2.getNumCols():
+        raise ValueError, 'Selected matrices does not have the same number ' +\
+                'of rows and columns'
+
+    S = m1.getNumRows() + m1.getNumCols()
+    t = IntegerTableaux(matrix.Matrix(S, S + 2), [1, 1])
+    fillTableaux(t, m1, m2, cnst)
+    return t
+
+
+def fillTableaux(t, m1, m2, cnst=0):
+    """Fills the selected tableaux with the initial tableaux of the selected
+    game whose payoffs are increased by the selected constant, i.e. with
+    createTableaux(m1 + cnst, m2 + cnst) (the matrix of the tableaux
+    is reused).
+
+    t - tableaux created for a game with the same numbers of strategies
+        (IntegerTableaux)
+    m1 - first matrix (Matrix instance with integer or rational items)
+    m2 - second matrix (Matrix instance with integer or rational items)
+    cnst - constant added to all payoffs (number, see
+           lh.getNormalizationConstant())
+
+    Payoffs of a player that are not all integers are multiplied by their
+    least common denominator (see rational.scaleToIntegers()).
+    """
+    p1SCount = m1.getNumRows()
+    p2SCount = m1.getNumCols()
+    S = p1SCount + p2SCount
+    m = t.m
+    m1Items = rational.scaleToIntegers(m1.getItems(), cnst)
+    m2Items = rational.scaleToIntegers(m2.getItems(), cnst)
+
+    # Every row starts with the index of a slack variable (that is also
+    # the basis variable), its value (1) and the unit coefficient
+    # of the slack variable
+    # The first part of the tableaux: s_i + sum_j m1_ij * y_j = 1
+    for i in xrange(1, p1SCount + 1):
+        row = [-i, 1] + S * [0]
+        row[i + 1] = 1
+        row[p1SCount + 2:] = m1Items[(i - 1) * p2SCount:i * p2SCount]
+        m.setRow(i, row)
+
+    # The second part of the tableaux: s_j + sum_i m2_ij * x_i = 1
+    for j in xrange(1, p2SCount + 1):
+        row = [-(p1SCount + j), 1] + S * [0]
+        row[p1SCount + j + 1] = 1
+        row[2:p1SCount + 2] = m2Items[j - 1::p2SCount]
+        m.setRow(p1SCount + j, row)
+
+    t.dets[:] = [1, 1]
+
+
+def makePivotingStep(t, p1SCount, ebVar, stats=None):
+    """Makes a single pivoting step in the selected tableaux by
+    bringing the selected variable into the basis. All changes are done
+    in the original tableaux. Returns the variable that left the basis.
+
+    t - tableaux (IntegerTableaux)
+    p1SCount - number of strategies of player 1 (number)
+    ebVar - variable that will enter the basis (number)
+    stats - statistics of the current pivoting step are recorded into this
+            object (pivotstats.PivotStats or None if they should not be
+            recorded)
+
+    Preconditions:
+        - 0 < abs(ebVar) <= t.m.getNumRows()
+        - 0 < p1SCount < t.m.getNumRows()
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    m = t.m
+    # 1st precondition
+    if abs(ebVar) <= 0 or abs(ebVar) > m.getNumRows():
+        raise ValueError, 'Selected variable index is invalid.'
+    # 2nd precondition
+    if p1SCount < 0 or m.getNumRows() <= p1SCount:
+        raise ValueError, 'Invalid number of strategies of player 1.'
+
+    # Select the appropriate part of the tableaux
+    if -p1SCount <= ebVar < 0 or ebVar > p1SCount:
+        (part, firstRow, lastRow) = (0, 1, p1SCount)
+    else:
+        (part, firstRow, lastRow) = (1, p1SCount + 1, m.getNumRows())
+    ebCol = abs(ebVar) + 2
+    ebCoeffs = m.getColSlice(ebCol, firstRow, lastRow)
+    values = m.getColSlice(2, firstRow, lastRow)
+
+    # Min-ratio rule (the ratios values[k] / ebCoeffs[k] have the same
+    # denominator, so they can be compared by cross multiplication)
+    tiedRows = []
+    for k in xrange(0, len(ebCoeffs)):
+        if ebCoeffs[k] > 0:
+            if not tiedRows:
+                tiedRows = [k]
+                continue
+            pivot = tiedRows[0]
+            diff = values[k] * ebCoeffs[pivot] - values[pivot] * ebCoeffs[k]
+            if diff < 0:
+                tiedRows = [k]
+            elif diff == 0:
+                tiedRows.append(k)
+    if not tiedRows:
+        raise ValueError, 'No variable can leave the basis.'
+    pivot = tiedRows[0]
+    if len(tiedRows) > 1:
+        # Degenerate step (see lh.breakRatioTie()) - the column of the slack
+        # variable with the label l (firstRow <= l <= lastRow) is the column
+        # of the inverse basis multiplied by the determinant
+        # This import must be here because lh imports this module
+        import lh
+        pivot = lh.breakRatioTie(tiedRows, lambda k: ebCoeffs[k],
+            lambda k, j: m.getItem(firstRow + k, firstRow + j + 2),
+            lastRow - firstRow + 1)
+    if stats is not None:
+        stats.recordRatioTest(len(ebCoeffs),
+            len([c for c in ebCoeffs if c > 0]))
+
+    lbVar = _pivot(t, part, firstRow, lastRow, ebVar, firstRow + pivot)
+
+    if stats is not None:
+        # Values are stored integers divided by the determinant
+        stats.startBitSizeScan()
+        items = []
+        for i in xrange(firstRow, lastRow + 1):
+            items.extend(m.getRow(i, 2))
+        stats.recordBitSizes(pivotstats.maxBitSizes(items)[0],
+            pivotstats.bitLength(t.dets[part]))
+
+    return lbVar
+
+
+def _pivot(t, part, firstRow, lastRow, ebVar, lbVarRow):
+    """Makes a pivoting step in the selected part of the tableaux on the
+    selected row and the column of the selected variable (the coefficient
+    must be nonzero). Returns the variable that left the basis.
+
+    t - tableaux (IntegerTableaux)
+    part - index of the part of the tableaux (0 or 1)
+    firstRow, lastRow - the first and the last row of the part (numbers)
+    ebVar - variable that will enter the basis (number)
+    lbVarRow - row of the variable that will leave the basis (number)
+    """
+    m = t.m
+    ebCol = abs(ebVar) + 2
+    lbVar = m.getItem(lbVarRow, 1)
+
+    # The pivot row stays the same (only the basis variable changes),
+    # all other rows are updated by the integer pivoting rule
+    pivotCoeff = m.getItem(lbVarRow, ebCol)
+    det = t.dets[part]
+    pivotRow = m.getRow(lbVarRow, 2)
+    for i in xrange(firstRow, lastRow + 1):
+        if i != lbVarRow:
+            coeff = m.getItem(i, ebCol)
+            if coeff != 0:
+                newRow = [(pivotCoeff * x - coeff * y) // det
+                    for (x, y) in zip(m.getRow(i, 2), pivotRow)]
+            else:
+                newRow = [(pivotCoeff * x) // det for x in m.getRow(i, 2)]
+            m.setRow(i, newRow, 2)
+    m.setItem(lbVarRow, 1, ebVar)
+
+    # The determinant is kept positive (the coefficient is positive in steps
+    # selected by the min-ratio rule), so the signs of stored values
+    # and coefficients are the signs of the items they represent
+    if pivotCoeff < 0:
+        for i in xrange(firstRow, lastRow + 1):
+            m.setRow(i, [-x for x in m.getRow(i, 2)], 2)
+        pivotCoeff = -pivotCoeff
+    t.dets[part] = pivotCoeff
+
+    return lbVar
+
+
+def pivotToBasis(t, p1SCount, basis):
+    """Makes pivoting steps in the selected tableaux until its basis is the
+    selected basis and returns True if the resulting basis is feasible, False
+    otherwise (see lh.pivotSplitToBasis()).
+
+    t - tableaux (IntegerTableaux)
+    p1SCount - number of strategies of player 1 (number)
+    basis - basis variables (list of numbers, see lh.checkBasis())
+
+    Raises ValueError if the basis is invalid or singular.
+    """
+    # This import must be here because lh imports this module
+    import lh
+    m = t.m
+    S = m.getNumRows()
+    lh.checkBasis(basis, p1SCount, S)
+
+    targets = set(basis)
+    currentBasis = m.getColSlice(1, 1, S)
+    for ebVar in basis:
+        if ebVar in currentBasis:
+            continue
+        if -p1SCount <= ebVar < 0 or ebVar > p1SCount:
+            (part, firstRow, lastRow) = (0, 1, p1SCount)
+        else:
+            (part, firstRow, lastRow) = (1, p1SCount + 1, S)
+        # The leaving variable is the basis variable that is not in the
+        # selected basis with the largest coefficient (in absolute value)
+        # of the entering variable
+        lbVarRow = None
+        for i in xrange(firstRow, lastRow + 1):
+            coeff = abs(m.getItem(i, abs(ebVar) + 2))
+            if coeff != 0 and m.getItem(i, 1) not in targets and \
+                    (lbVarRow is None or coeff > maxCoeff):
+                (lbVarRow, maxCoeff) = (i, coeff)
+        if lbVarRow is None:
+            raise ValueError, 'Selected basis is singular.'
+        _pivot(t, part, firstRow, lastRow, ebVar, lbVarRow)
+        currentBasis[lbVarRow - 1] = ebVar
+
+    for value in m.getColSlice(2, 1, S):
+        if value < 0:
+            return False
+    return True
+
+
+def getEquilibrium(t, p1SCount, field=None):
+    """Returns the normalized equilibrium from the given tableaux (tuple
+    of two tuples of numbers of the selected field, the same result as
+    lh.normalizeEquilibrium(lh.getEquilibrium(...)) returns for a rational
+    tableaux).
+
+    t - tableaux (IntegerTableaux)
+    p1SCount - number of strategies of player 1 (number)
+    field - number field of the returned equilibrium (numfields.NumberField
+            or None for numfields.DEFAULT_FIELD)
+
+    Preconditions:
+        - 0 < p1SCount < t.m.getNumRows()
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    m = t.m
+    if p1SCount < 0 or m.getNumRows() <= p1SCount:
+        raise ValueError, 'Invalid number of strategies of player 1.'
+    if field is None:
+        field = numfields.getField()
+
+    # Values in the same part of the tableaux have the same denominator,
+    # so it is sufficient to work with nominators
+    eqs = m.getNumRows() * [0]
+    for i in xrange(1, m.getNumRows() + 1):
+        strat = m.getItem(i, 1)
+        value = m.getItem(i, 2)
+        if strat > 0 and value > 0:
+            eqs[strat - 1] = value
+
+    def normalizeEqPart(eqPart):
+        valueSum = sum(eqPart)
+        return tuple([field.fraction(x, valueSum) for x in eqPart])
+
+    return (normalizeEqPart(eqs[0:p1SCount]), normalizeEqPart(eqs[p1SCount:]))
+
+
+class IntegerEngine(object):
+    """Pivoting engine for lh.lemkeHowson() using integer pivoting. Found
+    equilibria are tuples of numbers of the selected field (Rationals
+    by default); the pivoting itself is always done in integers."""
+
+    def __init__(self, field=None):
+        """Creates the engine.
+
+        field - number field of found equilibria (numfields.NumberField
+                or None for numfields.DEFAULT_FIELD)
+        """
+        self.field = numfields.getField(field)
+
+    def normalizeMatrices(self, m1, m2):
+        """See lh.normalizeMatrices()."""
+        # This import must be here because lh imports this module
+        import lh
+        return lh.normalizeMatrices(m1, m2)
+
+    def getNormalizationConstant(self, m1, m2):
+        """See lh.getNormalizationConstant()."""
+        # This import must be here because lh imports this module
+        import lh
+        return lh.getNormalizationConstant(m1, m2)
+
+    def createTableaux(self, m1, m2, cnst=0):
+        """See createTableaux()."""
+        return createTableaux(m1, m2, cnst)
+
+    def fillTableaux(self, t, m1, m2, cnst=0):
+        """See fillTableaux()."""
+        fillTableaux(t, m1, m2, cnst)
+
+    def copyTableaux(self, t):
+        """Returns a copy of the selected tableaux."""
+        return IntegerTableaux(t.m.copy(), t.dets[:])
+
+    def getBasis(self, t):
+        """Returns basis variables of the selected tableaux (list
+        of numbers)."""
+        return t.m.getColSlice(1, 1, t.m.getNumRows())
+
+    def makePivotingStep(self, t, p1SCount, ebVar, stats=None):
+        """See makePivotingStep()."""
+        return makePivotingStep(t, p1SCount, ebVar, stats)
+
+    def pivotToBasis(self, t, p1SCount, basis):
+        """See pivotToBasis()."""
+        return pivotToBasis(t, p1SCount, basis)
+
+    def getEquilibrium(self, t, p1SCount):
+        """See getEquilibrium()."""
+        return getEquilibrium(t, p1SCount, self.field)
+
+    def equilibriaEqual(self, eq1, eq2):
+        """Returns True if the two selected equilibria are equal,
+        False otherwise."""
+        return self.field.equilibriaEqual(eq1, eq2)
@@ -7,9 +7,118 @@
 """I/O functions "communicating" with the user of the program."""
 
 
+import mmap
 import os
+import struct
 
 import matrix
+import rational
+
+
+# Line separating games in a stream of games (see iterInputGames())
+GAME_SEPARATOR = '---'
+
+# Binary game files (see writeBinaryGame()):
+# magic string at the beginning of every binary game file
+BINARY_GAME_MAGIC = 'LHG1'
+# header - magic, number of rows, number of cols, item type code
+# (little-endian, padded to 16 bytes so items are 8-byte aligned)
+_BINARY_HEADER_FORMAT = '<4sIIB3x'
+_BINARY_HEADER_SIZE = struct.calcsize(_BINARY_HEADER_FORMAT)
+# item types - name: (code, struct format of a single item)
+BINARY_ITEM_TYPES = {
+    'int64': (1, 'q'),
+    'float64': (2, 'd'),
+    'rational': (3, 'qq'),
+}
+
+
+def _parseItem(text):
+    """Returns the payoff represented by the selected text (see
+    parseInputMatrices()) as an integer (int, long) or as a rational.Rational
+    instance if it is not an integer.
+
+    Raises ValueError if the text does not represent a payoff.
+    """
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        x = rational.fromText(text)
+    except (rational.InvalidRationalReprError, ValueError):
+        # ValueError is raised on a zero denominator
+        raise ValueError, 'Invalid payoff: %s.' % text
+    if x.denom() == 1:
+        return int(x.nom())
+    return x
+
+
+def _parseInputGame(lines):
+    """Parses two matrices from the selected iterable of lines (strings
+    without the trailing new line) and returns them in a tuple (m1, m2).
+    Lines are read one by one and items of every matrix are stored
+    directly into the list that becomes the storage of that matrix.
+
+    See parseInputMatrices() for preconditions and raised exceptions.
+    """
+    invalidInputMsg = 'Input text does not contain two valid matrices.'
+
+    ms = []
+    items = []
+    rows = 0
+    cols = 0
+    for line in lines:
+        if line == '':
+            # An empty line ends a matrix; there has to be exactly one
+            # empty line between both matrices, there can be any number
+            # of empty lines after the second matrix
+            if rows > 0:
+                ms.append(matrix.Matrix(rows, cols, items))
+                (items, rows) = ([], 0)
+            elif len(ms) < 2:
+                raise ValueError, invalidInputMsg
+        elif len(ms) == 2:
+            # Redundant characters after the second matrix
+            raise ValueError, invalidInputMsg
+        else:
+            rowItems = line.split()
+            if rows == 0:
+                cols = len(rowItems)
+            # Redundant items at the end of a row are ignored
+            if cols == 0 or len(rowItems) < cols:
+                raise ValueError, invalidInputMsg
+            try:
+                # Integers are the most common payoffs, so they are tried
+                # first for the whole row
+                items.extend([int(item) for item in rowItems[:cols]])
+            except ValueError:
+                try:
+                    items.extend([_parseItem(item)
+                        for item in rowItems[:cols]])
+                except ValueError:
+                    raise ValueError, invalidInputMsg
+            rows += 1
+    if rows > 0:
+        ms.append(matrix.Matrix(rows, cols, items))
+    if len(ms) != 2:
+        raise ValueError, invalidInputMsg
+
+    (m1, m2) = ms
+    if m1.getNumRows() != m2.getNumRows() or m1.getNumCols() != m2.getNumCols():
+        raise ValueError, 'Input text contains two matrices with different ' +\
+            'number of rows or columns.'
+
+    return (m1, m2)
+
+
+def _iterLines(stream):
+    """Yields lines from the selected stream one by one (without
+    the trailing new line)."""
+    for line in stream:
+        if line.endswith('\n'):
+            line = line[:-1]
+        yield line
 
 
 def parseInputMatrices(text):
@@ -18,6 +127,12 @@ def parseInputMatrices(text):
 
     text - text from which the matrices will be parsed (string)
 
+    Payoffs can be integers, decimal numbers (e.g. 0.35 or 2.5e-3)
+    or fractions (e.g. 7/20). Integral payoffs are returned as integers
+    (int, long) and the other ones as rational.Rational instances (engines
+    scale them to integers when they create the tableaux, see
+    rational.scaleToIntegers()).
+
     Preconditions:
         - text must contain two matrices (see matrix.Matrix.__repr__())
           separated by an extra new line (there might be additional
@@ -26,33 +141,316 @@ def parseInputMatrices(text):
 
     Raises ValueError if some of the preconditions are not met.
     """
-    try:
-        mTexts = text.split('\n\n')
-        if len(mTexts) > 2:
-            # Check whether there are only newlines in the rest of the text
-            for mText in mTexts[2:]:
-                for c in mText:
-                    if c != '\n':
-                        raise ValueError, 'Redundant characters at the end ' +\
-                                'of the input.'
-            mTexts = (mTexts[0], mTexts[1] + '\n')
-
-        m1 = matrix.fromText(mTexts[0] + '\n')
-        m2 = matrix.fromText(mTexts[1])
-    except IndexError:
-        raise ValueError, 'Input text does not contain two valid matrices.'
-    except ValueError:
-        raise ValueError, 'Input text does not contain two valid matrices.'
-    except matrix.InvalidMatrixReprError:
-        raise ValueError, 'Input text does not contain two valid matrices.'
+    lines = text.split('\n')
+    if lines[-1] == '':
+        # The text ends with a new line
+        del lines[-1]
+    return _parseInputGame(lines)
+
+
+def readInputMatrices(stream):
+    """Reads two matrices from the selected stream line by line and returns
+    them in a tuple (m1, m2). The input format, preconditions and raised
+    exceptions are the same as in parseInputMatrices().
+
+    stream - stream from which the matrices will be read (file-like object)
+    """
+    return _parseInputGame(_iterLines(stream))
+
+
+def gameFromJson(obj):
+    """Returns two matrices (m1, m2) created from the selected decoded JSON
+    object.
+
+    obj - dictionary with keys 'm1' and 'm2', values are lists of rows
+          of both matrices (lists of payoffs); payoffs can be integers,
+          floats (their shortest representation is parsed as a decimal
+          number, e.g. 0.35 is 7/20) or strings in the format of payoffs
+          in parseInputMatrices()
+
+    Payoffs are returned in the same way as in parseInputMatrices().
+
+    Raises ValueError if the object does not contain a valid game.
+    """
+    invalidInputMsg = 'Input object does not contain two valid matrices.'
+
+    def payoffToStr(x):
+        # bool is a subclass of int, but it is not a valid payoff
+        if isinstance(x, (int, long)) and not isinstance(x, bool):
+            return str(x)
+        elif isinstance(x, float):
+            return repr(x)
+        elif isinstance(x, basestring) and len(x.split()) == 1:
+            return str(x.strip())
+        raise ValueError, invalidInputMsg
+
+    if not isinstance(obj, dict):
+        raise ValueError, invalidInputMsg
+    lines = []
+    for key in ('m1', 'm2'):
+        rows = obj.get(key)
+        if not isinstance(rows, list) or not rows:
+            raise ValueError, invalidInputMsg
+        for row in rows:
+            if not isinstance(row, list) or not row or \
+                    len(row) != len(rows[0]):
+                raise ValueError, invalidInputMsg
+            lines.append(' '.join([payoffToStr(x) for x in row]))
+        lines.append('')
+    return _parseInputGame(lines)
+
+
+def iterInputGames(stream, yieldErrors=False):
+    """Reads games from the selected stream line by line and yields them
+    one at a time as tuples (m1, m2). Only lines of a single game are being
+    processed at once, so the whole input is never in memory.
+
+    stream - stream from which games will be read (file-like object)
+    yieldErrors - if True, a game that is not valid is yielded as
+                  a ValueError instance and reading continues with the next
+                  game; otherwise, the ValueError is raised
+
+    Every game is in the format described in parseInputMatrices(), games
+    are separated by lines containing only GAME_SEPARATOR (redundant
+    whitespace around the separator is ignored). Empty lines before a game
+    are ignored and games that contain only whitespace are omitted.
+
+    Raises ValueError if some game is not valid (and yieldErrors is False).
+    """
+    lines = _iterLines(stream)
+    eof = [False]
+
+    # Yields lines of the current game (up to the next separator)
+    def iterGameLines():
+        for line in lines:
+            if line.strip() == GAME_SEPARATOR:
+                return
+            yield line
+        eof[0] = True
+
+    # Yields the first non-empty line and all remaining lines of a game
+    def iterFromFirstLine(firstLine, gameLines):
+        yield firstLine
+        for line in gameLines:
+            yield line
+
+    while not eof[0]:
+        gameLines = iterGameLines()
+        firstLine = None
+        for line in gameLines:
+            if line.strip() != '':
+                firstLine = line
+                break
+        if firstLine is None:
+            # Empty game
+            continue
+
+        try:
+            game = _parseInputGame(iterFromFirstLine(firstLine, gameLines))
+        except ValueError, e:
+            # Skip the rest of the invalid game
+            for line in gameLines:
+                pass
+            if not yieldErrors:
+                raise e
+            game = e
+        yield game
+
+
+class _BinaryItems(object):
+    """Read-only sequence of matrix items stored in a binary game file
+    (or any other buffer). It is used as the storage of matrices read
+    from binary game files, so items are decoded only when they are
+    accessed and the file content is not copied.
+
+    Items of the 'rational' type are returned as numbers (int, long) if their
+    denominator is 1 and as Rational instances otherwise.
+    """
+
+    __slots__ = ('__buf', '__offset', '__count', '__itemFormat', '__itemSize')
+
+    def __init__(self, buf, offset, count, itemFormat):
+        """Creates the sequence.
+
+        buf - buffer containing the items (e.g. a mmap instance)
+        offset - offset of the first item in the buffer
+        count - number of items
+        itemFormat - struct format of a single item (see BINARY_ITEM_TYPES)
+        """
+        self.__buf = buf
+        self.__offset = offset
+        self.__count = count
+        self.__itemFormat = itemFormat
+        self.__itemSize = struct.calcsize('<' + itemFormat)
+
+    def __len__(self):
+        """Returns the number of items."""
+        return self.__count
+
+    def __decode(self, values):
+        """Returns a list of items created from the selected unpacked
+        values."""
+        if len(self.__itemFormat) == 1:
+            return list(values)
+        items = []
+        for k in xrange(0, len(values), 2):
+            if values[k + 1] == 1:
+                items.append(values[k])
+            else:
+                items.append(rational.Rational(values[k], values[k + 1]))
+        return items
+
+    def __getitem__(self, k):
+        """Returns the kth item or a list of items if k is a slice."""
+        if isinstance(k, slice):
+            (start, stop, step) = k.indices(self.__count)
+            if step != 1:
+                return [self[i] for i in xrange(start, stop, step)]
+            n = max(stop - start, 0)
+            values = struct.unpack_from('<' + self.__itemFormat * n,
+                self.__buf, self.__offset + start * self.__itemSize)
+            return self.__decode(values)
+
+        if k < 0:
+            k += self.__count
+        if k < 0 or k >= self.__count:
+            raise IndexError, 'Item index out of range.'
+        values = struct.unpack_from('<' + self.__itemFormat, self.__buf,
+            self.__offset + k * self.__itemSize)
+        return self.__decode(values)[0]
 
+    def __setitem__(self, k, val):
+        """Items cannot be changed."""
+        raise TypeError, 'Matrices read from binary game files are read-only.'
+
+
+def writeBinaryGame(m1, m2, stream, itemType='int64'):
+    """Writes the selected game into the selected stream in the binary game
+    format.
+
+    m1 - matrix of the first player (Matrix)
+    m2 - matrix of the second player (Matrix)
+    stream - stream into which the game will be written (opened in the binary
+             mode)
+    itemType - type of stored items (one of BINARY_ITEM_TYPES):
+               'int64' - 64-bit signed integers
+               'float64' - 64-bit floating-point numbers
+               'rational' - rational numbers (pairs of 64-bit signed integers,
+                            nominator and denominator)
+
+    The binary game format consists of a 16-byte header (BINARY_GAME_MAGIC,
+    number of rows and cols as 32-bit unsigned integers and the item type
+    code as an 8-bit unsigned integer, padded with zeros) followed by items
+    of the first matrix and items of the second matrix (row by row).
+    Everything is stored in little-endian.
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+        - all items must be representable by the selected item type
+
+    Raises ValueError if some of the preconditions are not met or if
+    the item type is not valid.
+    """
+    if itemType not in BINARY_ITEM_TYPES:
+        raise ValueError, 'Invalid item type: %s.' % itemType
     if m1.getNumRows() != m2.getNumRows() or m1.getNumCols() != m2.getNumCols():
-        raise ValueError, 'Input text contains two matrices with different ' +\
-            'number of rows or columns.'
+        raise ValueError, 'Selected matrices does not have the same number ' +\
+                'of rows and columns'
+
+    (code, itemFormat) = BINARY_ITEM_TYPES[itemType]
+    rows = m1.getNumRows()
+    cols = m1.getNumCols()
+    stream.write(struct.pack(_BINARY_HEADER_FORMAT, BINARY_GAME_MAGIC,
+        rows, cols, code))
+    rowFormat = '<' + itemFormat * cols
+    for m in (m1, m2):
+        for i in xrange(1, rows + 1):
+            values = m.getRow(i)
+            if itemType == 'rational':
+                pairs = []
+                for x in values:
+                    if isinstance(x, rational.Rational):
+                        pairs.extend([x.nom(), x.denom()])
+                    else:
+                        pairs.extend([x, 1])
+                values = pairs
+            try:
+                stream.write(struct.pack(rowFormat, *values))
+            except struct.error, e:
+                raise ValueError, 'Item cannot be stored: %s.' % e
+
+
+def isBinaryGameFile(fileName):
+    """Returns True if the selected file is a binary game file (it starts
+    with BINARY_GAME_MAGIC), False otherwise.
 
+    fileName - name of the file (string)
+    """
+    f = open(fileName, 'rb')
+    try:
+        return f.read(len(BINARY_GAME_MAGIC)) == BINARY_GAME_MAGIC
+    finally:
+        f.close()
+
+
+def readBinaryGame(fileName):
+    """Reads two matrices from the selected binary game file (see
+    writeBinaryGame()) and returns them in a tuple (m1, m2).
+
+    fileName - name of the file (string)
+
+    The file is mapped into memory and its content is used as the storage
+    of both matrices without copying (items are decoded only when they are
+    accessed), so the returned matrices are read-only.
+
+    Raises ValueError if the file is not a valid binary game file.
+    """
+    invalidFileMsg = 'Input file is not a valid binary game file.'
+
+    f = open(fileName, 'rb')
+    try:
+        if os.fstat(f.fileno()).st_size < _BINARY_HEADER_SIZE:
+            raise ValueError, invalidFileMsg
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        f.close()
+
+    (magic, rows, cols, code) = struct.unpack_from(_BINARY_HEADER_FORMAT, buf)
+    itemFormats = dict(BINARY_ITEM_TYPES.values())
+    if magic != BINARY_GAME_MAGIC or rows == 0 or cols == 0 or \
+            code not in itemFormats:
+        raise ValueError, invalidFileMsg
+    itemFormat = itemFormats[code]
+    count = rows * cols
+    mSize = count * struct.calcsize('<' + itemFormat)
+    if len(buf) != _BINARY_HEADER_SIZE + 2 * mSize:
+        raise ValueError, invalidFileMsg
+
+    m1 = matrix.Matrix(rows, cols,
+        _BinaryItems(buf, _BINARY_HEADER_SIZE, count, itemFormat))
+    m2 = matrix.Matrix(rows, cols,
+        _BinaryItems(buf, _BINARY_HEADER_SIZE + mSize, count, itemFormat))
     return (m1, m2)
 
 
+def readGameFile(fileName):
+    """Reads two matrices from the selected file and returns them in a tuple
+    (m1, m2). The file can be either a binary game file (see
+    readBinaryGame()) or a text file (see parseInputMatrices()).
+
+    fileName - name of the file (string)
+
+    Raises ValueError if the file does not contain a valid game.
+    """
+    if isBinaryGameFile(fileName):
+        return readBinaryGame(fileName)
+    f = open(fileName)
+    try:
+        return readInputMatrices(f)
+    finally:
+        f.close()
+
+
 def printHelp(stream):
     """Prints program help to the selected stream.
 
@@ -61,7 +459,51 @@ def printHelp(stream):
     helpText =\
 """Program for computing mixed Nash equilibrium (MNE) in 2-player games using the Lemke-Howson algorithm.
 
-Usage: python lh.py < inputgame.txt
+Usage: python lh.py [options] < inputgame.txt
+       python lh.py [options] -f inputgame.txt
+
+Options:
+    -h, --help             Print this help and exit.
+    -b, --backend NAME     Pivoting engine to be used:
+                             auto     - sparse for games with less than 10 %
+                                        of nonzero payoffs, rational
+                                        otherwise (default)
+                             rational - exact rational arithmetic
+                             integer  - exact integer (fraction-free) pivoting
+                             sparse   - exact rational arithmetic, only
+                                        nonzero items are stored
+                             numpy    - floating-point arithmetic (needs NumPy)
+    --field NAME           Number type used by the rational, integer
+                           and sparse backends:
+                             rational - built-in rational numbers (default)
+                             fraction - fractions.Fraction (needs python 2.6)
+                             float    - floating-point numbers (inexact)
+                             gmpy     - gmpy2.mpq (needs gmpy2)
+    -a, --all-labels       Run the algorithm from every initially dropped
+                           label and print all found equilibria together
+                           with labels that lead to them.
+    --batch                Solve a stream of games separated by lines
+                           containing only ---. One line per game is printed
+                           (game number, ok/error, time in seconds and
+                           the found equilibrium or the error message).
+    --serve ADDRESS        Keep running and solve games sent over a socket
+                           (PORT or HOST:PORT for a TCP socket on
+                           a loopback host, a path for a Unix domain
+                           socket, see README).
+    -j, --jobs N           Number of worker processes used to follow paths
+                           from different labels (with --all-labels) or
+                           to solve games (with --batch or --serve).
+    -f, --file FILE        Read the game from the selected file instead of
+                           the standard input. The file can be either a text
+                           file in the format below or a binary game file
+                           (see convert-game.py).
+    --max-pivots N         Stop a path (with an error) after N pivoting steps.
+    --timeout SECS         Stop a path (with an error) after SECS seconds.
+    --detect-cycles        Stop a path (with an error) when a basis is repeated.
+    --stats FILE           Record every pivoting step (entering and leaving
+                           variables, time, length of the min-ratio test
+                           and bit sizes of tableaux numbers) and write
+                           the records into the selected file in JSON.
 
 Program expects two matrices with payoffs on the standard input in the following format:
     a11 a12 ... a1N\\n
@@ -73,9 +515,13 @@ Program expects two matrices with payoffs on the standard input in the following
     bM1 bM2 ... bMN\\n
 
 aXY are payoffs for the first player and bXY are payoffs for the second player.
+Payoffs can be integers, decimal numbers (e.g. 0.35 or 2.5e-3) or fractions
+(e.g. 7/20). The exact backends internally multiply payoffs of a player
+that are not all integers by their least common denominator (this does not
+change equilibria).
 
-Restrictions:
- - the game must be nondegenerative
+Degenerate games are supported (ties in the min-ratio test are broken
+by the lexicographic rule).
 """
     stream.write(helpText)
 
@@ -99,6 +545,30 @@ def printGameInfo(m1, m2, eq, stream):
     stream.write('\n')
 
 
+def printAllLabelsGameInfo(m1, m2, eqs, stream):
+    """Prints game information including all equilibria found from
+    all initially dropped labels to the selected stream.
+
+    m1 - matrix of the first player (Matrix)
+    m2 - matrix of the second player (Matrix)
+    eqs - list of tuples (eq, labels), where eq is an equilibrium and
+          labels is a list of initially dropped labels that lead to that
+          equilibrium (see lh.lemkeHowsonAllLabels())
+    stream - stream into which the game info will be printed
+    """
+    stream.write('Player 1:\n')
+    stream.write(repr(m1))
+    stream.write('\n')
+    stream.write('Player 2:\n')
+    stream.write(repr(m2))
+    for (eq, labels) in eqs:
+        stream.write('\n')
+        stream.write('Found MNE: ')
+        printEquilibrium(eq, stream)
+        stream.write(' (labels: %s)' % ', '.join(map(str, labels)))
+    stream.write('\n')
+
+
 def printEquilibrium(eq, stream):
     """Prints the selected equilibrium to the selected stream
     using the repr(eq) function. If some part of the equilibrium
@@ -109,15 +579,48 @@ def printEquilibrium(eq, stream):
     eq - equilibrium to be printed (tuple containing two tuples)
     stream - stream into which the equilibrium will be printed
     """
-    eqToPrint = repr(eq)
+    stream.write(equilibriumToStr(eq))
+
+
+def equilibriumToJson(eq):
+    """Returns the selected equilibrium as an object that can be encoded
+    into JSON (a list of two lists). Floats are kept as they are, other
+    numbers are converted into strings in the form a/b (or a if they are
+    integers).
+
+    eq - equilibrium (tuple containing two tuples)
+    """
+    def numberToJson(x):
+        if isinstance(x, float):
+            return x
+        text = str(x)
+        if text.endswith('/1'):
+            return text[:-2]
+        return text
+
+    return [[numberToJson(x) for x in eqPart] for eqPart in eq]
+
+
+def equilibriumToStr(eq):
+    """Returns the textual representation of the selected equilibrium
+    (see printEquilibrium()).
+
+    eq - equilibrium (tuple containing two tuples)
+    """
+    # Numbers are printed in the form a/b (repr() of some exact numbers
+    # is in the form Type(a, b)), floats are printed by repr()
+    def numberToStr(x):
+        return repr(x) if isinstance(x, float) else str(x)
+
+    def eqPartToStr(eqPart):
+        return '(' + ', '.join([numberToStr(x) for x in eqPart]) + ')'
+
+    eqToPrint = '(' + ', '.join([eqPartToStr(eqPart) for eqPart in eq]) + ')'
 
     # Perform some cosmetical enhancements:
-    # 1) Removed the redundant comma if a part of the equilibrium
-    # is a single strategy
-    eqToPrint = eqToPrint.replace(',)', ')')
-    # 2) Transform 0/1 into 0
+    # 1) Transform 0/1 into 0
     eqToPrint = eqToPrint.replace('0/1', '0')
-    # 3) Transform 1/1 into 1
+    # 2) Transform 1/1 into 1
     eqToPrint = eqToPrint.replace('1/1', '1')
 
-    stream.write(eqToPrint)
+    return eqToPrint
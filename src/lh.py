@@ -9,10 +9,25 @@ and various functions that are used in that algorithm.
 """
 
 
+import intlh
 import matrix
+import numfields
+import pivotstats
 import rational
 
 
+def getNormalizationConstant(m1, m2):
+    """Returns the constant that normalizeMatrices() adds to all items
+    of the selected matrices (the lowest item is found by a single min()
+    over all items of every matrix).
+
+    m1 - first matrix (Matrix)
+    m2 - second matrix (Matrix)
+    """
+    lowestVal = min(min(m1.getItems()), min(m2.getItems()))
+    return 0 if lowestVal > 0 else abs(lowestVal) + 1
+
+
 def normalizeMatrices(m1, m2):
     """Returns normalized selected matrices in a tuple.
     Normalized matrix does not have any row with all zeros, nor
@@ -23,39 +38,27 @@ def normalizeMatrices(m1, m2):
     m2 - second matrix to be normalized (Matrix)
 
     The normalization is done by adding a proper constant to all
-    item of both matrices (the least possible constant + 1 is chosen).
-    If both matrices do not have any negative items, nor any items
-    equal to zero, no constant is added.
+    item of both matrices (the least possible constant + 1 is chosen,
+    see getNormalizationConstant()). If both matrices do not have any
+    negative items, nor any items equal to zero, no constant is added.
     """
-    ms = (m1, m2)
-
-    # Check for the least value in both matrices
-    lowestVal = m1.getItem(1, 1)
-    for m in ms:
-        for i in xrange(1, m.getNumRows() + 1):
-            for j in xrange(1, m.getNumCols() + 1):
-                if m.getItem(i, j) < lowestVal:
-                    lowestVal = m.getItem(i, j)
-
-    normMs = (matrix.Matrix(m1.getNumRows(), m1.getNumCols()),
-               matrix.Matrix(m2.getNumRows(), m2.getNumCols()))
+    cnst = getNormalizationConstant(m1, m2)
 
     # Copy all items from both matrices and add a proper constant
     # to all values
-    cnst = 0 if lowestVal > 0 else abs(lowestVal) + 1
-    for k in xrange(0, len(normMs)):
-        for i in xrange(1, ms[k].getNumRows() + 1):
-            for j in xrange(1, ms[k].getNumCols() + 1):
-                normMs[k].setItem(i, j, ms[k].getItem(i, j) + cnst)
+    return tuple([matrix.Matrix(m.getNumRows(), m.getNumCols(),
+        [x + cnst for x in m.getItems()]) for m in (m1, m2)])
 
-    return normMs
 
-
-def createTableaux(m1, m2):
+def createTableaux(m1, m2, cnst=0):
     """Creates a tableaux from the two selected matrices.
 
     m1 - first matrix (Matrix instance)
     m2 - second matrix (Matrix instance)
+    cnst - constant added to all payoffs (number); the tableaux
+           of the normalized matrices (see normalizeMatrices()) is created
+           straight from the original matrices when the constant
+           from getNormalizationConstant() is used
 
     Preconditions:
         - m1 must have the same number of rows and columns as m2
@@ -66,38 +69,76 @@ def createTableaux(m1, m2):
         raise ValueError, 'Selected matrices does not have the same number ' +\
                 'of rows and columns'
 
+    p1SCount = m1.getNumRows()
+    p2SCount = m1.getNumCols()
     # The total number of strategies of both players
-    S = m1.getNumRows() + m1.getNumCols()
+    S = p1SCount + p2SCount
 
     # The tableaux will have S rows, because there are S slack variables
     # and S + 2 columns, because the first column is the index of the basis
     # in the current column and the second column is initially all 1s
     t = matrix.Matrix(S, S + 2)
 
-    # Initialize the first column (index of the currect basis variable).
-    # Because there are only slack variables at the beginning, initialize
-    # it to a sequence of negative numbers starting from -1.
-    for i in xrange(1, t.getNumRows() + 1):
-        t.setItem(i, 1, -i)
+    # Every row starts with the index of the current basis variable and its
+    # value. Because there are only slack variables at the beginning,
+    # indices are a sequence of negative numbers starting from -1 and all
+    # values are 1. The rest of the row contains the negated payoffs
+    # (a row of the first matrix or a column of the second matrix, both are
+    # taken from all items at once by slicing).
+    m1Items = m1.getItems()
+    m2Items = m2.getItems()
+    for i in xrange(1, p1SCount + 1):
+        t.setRow(i, [-i, 1] + p1SCount * [0] + [-(x + cnst) for x in
+            m1Items[(i - 1) * p2SCount:i * p2SCount]])
+    for j in xrange(1, p2SCount + 1):
+        t.setRow(p1SCount + j, [-(p1SCount + j), 1] + [-(x + cnst) for x in
+            m2Items[j - 1::p2SCount]] + p2SCount * [0])
 
-    # Initialize the second column to all 1s (current value of all basis)
-    for i in xrange(1, t.getNumRows() + 1):
-        t.setItem(i, 2, 1)
+    return t
 
-    # Initialize indices from the first matrix
-    for i in xrange(1, m1.getNumRows() + 1):
-        for j in xrange(1, m1.getNumCols() + 1):
-            t.setItem(i, m1.getNumRows() + j + 2, -m1.getItem(i, j))
 
-    # Initialize indices from the second matrix
-    for i in xrange(1, m2.getNumRows() + 1):
-        for j in xrange(1, m2.getNumCols() + 1):
-            t.setItem(m1.getNumRows() + j, i + 2, -m2.getItem(i, j))
+def breakRatioTie(rows, ebCoeff, perturbation, count, tol=0):
+    """Returns the row selected by the lexicographic min-ratio rule from
+    the selected rows, which have the same (minimal) ratio in the min-ratio
+    test.
 
-    return t
+    rows - rows with the same ratio (list of row identifiers)
+    ebCoeff - function returning the absolute value of the coefficient
+              of the entering variable in the selected row (number > 0)
+    perturbation - function (row, k) returning the coefficient of eps^(k+1)
+                   in the value of the basis variable of the selected row
+    count - number of perturbation terms (number of slack variables
+            in the part of the tableaux)
+    tol - differences lower than tol (in absolute value) are considered
+          zero (number; 0 for exact numbers)
+
+    The values of the basis variables are perturbed to value_i + eps^1 *
+    p_i1 + eps^2 * p_i2 + ..., where p_ik are coefficients of the kth
+    slack variable in the inverse of the current basis, and the row with
+    the lexicographically smallest vector of ratios is selected. Ratios
+    of the perturbation terms are compared one by one only until the tie
+    is broken (by cross multiplication, so no division is needed). Rows
+    of the inverse basis are linearly independent, so the selected row
+    is always unique and the algorithm cannot cycle on degenerate games.
+    """
+    for k in xrange(0, count):
+        bestRows = [rows[0]]
+        for row in rows[1:]:
+            # Compare p_row / ebCoeff(row) with p_best / ebCoeff(best)
+            # (Rationals cannot be subtracted, so the negation is added)
+            diff = perturbation(row, k) * ebCoeff(bestRows[0]) +\
+                -(perturbation(bestRows[0], k) * ebCoeff(row))
+            if diff < -tol:
+                bestRows = [row]
+            elif diff <= tol:
+                bestRows.append(row)
+        if len(bestRows) == 1:
+            return bestRows[0]
+        rows = bestRows
+    return rows[0]
 
 
-def makePivotingStep(t, p1SCount, ebVar):
+def makePivotingStep(t, p1SCount, ebVar, stats=None, field=None):
     """Makes a single pivoting step in the selected tableaux by
     bringing the selected variable into the basis. All changes are done
     in the original tableaux. Returns the variable that left the basis.
@@ -105,6 +146,11 @@ def makePivotingStep(t, p1SCount, ebVar):
     t - tableaux (Matrix)
     p1SCount - number of strategies of player 1 (number)
     ebVar - variable that will enter the basis (number)
+    stats - statistics of the current pivoting step are recorded into this
+            object (pivotstats.PivotStats or None if they should not be
+            recorded)
+    field - number field in which the computation is done
+            (numfields.NumberField or None for numfields.DEFAULT_FIELD)
 
     Preconditions:
         - 0 < abs(ebVar) <= t.getNumRows()
@@ -118,6 +164,8 @@ def makePivotingStep(t, p1SCount, ebVar):
     # 2nd precondition
     if p1SCount < 0 or t.getNumRows() <= p1SCount:
         raise ValueError, 'Invalid number of strategies of player 1.'
+    if field is None:
+        field = numfields.getField()
 
     # Returns the column corresponding to the selected variable
     def varToCol(var):
@@ -125,60 +173,89 @@ def makePivotingStep(t, p1SCount, ebVar):
         # columns in the tableaux
         return 2 + abs(var)
 
-    # Returns the list of row numbers which corresponds
-    # to the selected variable
-    def getRowNums(var):
+    # Returns the first and the last row number of the part of the tableaux
+    # which corresponds to the selected variable
+    def getRowRange(var):
         # Example (for a game 3x3):
         #   -1,-2,-3,4,5,6 corresponds to the first part of the tableaux
         #   1,2,3,-4,-5,-6 corresponds to the second part of the tableaux
         if -p1SCount <= var < 0 or var > p1SCount:
-            return xrange(1, p1SCount + 1)
+            return (1, p1SCount)
         else:
-            return xrange(p1SCount + 1, t.getNumRows() + 1)
+            return (p1SCount + 1, t.getNumRows())
+
+    (firstRow, lastRow) = getRowRange(ebVar)
+    ebCol = varToCol(ebVar)
+    ebCoeffs = t.getColSlice(ebCol, firstRow, lastRow)
+    values = t.getColSlice(2, firstRow, lastRow)
 
     # Check which variable should leave the basis using the min-ratio rule
     # (it will have the lowest ratio)
-    lbVar = None
     minRatio = None
+    tiedRows = []
     # Check only rows in the appropriate part of the tableaux
-    for i in getRowNums(ebVar):
-        if t.getItem(i, varToCol(ebVar)) < 0:
-            ratio = -rational.Rational(t.getItem(i, 2)) /\
-                    t.getItem(i, varToCol(ebVar))
+    for k in xrange(0, len(ebCoeffs)):
+        if ebCoeffs[k] < 0:
+            ratio = -field.convert(values[k]) / ebCoeffs[k]
             if minRatio == None or ratio < minRatio:
                 minRatio = ratio
-                lbVar = t.getItem(i, 1)
-                lbVarRow = i
-                lbVarCoeff = t.getItem(i, varToCol(ebVar))
+                tiedRows = [k]
+            elif ratio == minRatio:
+                tiedRows.append(k)
+    if not tiedRows:
+        raise ValueError, 'No variable can leave the basis.'
+    pivot = tiedRows[0]
+    if len(tiedRows) > 1:
+        # Degenerate step - slack variables of this part have labels
+        # firstRow..lastRow (see breakRatioTie())
+        def perturbation(k, j):
+            eps = -t.getItem(firstRow + k, varToCol(firstRow + j))
+            if t.getItem(firstRow + k, 1) == -(firstRow + j):
+                eps = eps + 1
+            return eps
+        pivot = breakRatioTie(tiedRows, lambda k: -ebCoeffs[k],
+            perturbation, lastRow - firstRow + 1)
+    lbVarRow = firstRow + pivot
+    lbVarCoeff = ebCoeffs[pivot]
+    lbVar = t.getItem(lbVarRow, 1)
+    if stats is not None:
+        stats.recordRatioTest(len(ebCoeffs),
+            len([c for c in ebCoeffs if c < 0]))
 
     # Update the row in which the variable that will leave the basis was
     # found in the previous step
     t.setItem(lbVarRow, 1, ebVar)
-    t.setItem(lbVarRow, varToCol(ebVar), 0)
+    t.setItem(lbVarRow, ebCol, 0)
     t.setItem(lbVarRow, varToCol(lbVar), -1)
-    for j in xrange(2, t.getNumCols() + 1):
-        newVal = rational.Rational(t.getItem(lbVarRow, j)) / abs(lbVarCoeff)
-        t.setItem(lbVarRow, j, newVal)
+    t.scaleRow(lbVarRow, field.one / abs(lbVarCoeff), 2)
 
     # Update other rows in the appropriate part of the tableaux
-    for i in getRowNums(ebVar):
-        if t.getItem(i, varToCol(ebVar)) != 0:
-            for j in xrange(2, t.getNumCols() + 1):
-                newVal = t.getItem(i, j) + t.getItem(i, varToCol(ebVar)) *\
-                        t.getItem(lbVarRow, j)
-                t.setItem(i, j, newVal)
-            t.setItem(i, varToCol(ebVar), 0)
+    # (whole rows are updated at once)
+    for k in xrange(0, len(ebCoeffs)):
+        i = firstRow + k
+        if i != lbVarRow and ebCoeffs[k] != 0:
+            t.axpyRow(i, lbVarRow, ebCoeffs[k], 2)
+            t.setItem(i, ebCol, 0)
+
+    if stats is not None:
+        stats.startBitSizeScan()
+        items = []
+        for i in xrange(firstRow, lastRow + 1):
+            items.extend(t.getRow(i, 2))
+        stats.recordBitSizes(*pivotstats.maxBitSizes(items))
 
     return lbVar
 
 
-def getEquilibrium(t, p1SCount):
+def getEquilibrium(t, p1SCount, field=None):
     """Returns the equilibrium from the given tableaux. The returned result
     might contain mixed strategies like (1/3, 0/1), so normalization is need to
     be performed on the result.
 
     t - tableaux (Matrix)
     p1SCount - number of strategies of player 1 (number)
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
 
     Preconditions:
         - 0 < p1SCount < t.getNumRows()
@@ -197,6 +274,8 @@ def getEquilibrium(t, p1SCount):
     for i in xrange(1, t.getNumRows() + 1):
         if not i in firstColNums:
             raise ValueError, 'Invalid indices in the first column of the tableaux.'
+    if field is None:
+        field = numfields.getField()
 
     # I decided to use a list instead of a tuple, because I need
     # to modify it (tuples are immutable)
@@ -210,73 +289,864 @@ def getEquilibrium(t, p1SCount):
         prob = t.getItem(i, 2)
         # If the strategy index or the probability is lower than zero,
         # set it to zero instead
-        eqs[abs(strat) - 1] = rational.Rational(0) if (strat < 0 or prob < 0) else prob
+        eqs[abs(strat) - 1] = field.zero if (strat < 0 or prob < 0) else prob
 
     # Convert the found equilibrium into a tuple
     return (tuple(eqs[0:p1SCount]), tuple(eqs[p1SCount:]))
 
 
-def normalizeEquilibrium(eq):
+def normalizeEquilibrium(eq, field=None):
     """Normalizes and returns the selected equilibrium (every probability
     in a players mixed strategy will have the same denominator).
 
-    eq - equilibrium to be normalized (tuple of two tuples of Rationals)
+    eq - equilibrium to be normalized (tuple of two tuples of numbers
+         of the selected field)
+    field - number field of the equilibrium (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD, i.e. Rationals)
 
     Preconditions:
         - len(eq) == 2 and len(eq[0] > 0) and len(eq[1]) > 0
-        - eq[x] must contain a non-empty tuple of Rationals for x in {1,2}
+        - eq[x] must contain a non-empty tuple of numbers of the selected
+          field for x in {1,2}
 
     Raises ValueError if some of the preconditions are not met.
     """
+    if field is None:
+        field = numfields.getField()
     # 1st precondition
     if len(eq) != 2 or (len(eq[0]) == 0 or len(eq[1]) == 0):
         raise ValueError, 'Selected equilibrium is not valid.'
     # 2nd precondition
     for i in xrange(0, 2):
         for j in xrange(0, len(eq[i])):
-            if not isinstance(eq[i][j], rational.Rational):
+            if not field.isElement(eq[i][j]):
                 raise ValueError, 'Selected equilibrium contains a ' +\
-                    'non-rational number.'
+                    'number which is not from the %s field.' % field.name
 
     # Normalizes a single part of the equilibrium (the normalization
     # procedure is the same as with vectors)
     def normalizeEqPart(eqPart):
-        probSum = reduce(lambda x, y: x + y, eqPart, 0)
-        return tuple(map(lambda x: x * probSum.recip(), eqPart))
+        probSum = reduce(lambda x, y: x + y, eqPart, field.zero)
+        scale = field.one / probSum
+        return tuple(map(lambda x: x * scale, eqPart))
 
     return (normalizeEqPart(eq[0]), normalizeEqPart(eq[1]))
 
 
-def lemkeHowson(m1, m2):
+class SplitTableaux(object):
+    """Tableaux split into two independent parts (one per player), which
+    is used by RationalEngine.
+
+    A pivoting step changes only one part of the tableaux from
+    createTableaux() and, in every part, only columns of nonbasic variables
+    can contain nonzero coefficients. Therefore, every part is stored
+    in a separate matrix with one row per basis variable and one column
+    per nonbasic variable of that part (about a half of the memory needed
+    by createTableaux()).
+
+    Attributes:
+        parts - both parts of the tableaux (list of two Matrix instances);
+                the first column contains indices of the basis variables,
+                the second column contains their values and the column
+                k + 2 contains coefficients of the kth nonbasic variable
+        nonbasis - nonbasic variables of both parts (list of two lists
+                   of numbers, the kth item is the variable of the column
+                   k + 2)
+    """
+
+    __slots__ = ('parts', 'nonbasis')
+
+    def __init__(self, parts, nonbasis):
+        """Creates the tableaux from the selected parts."""
+        self.parts = parts
+        self.nonbasis = nonbasis
+
+    def copy(self):
+        """Returns a copy of the tableaux."""
+        return SplitTableaux([part.copy() for part in self.parts],
+            [nonbasis[:] for nonbasis in self.nonbasis])
+
+
+def createSplitTableaux(m1, m2, field=None, cnst=0):
+    """Creates a split tableaux from the two selected matrices (SplitTableaux
+    instance). The tableaux represents the same tableaux
+    as createTableaux(m1, m2, cnst) (see splitTableauxToTableaux()), but
+    values and coefficients are numbers of the selected field.
+
+    m1 - first matrix (Matrix instance)
+    m2 - second matrix (Matrix instance)
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+    cnst - constant added to all payoffs (see createTableaux())
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    if m1.getNumRows() != m2.getNumRows() or m1.getNumCols() != m2.getNumCols():
+        raise ValueError, 'Selected matrices does not have the same number ' +\
+                'of rows and columns'
+
+    p1SCount = m1.getNumRows()
+    p2SCount = m1.getNumCols()
+    t = SplitTableaux([matrix.Matrix(p1SCount, p2SCount + 2),
+        matrix.Matrix(p2SCount, p1SCount + 2)], [[], []])
+    fillSplitTableaux(t, m1, m2, cnst, field)
+    return t
+
+
+def fillSplitTableaux(t, m1, m2, cnst=0, field=None):
+    """Fills the selected split tableaux with the initial tableaux
+    of the selected game whose payoffs are increased by the selected
+    constant, i.e. with createSplitTableaux(m1 + cnst, m2 + cnst). Matrices
+    and lists of the tableaux are reused, so no normalized matrices nor
+    a new tableaux have to be created.
+
+    t - tableaux created for a game with the same numbers of strategies
+        (SplitTableaux)
+    m1 - first matrix (Matrix instance)
+    m2 - second matrix (Matrix instance)
+    cnst - constant added to all payoffs (number, see
+           getNormalizationConstant())
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+    """
+    if field is None:
+        field = numfields.getField()
+
+    p1SCount = m1.getNumRows()
+    p2SCount = m1.getNumCols()
+    convert = field.convert
+    (t1, t2) = t.parts
+    # Fractional payoffs are scaled to integers, which are much cheaper
+    # to pivot on in every field
+    m1Items = rational.scaleToIntegers(m1.getItems(), cnst)
+    m2Items = rational.scaleToIntegers(m2.getItems(), cnst)
+    # Payoffs are usually drawn from a small set of values, so every
+    # distinct payoff is converted into the field only once (numbers
+    # of the field are immutable, so they can be shared)
+    negated = {}
+    for x in set(m1Items) | set(m2Items):
+        negated[x] = -convert(x)
+    m1Items = [negated[x] for x in m1Items]
+    m2Items = [negated[x] for x in m2Items]
+    # The first part: slack variables of the first player are in the basis,
+    # strategies of the second player are nonbasic (rows of m1)
+    for i in xrange(1, p1SCount + 1):
+        t1.setRow(i, [-i, field.one] +
+            m1Items[(i - 1) * p2SCount:i * p2SCount])
+    # The second part: slack variables of the second player are in the basis,
+    # strategies of the first player are nonbasic (columns of m2)
+    for j in xrange(1, p2SCount + 1):
+        t2.setRow(j, [-(p1SCount + j), field.one] +
+            m2Items[j - 1::p2SCount])
+    t.nonbasis[0][:] = xrange(p1SCount + 1, p1SCount + p2SCount + 1)
+    t.nonbasis[1][:] = xrange(1, p1SCount + 1)
+
+
+def makeSplitPivotingStep(t, p1SCount, ebVar, stats=None, field=None):
+    """Does the same as makePivotingStep(), but in a split tableaux.
+
+    t - tableaux (SplitTableaux)
+    p1SCount - number of strategies of player 1 (number)
+    ebVar - variable that will enter the basis (number)
+    stats - statistics of the current pivoting step are recorded into this
+            object (pivotstats.PivotStats or None if they should not be
+            recorded)
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+
+    Preconditions:
+        - 0 < abs(ebVar) <= total number of basis variables
+        - 0 < p1SCount < total number of basis variables
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    S = t.parts[0].getNumRows() + t.parts[1].getNumRows()
+    # 1st precondition
+    if abs(ebVar) <= 0 or abs(ebVar) > S:
+        raise ValueError, 'Selected variable index is invalid.'
+    # 2nd precondition
+    if p1SCount < 0 or S <= p1SCount:
+        raise ValueError, 'Invalid number of strategies of player 1.'
+    if field is None:
+        field = numfields.getField()
+
+    # Select the appropriate part of the tableaux and the column of the
+    # entering variable
+    if -p1SCount <= ebVar < 0 or ebVar > p1SCount:
+        k = 0
+    else:
+        k = 1
+    (part, nonbasis) = (t.parts[k], t.nonbasis[k])
+    for (ebPos, var) in enumerate(nonbasis):
+        if abs(var) == abs(ebVar):
+            break
+    else:
+        raise ValueError, 'Selected variable is already in the basis.'
+    ebCol = ebPos + 3
+    ebCoeffs = part.getColSlice(ebCol, 1, part.getNumRows())
+    values = part.getColSlice(2, 1, part.getNumRows())
+
+    # Check which variable should leave the basis using the min-ratio rule
+    # (it will have the lowest ratio)
+    minRatio = None
+    tiedRows = []
+    for i in xrange(0, len(ebCoeffs)):
+        if ebCoeffs[i] < 0:
+            ratio = -values[i] / ebCoeffs[i]
+            if minRatio == None or ratio < minRatio:
+                minRatio = ratio
+                tiedRows = [i]
+            elif ratio == minRatio:
+                tiedRows.append(i)
+    if not tiedRows:
+        raise ValueError, 'No variable can leave the basis.'
+    pivot = tiedRows[0]
+    if len(tiedRows) > 1:
+        # Degenerate step - slack variables of this part have labels
+        # firstLabel..firstLabel + number of rows - 1 and the coefficients
+        # of nonbasic slack variables are in their columns
+        firstLabel = 1 if k == 0 else p1SCount + 1
+        varCols = dict([(var, pos + 3) for (pos, var) in enumerate(nonbasis)])
+        def perturbation(i, j):
+            slackVar = -(firstLabel + j)
+            if slackVar in varCols:
+                return -part.getItem(i + 1, varCols[slackVar])
+            return 1 if part.getItem(i + 1, 1) == slackVar else 0
+        pivot = breakRatioTie(tiedRows, lambda i: -ebCoeffs[i],
+            perturbation, part.getNumRows())
+    if stats is not None:
+        stats.recordRatioTest(len(ebCoeffs),
+            len([c for c in ebCoeffs if c < 0]))
+
+    lbVar = _pivotSplitPart(part, nonbasis, ebPos, ebVar, pivot + 1, field)
+
+    if stats is not None:
+        stats.startBitSizeScan()
+        items = []
+        for i in xrange(1, part.getNumRows() + 1):
+            items.extend(part.getRow(i, 2))
+        stats.recordBitSizes(*pivotstats.maxBitSizes(items))
+
+    return lbVar
+
+
+def _pivotSplitPart(part, nonbasis, ebPos, ebVar, lbVarRow, field):
+    """Makes a pivoting step in the selected part of a split tableaux
+    on the selected row and the column of the selected nonbasic variable
+    (the coefficient must be nonzero). Returns the variable that left
+    the basis.
+
+    part - part of the tableaux (Matrix, see SplitTableaux)
+    nonbasis - nonbasic variables of the part (list of numbers)
+    ebPos - index of the entering variable in nonbasis (number)
+    ebVar - variable that will enter the basis (number)
+    lbVarRow - row of the variable that will leave the basis (number)
+    field - number field of the tableaux (numfields.NumberField)
+    """
+    ebCol = ebPos + 3
+    ebCoeffs = part.getColSlice(ebCol, 1, part.getNumRows())
+    lbVar = part.getItem(lbVarRow, 1)
+
+    # The entering and leaving variables exchange their places (the leaving
+    # variable gets the column of the entering variable); the pivot row
+    # is divided by the negated coefficient (it is negative in steps
+    # selected by the min-ratio rule)
+    part.setItem(lbVarRow, 1, ebVar)
+    part.setItem(lbVarRow, ebCol, -1)
+    part.scaleRow(lbVarRow, -field.one / ebCoeffs[lbVarRow - 1], 2)
+    nonbasis[ebPos] = lbVar
+
+    # Update other rows (whole rows are updated at once)
+    for i in xrange(0, len(ebCoeffs)):
+        if i + 1 != lbVarRow and ebCoeffs[i] != 0:
+            part.setItem(i + 1, ebCol, 0)
+            part.axpyRow(i + 1, lbVarRow, ebCoeffs[i], 2)
+
+    return lbVar
+
+
+def checkBasis(basis, p1SCount, S):
+    """Checks whether the selected basis is a complementary basis
+    of a tableaux of a game with the selected numbers of strategies, i.e.
+    whether it can be passed to pivotSplitToBasis() (or to pivotToBasis()
+    of any engine).
+
+    basis - basis variables (list of numbers in any order, see
+            RationalEngine.getBasis())
+    p1SCount - number of strategies of player 1 (number)
+    S - total number of strategies of both players (number)
+
+    Every label from 1 to S has to be in the basis exactly once (either
+    as the strategy or as the slack variable) and the first part
+    of the tableaux has to contain p1SCount basis variables.
+
+    Raises ValueError if the basis is invalid.
+    """
+    if len(basis) != S or len(set([abs(var) for var in basis])) != S:
+        raise ValueError, 'Selected basis is not complementary.'
+    p1BasisCount = 0
+    for var in basis:
+        if var == 0 or abs(var) > S:
+            raise ValueError, 'Selected basis contains an invalid variable.'
+        if -p1SCount <= var < 0 or var > p1SCount:
+            p1BasisCount += 1
+    if p1BasisCount != p1SCount:
+        raise ValueError, 'Selected basis is not complementary.'
+
+
+def pivotSplitToBasis(t, p1SCount, basis, field=None):
+    """Makes pivoting steps in the selected split tableaux until its basis
+    is the selected basis (the min-ratio rule is not used, so the resulting
+    basis does not have to be feasible). All changes are done in the original
+    tableaux. Returns True if the resulting basis is feasible (all values
+    are nonnegative), False otherwise.
+
+    t - tableaux (SplitTableaux)
+    p1SCount - number of strategies of player 1 (number)
+    basis - basis variables (list of numbers, see checkBasis())
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+
+    Raises ValueError if the basis is invalid (see checkBasis()) or if
+    the basis matrix is singular (the basis does not exist in the tableaux).
+    """
+    S = t.parts[0].getNumRows() + t.parts[1].getNumRows()
+    checkBasis(basis, p1SCount, S)
+    if field is None:
+        field = numfields.getField()
+
+    targets = set(basis)
+    for (part, nonbasis) in zip(t.parts, t.nonbasis):
+        for ebPos in xrange(0, len(nonbasis)):
+            if nonbasis[ebPos] not in targets:
+                continue
+            # The leaving variable is the basis variable that is not
+            # in the selected basis with the largest coefficient
+            # (in absolute value) of the entering variable
+            lbVarRow = None
+            for i in xrange(1, part.getNumRows() + 1):
+                coeff = part.getItem(i, ebPos + 3)
+                if coeff != 0 and part.getItem(i, 1) not in targets and \
+                        (lbVarRow is None or abs(coeff) > maxCoeff):
+                    (lbVarRow, maxCoeff) = (i, abs(coeff))
+            if lbVarRow is None:
+                raise ValueError, 'Selected basis is singular.'
+            _pivotSplitPart(part, nonbasis, ebPos, nonbasis[ebPos], lbVarRow,
+                field)
+
+    for part in t.parts:
+        for value in part.getColSlice(2, 1, part.getNumRows()):
+            if value < 0:
+                return False
+    return True
+
+
+def splitTableauxToTableaux(t):
+    """Returns the selected split tableaux converted into the form
+    of createTableaux() (Matrix).
+
+    t - tableaux (SplitTableaux)
+    """
+    S = t.parts[0].getNumRows() + t.parts[1].getNumRows()
+    tableaux = matrix.Matrix(S, S + 2)
+    i = 1
+    for (part, nonbasis) in zip(t.parts, t.nonbasis):
+        for partRow in xrange(1, part.getNumRows() + 1):
+            tableaux.setRow(i, part.getRow(partRow, 1)[0:2])
+            for (k, var) in enumerate(nonbasis):
+                tableaux.setItem(i, abs(var) + 2, part.getItem(partRow, k + 3))
+            i += 1
+    return tableaux
+
+
+def getSplitEquilibrium(t, p1SCount, field=None):
+    """Returns the same equilibrium as getEquilibrium() returns for
+    splitTableauxToTableaux(t), but only the first two columns of the whole
+    tableaux (indices and values of the basis variables) are created.
+
+    t - tableaux (SplitTableaux)
+    p1SCount - number of strategies of player 1 (number)
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+
+    Raises ValueError in the same cases as getEquilibrium().
+    """
+    S = t.parts[0].getNumRows() + t.parts[1].getNumRows()
+    basisValues = matrix.Matrix(S, 2)
+    i = 1
+    for part in t.parts:
+        for partRow in xrange(1, part.getNumRows() + 1):
+            basisValues.setRow(i,
+                [part.getItem(partRow, 1), part.getItem(partRow, 2)])
+            i += 1
+    return getEquilibrium(basisValues, p1SCount, field)
+
+
+class RationalEngine(object):
+    """Pivoting engine for lemkeHowson() working with split tableaux of exact
+    rational numbers (see SplitTableaux). Found equilibria are tuples
+    of numbers of the selected field (Rationals by default)."""
+
+    def __init__(self, field=None):
+        """Creates the engine.
+
+        field - number field of tableaux (numfields.NumberField or None
+                for numfields.DEFAULT_FIELD)
+        """
+        self.field = numfields.getField(field)
+
+    def normalizeMatrices(self, m1, m2):
+        """See normalizeMatrices()."""
+        return normalizeMatrices(m1, m2)
+
+    def getNormalizationConstant(self, m1, m2):
+        """See getNormalizationConstant()."""
+        return getNormalizationConstant(m1, m2)
+
+    def createTableaux(self, m1, m2, cnst=0):
+        """See createSplitTableaux()."""
+        return createSplitTableaux(m1, m2, self.field, cnst)
+
+    def fillTableaux(self, t, m1, m2, cnst=0):
+        """See fillSplitTableaux()."""
+        fillSplitTableaux(t, m1, m2, cnst, self.field)
+
+    def copyTableaux(self, t):
+        """Returns a copy of the selected tableaux."""
+        return t.copy()
+
+    def getBasis(self, t):
+        """Returns basis variables of the selected tableaux (list of numbers
+        in the order of rows of createTableaux())."""
+        return t.parts[0].getColSlice(1, 1, t.parts[0].getNumRows()) +\
+            t.parts[1].getColSlice(1, 1, t.parts[1].getNumRows())
+
+    def makePivotingStep(self, t, p1SCount, ebVar, stats=None):
+        """See makeSplitPivotingStep()."""
+        return makeSplitPivotingStep(t, p1SCount, ebVar, stats, self.field)
+
+    def pivotToBasis(self, t, p1SCount, basis):
+        """See pivotSplitToBasis()."""
+        return pivotSplitToBasis(t, p1SCount, basis, self.field)
+
+    def getEquilibrium(self, t, p1SCount):
+        """Returns the normalized equilibrium from the given tableaux
+        (see getSplitEquilibrium() and normalizeEquilibrium())."""
+        return normalizeEquilibrium(getSplitEquilibrium(t, p1SCount,
+            self.field), self.field)
+
+    def equilibriaEqual(self, eq1, eq2):
+        """Returns True if the two selected equilibria are equal,
+        False otherwise."""
+        return self.field.equilibriaEqual(eq1, eq2)
+
+
+# Names of the available pivoting engines (backends)
+BACKENDS = ('rational', 'integer', 'numpy', 'sparse')
+
+# Name of the backend which is selected according to the selected game
+# (see selectBackend())
+AUTO_BACKEND = 'auto'
+
+# Games with a lower ratio of nonzero payoffs are solved by the sparse
+# backend when the backend is selected automatically
+SPARSE_DENSITY_THRESHOLD = 0.1
+
+
+def getDensity(m1, m2):
+    """Returns the ratio of nonzero payoffs in the selected game (number
+    from 0 to 1).
+
+    m1 - matrix of profits of the first player (Matrix)
+    m2 - matrix of profits of the second player (Matrix)
+    """
+    nonzeros = 0
+    for m in (m1, m2):
+        for i in xrange(1, m.getNumRows() + 1):
+            for x in m.getRow(i):
+                if x != 0:
+                    nonzeros += 1
+    return float(nonzeros) / (m1.getNumRows() * m1.getNumCols() +
+        m2.getNumRows() * m2.getNumCols())
+
+
+def selectBackend(m1, m2, backend=AUTO_BACKEND):
+    """Returns the name of the backend that should be used for the selected
+    game. If backend is AUTO_BACKEND, 'sparse' is returned for games whose
+    density (see getDensity()) is lower than SPARSE_DENSITY_THRESHOLD
+    and 'rational' for other games. Otherwise, backend is returned.
+
+    m1 - matrix of profits of the first player (Matrix)
+    m2 - matrix of profits of the second player (Matrix)
+    backend - name of the backend (one of BACKENDS or AUTO_BACKEND)
+    """
+    if backend != AUTO_BACKEND:
+        return backend
+    if getDensity(m1, m2) < SPARSE_DENSITY_THRESHOLD:
+        return 'sparse'
+    return 'rational'
+
+
+def getEngine(backend='rational', tol=None, field=None):
+    """Returns a pivoting engine for the selected backend.
+
+    backend - name of the backend (one of BACKENDS; use selectBackend()
+              to get the backend for AUTO_BACKEND)
+    tol - tolerance used by floating-point backends (number or None
+          for the default tolerance)
+    field - name of the number field used by the backend (one
+            of numfields.FIELDS or None for the default field
+            of the backend); the numpy backend supports only 'float'
+
+    Raises ValueError if there is no such backend or field or if the backend
+    does not support the field. Raises ImportError if the backend
+    or the field needs a module which is not installed.
+    """
+    if backend == 'rational':
+        return RationalEngine(numfields.getField(field))
+    elif backend == 'integer':
+        return intlh.IntegerEngine(numfields.getField(field))
+    elif backend == 'numpy':
+        if field is not None and numfields.getField(field).name != 'float':
+            raise ValueError, 'Backend numpy supports only the float field.'
+        # This import must be here because NumPy is an optional dependency
+        import numpylh
+        if tol is None:
+            tol = numpylh.DEFAULT_TOLERANCE
+        return numpylh.FloatEngine(tol)
+    elif backend == 'sparse':
+        # This import must be here because sparselh imports this module
+        import sparselh
+        return sparselh.SparseEngine(numfields.getField(field))
+    else:
+        raise ValueError, 'Unknown backend: %s.' % backend
+
+
+def followPath(engine, t, p1SCount, initBasisVar, stats=None, limits=None):
+    """Makes pivoting steps in the selected tableaux until the equilibrium
+    is found (the variable that left the basis is the same (in absolute
+    value) as the variable that was used as an initial pivot). All changes
+    are done in the original tableaux.
+
+    engine - pivoting engine (see getEngine())
+    t - tableaux created by the engine
+    p1SCount - number of strategies of player 1 (number)
+    initBasisVar - the initial pivot, i.e. the dropped label (number)
+    stats - all pivoting steps are recorded into this object
+            (pivotstats.PivotStats or None if they should not be recorded)
+    limits - limits of the path (pathlimits.PathLimits or None if the path
+             is not limited)
+
+    Raises pathlimits.PathLimitError (its subclass) if the path exceeds
+    some of the selected limits.
+    """
+    if stats is None and limits is None:
+        leftBasisVar = engine.makePivotingStep(t, p1SCount, initBasisVar)
+        while abs(leftBasisVar) != initBasisVar:
+            leftBasisVar = engine.makePivotingStep(t, p1SCount, -leftBasisVar)
+        return
+
+    # Every pivoting step is recorded and/or checked by followPathSteps()
+    for step in followPathSteps(engine, t, p1SCount, initBasisVar, stats,
+            limits):
+        pass
+
+
+def followPathSteps(engine, t, p1SCount, initBasisVar, stats=None,
+        limits=None):
+    """Does the same as followPath(), but it is a generator which yields
+    a tuple (ebVar, lbVar) after every pivoting step, where ebVar
+    is the variable that entered the basis and lbVar is the variable that
+    left it. The path ends after the step in which abs(lbVar) is equal
+    to initBasisVar; it can be abandoned after any step by not resuming
+    the generator.
+    """
+    if stats is not None:
+        stats.startPath(initBasisVar)
+    checker = None
+    if limits is not None:
+        checker = limits.startPath(engine, t)
+    ebVar = initBasisVar
+    while True:
+        if checker is not None:
+            checker.checkPivot(ebVar)
+        if stats is not None:
+            stats.startPivot(ebVar)
+            leftBasisVar = engine.makePivotingStep(t, p1SCount, ebVar, stats)
+            stats.endPivot(leftBasisVar)
+        else:
+            leftBasisVar = engine.makePivotingStep(t, p1SCount, ebVar)
+        yield (ebVar, leftBasisVar)
+        if abs(leftBasisVar) == initBasisVar:
+            return
+        ebVar = -leftBasisVar
+
+
+class PathStatus(object):
+    """Status of a path followed by lemkeHowsonSteps().
+
+    Attributes:
+        pivots - number of pivoting steps made so far (number)
+        label - label of the variable that entered the basis in the last
+                pivoting step (number)
+        support - strategies of the first and the second player (tuple
+                  of two tuples of numbers, strategies of both players
+                  are numbered from 1) that are in the current basis,
+                  or None if supports were not requested
+        eq - the found equilibrium (see lemkeHowson()) if the path
+             has ended, None otherwise
+    """
+
+    def __init__(self, pivots, label, support=None, eq=None):
+        """Creates the status (see the class description)."""
+        self.pivots = pivots
+        self.label = label
+        self.support = support
+        self.eq = eq
+
+    def isDone(self):
+        """Returns True if the path has ended, False otherwise."""
+        return self.eq is not None
+
+
+def _getSupport(engine, t, p1SCount):
+    """Returns strategies of both players that are in the basis
+    of the selected tableaux (see PathStatus)."""
+    basis = [var for var in engine.getBasis(t) if var > 0]
+    basis.sort()
+    return (tuple([var for var in basis if var <= p1SCount]),
+        tuple([var - p1SCount for var in basis if var > p1SCount]))
+
+
+def lemkeHowsonSteps(m1, m2, backend=AUTO_BACKEND, tol=None, initBasisVar=1,
+        stats=None, field=None, limits=None, every=1, support=False):
+    """Does the same as lemkeHowson(), but returns a generator which makes
+    pivoting steps only when it is resumed, so many games can be solved
+    in one thread by resuming their generators in turns and any of them can
+    be abandoned (e.g. when its deadline is reached) after any step.
+
+    m1, m2, backend, tol, initBasisVar, stats, field, limits - see
+        lemkeHowson()
+    every - the generator yields after every pivoting step if it is 1,
+            after every every-th pivoting step otherwise (number)
+    support - if True, every yielded status contains the strategies that
+              are in the current basis (it costs a pass over the basis)
+
+    The generator yields PathStatus instances. The last one is yielded
+    after the last pivoting step (regardless of every) and it contains
+    the found equilibrium.
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+        - 0 < initBasisVar <= m1.getNumRows() + m1.getNumCols()
+        - every > 0
+
+    Raises ValueError if some of the preconditions are not met, if the
+    selected backend or field does not exist or if the backend does not
+    support the field (before the generator is returned). The generator
+    raises pathlimits.PathLimitError (its subclass) if the path exceeds
+    some of the selected limits.
+    """
+    engine = getEngine(selectBackend(m1, m2, backend), tol, field)
+    if initBasisVar <= 0 or initBasisVar > m1.getNumRows() + m1.getNumCols():
+        raise ValueError, 'Invalid initial basis variable.'
+    if every <= 0:
+        raise ValueError, 'Invalid number of pivoting steps between statuses.'
+    t = engine.createTableaux(m1, m2, engine.getNormalizationConstant(m1, m2))
+    return _lemkeHowsonSteps(engine, t, m1.getNumRows(), initBasisVar, stats,
+        limits, every, support)
+
+
+def _lemkeHowsonSteps(engine, t, p1SCount, initBasisVar, stats, limits,
+        every, support):
+    """Generator returned by lemkeHowsonSteps()."""
+    pivots = 0
+    for (ebVar, lbVar) in followPathSteps(engine, t, p1SCount, initBasisVar,
+            stats, limits):
+        pivots += 1
+        if abs(lbVar) == initBasisVar:
+            eq = engine.getEquilibrium(t, p1SCount)
+        elif pivots % every == 0:
+            eq = None
+        else:
+            continue
+        pathSupport = None
+        if support:
+            pathSupport = _getSupport(engine, t, p1SCount)
+        yield PathStatus(pivots, abs(ebVar), pathSupport, eq)
+
+
+def lemkeHowson(m1, m2, backend=AUTO_BACKEND, tol=None, initBasisVar=1,
+        stats=None, field=None, limits=None):
     """Runs the Lemke-Howson algorithm on the selected two matrices and
     returns the found equilibrium in mixed strategies. The equilibrium
     will be normalized before it is returned.
 
     m1 - matrix of profits of the first player (Matrix)
     m2 - matrix of profits of the second player (Matrix)
+    backend - pivoting engine to be used (see BACKENDS); 'rational'
+              computes the exact equilibrium (tuple of two tuples
+              of Rationals), 'integer' computes the same equilibrium
+              by using integer (fraction-free) pivoting, 'sparse' computes
+              it by using a tableaux that stores only nonzero items,
+              'numpy' computes it in floating-point arithmetic (tuple
+              of two tuples of floats) and AUTO_BACKEND selects 'sparse'
+              or 'rational' according to the density of the game (see
+              selectBackend())
+    tol - tolerance used by floating-point backends (number or None
+          for the default tolerance)
+    initBasisVar - the initially dropped label, i.e. the variable that
+                   enters the basis in the first pivoting step (number
+                   from 1 to the total number of strategies of both players)
+    stats - all pivoting steps are recorded into this object
+            (pivotstats.PivotStats or None if they should not be recorded)
+    field - name of the number field in which exact backends compute
+            (one of numfields.FIELDS or None for numfields.DEFAULT_FIELD);
+            the found equilibrium contains numbers of this field
+    limits - limits of the path (pathlimits.PathLimits or None if the path
+             is not limited)
 
     Preconditions:
         - m1 must have the same number of rows and columns as m2
-        - the game specified by m1 and m2 must be nondegenerative
+        - 0 < initBasisVar <= m1.getNumRows() + m1.getNumCols()
 
-    Raises ValueError if the first precondition is not met.
+    Raises ValueError if the first or the last precondition is not met,
+    if the selected backend or field does not exist or if the backend does
+    not support the field. Raises pathlimits.PathLimitError (its subclass)
+    if the path exceeds some of the selected limits.
     """
-    # Before we start, we need to normalize both matrices
-    # to ensure some assumptions about values in both matrices
-    (normM1, normM2) = normalizeMatrices(m1, m2)
+    engine = getEngine(selectBackend(m1, m2, backend), tol, field)
+    if initBasisVar <= 0 or initBasisVar > m1.getNumRows() + m1.getNumCols():
+        raise ValueError, 'Invalid initial basis variable.'
 
     # Create the tableaux that will be used in the pivoting procedure
-    t = createTableaux(normM1, normM2)
+    # (both matrices are normalized to ensure some assumptions about values
+    # in both matrices, the tableaux is created from the original matrices
+    # with the normalization constant added to all payoffs)
+    t = engine.createTableaux(m1, m2, engine.getNormalizationConstant(m1, m2))
 
     # Make pivoting steps until the equilibrium is found
-    # (the variable that left the basis is the same (in absolute value)
-    # as the variable that we used as an initial pivot)
-    p1SCount = normM1.getNumRows()
-    initBasisVar = 1
-    leftBasisVar = makePivotingStep(t, p1SCount, initBasisVar)
-    while abs(leftBasisVar) != initBasisVar:
-        leftBasisVar = makePivotingStep(t, p1SCount, -leftBasisVar)
-
-    # Get the equilibrium from the resulting tableaux,
-    # normalize it and return it
-    return normalizeEquilibrium(getEquilibrium(t, p1SCount))
+    p1SCount = m1.getNumRows()
+    followPath(engine, t, p1SCount, initBasisVar, stats, limits)
+
+    # Get the equilibrium from the resulting tableaux
+    # (it is normalized by the engine)
+    return engine.getEquilibrium(t, p1SCount)
+
+
+def lemkeHowsonFromBasis(m1, m2, basis=None, backend=AUTO_BACKEND, tol=None,
+        initBasisVar=1, stats=None, field=None, limits=None):
+    """Runs the Lemke-Howson algorithm on the selected two matrices starting
+    from the selected basis (warm start) and returns a tuple (eq, basis),
+    where eq is the found equilibrium (see lemkeHowson()) and basis is
+    the final basis of the tableaux (list of numbers), which can be passed
+    to the next call of this function.
+
+    m1 - matrix of profits of the first player (Matrix)
+    m2 - matrix of profits of the second player (Matrix)
+    basis - final basis returned by a previous call of this function,
+            usually for a game which differs from the selected game only
+            slightly (list of numbers, see checkBasis()), or None
+            for a cold start
+    backend, tol, initBasisVar, stats, field, limits - see lemkeHowson()
+
+    The initial tableaux is pivoted directly into the selected basis
+    (no min-ratio tests are done and these steps are not recorded
+    into stats). If the basis is feasible in the new tableaux, it is
+    a complementary basis, so it gives an equilibrium of the selected game
+    and no path has to be followed. Otherwise (or if the basis is singular
+    in the new tableaux or if it is the initial basis), the path from
+    initBasisVar is followed from the initial tableaux as in lemkeHowson().
+    Therefore, the found equilibrium may differ from the one found
+    by lemkeHowson() for the same game.
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+        - 0 < initBasisVar <= m1.getNumRows() + m1.getNumCols()
+        - basis is None or a complementary basis (see checkBasis())
+
+    Raises ValueError if some of the preconditions are not met, if the
+    selected backend or field does not exist or if the backend does not
+    support the field. Raises pathlimits.PathLimitError (its subclass)
+    if the path exceeds some of the selected limits.
+    """
+    engine = getEngine(selectBackend(m1, m2, backend), tol, field)
+    S = m1.getNumRows() + m1.getNumCols()
+    if initBasisVar <= 0 or initBasisVar > S:
+        raise ValueError, 'Invalid initial basis variable.'
+    p1SCount = m1.getNumRows()
+    if basis is not None:
+        checkBasis(basis, p1SCount, S)
+
+    cnst = engine.getNormalizationConstant(m1, m2)
+    t = engine.createTableaux(m1, m2, cnst)
+
+    # Only the initial basis contains no strategies
+    if basis is not None and max(basis) > 0:
+        try:
+            feasible = engine.pivotToBasis(t, p1SCount, basis)
+        except ValueError:
+            # The basis is singular in the new tableaux
+            feasible = False
+        if feasible:
+            return (engine.getEquilibrium(t, p1SCount), engine.getBasis(t))
+        t = engine.createTableaux(m1, m2, cnst)
+
+    followPath(engine, t, p1SCount, initBasisVar, stats, limits)
+    return (engine.getEquilibrium(t, p1SCount), engine.getBasis(t))
+
+
+def lemkeHowsonAllLabels(m1, m2, backend=AUTO_BACKEND, tol=None,
+        stats=None, field=None, limits=None):
+    """Runs the Lemke-Howson algorithm from every initially dropped label
+    (1, 2, ..., m + n, where m and n are numbers of strategies of both
+    players) and returns all found equilibria together with labels
+    that lead to them.
+
+    m1 - matrix of profits of the first player (Matrix)
+    m2 - matrix of profits of the second player (Matrix)
+    backend - pivoting engine to be used (see lemkeHowson())
+    tol - tolerance used by floating-point backends (see lemkeHowson())
+    stats - pivoting steps of all paths are recorded into this object
+            (see lemkeHowson())
+    field - number field used by the backend (see lemkeHowson())
+    limits - limits of every path (see lemkeHowson())
+
+    The result is a list of tuples (eq, labels), where eq is a found
+    equilibrium (see lemkeHowson()) and labels is a list of initially
+    dropped labels that lead to that equilibrium (in ascending order).
+    Every equilibrium is in the list only once. Equilibria are ordered
+    by the lowest label that leads to them.
+
+    The initial tableaux of the normalized game is created only once;
+    every path starts from a copy of that tableaux.
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+
+    Raises ValueError if the first precondition is not met, if the selected
+    backend or field does not exist or if the backend does not support
+    the field. Raises pathlimits.PathLimitError (its subclass) if some path
+    exceeds some of the selected limits.
+    """
+    engine = getEngine(selectBackend(m1, m2, backend), tol, field)
+    initT = engine.createTableaux(m1, m2,
+        engine.getNormalizationConstant(m1, m2))
+    p1SCount = m1.getNumRows()
+
+    eqs = []
+    for label in xrange(1, m1.getNumRows() + m1.getNumCols() + 1):
+        t = engine.copyTableaux(initT)
+        followPath(engine, t, p1SCount, label, stats, limits)
+        eq = engine.getEquilibrium(t, p1SCount)
+        for (foundEq, labels) in eqs:
+            if engine.equilibriaEqual(foundEq, eq):
+                labels.append(label)
+                break
+        else:
+            eqs.append((eq, [label]))
+
+    return eqs
@@ -52,8 +52,8 @@ def fromText(text, itemFromStrFunc=int):
         m = Matrix(rows, cols)
         for i in xrange(0, rows):
             rowItems = re.findall(matrixItemRE, lines[i])
-            for j in xrange(0, cols):
-                m.setItem(i + 1, j + 1, itemFromStrFunc(rowItems[j]))
+            m.setRow(i + 1, [itemFromStrFunc(rowItems[j])
+                for j in xrange(0, cols)])
         return m
     except IndexError, e:
         raise InvalidMatrixReprError, e.message
@@ -62,19 +62,31 @@ def fromText(text, itemFromStrFunc=int):
 class Matrix(object):
     """This class represents a matrix in a two dimensional space.
 
+    Items are stored row by row in a single flat list, so whole rows
+    can be read and updated by the bulk operations (getRow(), setRow(),
+    scaleRow(), axpyRow(), getColSlice(), setColSlice()) without going
+    through getItem()/setItem() for every single item.
+
     Objects of this class are mutable."""
 
-    def __init__(self, rows, cols):
+    __slots__ = ('__rows', '__cols', '__items')
+
+    def __init__(self, rows, cols, items=None):
         """Creates a matrix with the selected number of rows and columns.
 
         rows - number of rows
         cols - numer of columns
+        items - list of all items of the matrix stored row by row (it is used
+                as the storage of the matrix without copying) or None;
+                any other sequence that supports indexing and slicing
+                can be used instead of a list
 
-        All elements are initialized to zero.
+        If items is None, all elements are initialized to zero.
 
         Preconditions:
             - rows > 0
             - cols > 0
+            - if items is not None, len(items) == rows * cols
 
         Raises ValueError if some of the preconditions are not met.
         """
@@ -82,17 +94,31 @@ class Matrix(object):
             raise ValueError, 'Number of matrix rows must be greater than zero.'
         if cols <= 0:
             raise ValueError, 'Number of matrix cols must be greater than zero.'
+        if items is not None and len(items) != rows * cols:
+            raise ValueError, 'Number of items does not match the number ' +\
+                'of matrix rows and cols.'
 
         self.__rows = rows
         self.__cols = cols
 
-        # Create the matrix and initialize all elements to zero
-        self.__m = []
-        for i in xrange(1, self.__rows + 1):
-            row = []
-            for j in xrange(1, self.__cols + 1):
-                row.append(0)
-            self.__m.append(row)
+        if items is None:
+            # Create the matrix and initialize all elements to zero
+            items = [0] * (rows * cols)
+        self.__items = items
+
+    def __checkRow(self, i):
+        """Raises IndexError if i is not a valid row number."""
+        if i < 0:
+            raise IndexError, 'Row index must be nonnegative.'
+        if i == 0 or i > self.__rows:
+            raise IndexError, 'Row index out of range.'
+
+    def __checkCol(self, j):
+        """Raises IndexError if j is not a valid column number."""
+        if j < 0:
+            raise IndexError, 'Column index must be nonnegative.'
+        if j == 0 or j > self.__cols:
+            raise IndexError, 'Column index out of range.'
 
     def getNumRows(self):
         """Returns the number of rows of the matrix."""
@@ -110,17 +136,15 @@ class Matrix(object):
         val - value to be set
 
         Preconditions:
-            - 0 < i < getNumRows()
-            - 0 < j < getNumCols()
+            - 0 < i <= getNumRows()
+            - 0 < j <= getNumCols()
 
         Raises IndexError if some of the preconditions are not met.
         """
-        if i < 0:
-            raise IndexError, 'Row index must be nonnegative.'
-        if j < 0:
-            raise IndexError, 'Column index must be nonnegative.'
+        self.__checkRow(i)
+        self.__checkCol(j)
 
-        self.__m[i - 1][j - 1] = val
+        self.__items[(i - 1) * self.__cols + j - 1] = val
 
     def getItem(self, i, j):
         """Returns the item on the ith row and jth column.
@@ -129,17 +153,157 @@ class Matrix(object):
         j - columns number
 
         Preconditions:
-            - 0 < i < getNumRows()
-            - 0 < j < getNumCols()
+            - 0 < i <= getNumRows()
+            - 0 < j <= getNumCols()
 
         Raises IndexError if some of the preconditions are not met.
         """
-        if i < 0:
-            raise IndexError, 'Row index must be nonnegative.'
-        if j < 0:
-            raise IndexError, 'Column index must be nonnegative.'
+        self.__checkRow(i)
+        self.__checkCol(j)
+
+        return self.__items[(i - 1) * self.__cols + j - 1]
+
+    def getItems(self):
+        """Returns a list of all items of the matrix stored row by row
+        (the item on the ith row and jth column has the index
+        (i - 1) * getNumCols() + j - 1). The returned list is a copy,
+        so changing it does not change the matrix.
+
+        All items are obtained at once, which is much faster than getting
+        them one by one.
+        """
+        # Slicing decodes all items at once also for other sequences than
+        # lists (see the constructor)
+        items = self.__items[:]
+        if not isinstance(items, list):
+            items = list(items)
+        return items
+
+    def getRow(self, i, fromCol=1):
+        """Returns a list of items on the ith row starting from the
+        selected column. The returned list is a copy, so changing it
+        does not change the matrix.
+
+        i - row number
+        fromCol - number of the first column to be returned
+
+        Raises IndexError if i or fromCol is not a valid index.
+        """
+        self.__checkRow(i)
+        self.__checkCol(fromCol)
+
+        start = (i - 1) * self.__cols
+        return self.__items[start + fromCol - 1:start + self.__cols]
+
+    def setRow(self, i, vals, fromCol=1):
+        """Sets items on the ith row to the selected values. The first
+        value is stored into the fromCol column, the second into
+        the next column etc.
+
+        i - row number
+        vals - sequence of values to be set
+        fromCol - number of the column where the first value will be stored
+
+        Raises IndexError if i or fromCol is not a valid index or if
+        the values do not fit into the row.
+        """
+        self.__checkRow(i)
+        self.__checkCol(fromCol)
+        if fromCol + len(vals) - 1 > self.__cols:
+            raise IndexError, 'Too many values for the selected row.'
+
+        start = (i - 1) * self.__cols + fromCol - 1
+        self.__items[start:start + len(vals)] = vals
+
+    def scaleRow(self, i, alpha, fromCol=1):
+        """Multiplies all items on the ith row (starting from the selected
+        column) by alpha.
+
+        i - row number
+        alpha - multiplier
+        fromCol - number of the first column to be multiplied
+
+        Raises IndexError if i or fromCol is not a valid index.
+        """
+        self.__checkRow(i)
+        self.__checkCol(fromCol)
+
+        items = self.__items
+        for k in xrange((i - 1) * self.__cols + fromCol - 1, i * self.__cols):
+            items[k] = items[k] * alpha
+
+    def axpyRow(self, i, k, alpha, fromCol=1):
+        """Adds alpha multiple of the kth row to the ith row (only items
+        starting from the selected column are changed). That is,
+        row_i = row_i + alpha * row_k.
+
+        i - number of the row to be changed
+        k - number of the row to be added
+        alpha - multiplier of the kth row
+        fromCol - number of the first column to be changed
+
+        Raises IndexError if i, k or fromCol is not a valid index.
+        """
+        self.__checkRow(i)
+        self.__checkRow(k)
+        self.__checkCol(fromCol)
+
+        items = self.__items
+        offset = (k - i) * self.__cols
+        for l in xrange((i - 1) * self.__cols + fromCol - 1, i * self.__cols):
+            items[l] = items[l] + alpha * items[l + offset]
+
+    def getColSlice(self, j, fromRow, toRow):
+        """Returns a list of items in the jth column on rows
+        fromRow..toRow (inclusive).
+
+        j - column number
+        fromRow - number of the first row
+        toRow - number of the last row
+
+        Raises IndexError if some of the indices are not valid.
+        """
+        self.__checkCol(j)
+        self.__checkRow(fromRow)
+        self.__checkRow(toRow)
+
+        return self.__items[(fromRow - 1) * self.__cols + j - 1:
+            toRow * self.__cols:self.__cols]
+
+    def setColSlice(self, j, fromRow, vals):
+        """Sets items in the jth column to the selected values. The first
+        value is stored into the fromRow row, the second into
+        the next row etc.
+
+        j - column number
+        fromRow - number of the row where the first value will be stored
+        vals - sequence of values to be set
+
+        Raises IndexError if some of the indices are not valid or if
+        the values do not fit into the column.
+        """
+        self.__checkCol(j)
+        self.__checkRow(fromRow)
+        if fromRow + len(vals) - 1 > self.__rows:
+            raise IndexError, 'Too many values for the selected column.'
+
+        start = (fromRow - 1) * self.__cols + j - 1
+        self.__items[start:start + len(vals) * self.__cols:self.__cols] = vals
+
+    def copy(self):
+        """Returns a copy of the matrix."""
+        return Matrix(self.__rows, self.__cols, self.__items[:])
+
+    def __getstate__(self):
+        """Returns the state of the matrix for pickling (objects
+        with __slots__ cannot be pickled without it)."""
+        # Items are always pickled as a list, even if the matrix uses
+        # a different sequence as its storage
+        return (self.__rows, self.__cols, self.__items[:])
 
-        return self.__m[i - 1][j - 1]
+    def __setstate__(self, state):
+        """Restores the state of the matrix after unpickling."""
+        (self.__rows, self.__cols, self.__items) = state
 
     def __repr__(self):
         """Returns a printable representation of the matrix (string).
@@ -153,12 +317,11 @@ class Matrix(object):
         and Yth column. M is the number of matrix rows and N is the number
         of matrix columns.
         """
-        res = ''
+        res = []
         for i in xrange(1, self.getNumRows() + 1):
-            for j in xrange(1, self.getNumCols() + 1):
-                res += repr(self.getItem(i, j))
-                res += ' ' if j < self.getNumCols() else '\n'
-        return res
+            res.append(' '.join(map(repr, self.getRow(i))))
+            res.append('\n')
+        return ''.join(res)
 
     def __eq__(self, other):
         """Returns true if this matrix is equal to the other matrix.
@@ -173,9 +336,8 @@ class Matrix(object):
 
         # Check items
         for i in xrange(1, self.getNumRows() + 1):
-            for j in xrange(1, self.getNumCols() + 1):
-                if self.getItem(i, j) != other.getItem(i, j):
-                    return False
+            if self.getRow(i) != other.getRow(i):
+                return False
 
         return True
 
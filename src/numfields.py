@@ -0,0 +1,180 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains number fields, i.e. number types in which tableaux
+of the Lemke-Howson algorithm can be computed (see lh.lemkeHowson()).
+
+Every field provides the same interface, so the pivoting code does not
+depend on a concrete number type. Tableaux items are converted into
+the field when the tableaux is created (see NumberField.convert()).
+"""
+
+
+import rational
+
+
+# Names of the available number fields
+FIELDS = ('rational', 'fraction', 'float', 'gmpy')
+
+# Name of the field used by exact pivoting engines by default
+DEFAULT_FIELD = 'rational'
+
+# Tolerance used when equilibria computed in the float field are compared
+FLOAT_TOLERANCE = 1e-9
+
+
+class NumberField(object):
+    """Base class of all number fields.
+
+    Attributes:
+        name - name of the field (one of FIELDS)
+        exact - True if the arithmetic of the field is exact, False otherwise
+        zero - zero of the field
+        one - one of the field
+    """
+
+    name = None
+    exact = True
+
+    def __init__(self):
+        """Creates the field."""
+        self.zero = self.fraction(0, 1)
+        self.one = self.fraction(1, 1)
+
+    def fraction(self, a, b):
+        """Returns the field number a/b (a and b are integers, b must be
+        nonzero)."""
+        raise NotImplementedError
+
+    def isElement(self, x):
+        """Returns True if x is a number of this field, False otherwise."""
+        raise NotImplementedError
+
+    def convert(self, x):
+        """Returns the selected number (integer, Rational or a number
+        of this field) converted into this field."""
+        if self.isElement(x):
+            return x
+        elif isinstance(x, rational.Rational):
+            return self.fraction(x.nom(), x.denom())
+        return self.fraction(x, 1)
+
+    def equilibriaEqual(self, eq1, eq2):
+        """Returns True if the two selected equilibria (computed in this
+        field) are equal, False otherwise."""
+        return eq1 == eq2
+
+
+class RationalField(NumberField):
+    """Field of rational.Rational numbers."""
+
+    name = 'rational'
+
+    def fraction(self, a, b):
+        """See NumberField.fraction()."""
+        return rational.Rational(a, b)
+
+    def isElement(self, x):
+        """See NumberField.isElement()."""
+        return isinstance(x, rational.Rational)
+
+
+class FractionField(NumberField):
+    """Field of fractions.Fraction numbers (python 2.6 or newer is needed)."""
+
+    name = 'fraction'
+
+    def __init__(self):
+        """Creates the field.
+
+        Raises ImportError if the fractions module is not available.
+        """
+        # This import must be here because of python 2.5 (it does not have
+        # the fractions module)
+        import fractions
+        self.type = fractions.Fraction
+        NumberField.__init__(self)
+
+    def fraction(self, a, b):
+        """See NumberField.fraction()."""
+        return self.type(a, b)
+
+    def isElement(self, x):
+        """See NumberField.isElement()."""
+        return isinstance(x, self.type)
+
+
+class FloatField(NumberField):
+    """Field of floating-point numbers (inexact, no tolerance is used while
+    pivoting; use the numpy backend for robust floating-point pivoting)."""
+
+    name = 'float'
+    exact = False
+
+    def fraction(self, a, b):
+        """See NumberField.fraction()."""
+        return float(a) / b
+
+    def isElement(self, x):
+        """See NumberField.isElement()."""
+        return isinstance(x, float)
+
+    def equilibriaEqual(self, eq1, eq2):
+        """Returns True if the two selected equilibria are equal (every
+        probability differs by at most FLOAT_TOLERANCE), False otherwise."""
+        for (eqPart1, eqPart2) in zip(eq1, eq2):
+            for (p1, p2) in zip(eqPart1, eqPart2):
+                if abs(p1 - p2) > FLOAT_TOLERANCE:
+                    return False
+        return True
+
+
+class GmpyField(NumberField):
+    """Field of gmpy2.mpq numbers (the gmpy2 module is needed)."""
+
+    name = 'gmpy'
+
+    def __init__(self):
+        """Creates the field.
+
+        Raises ImportError if the gmpy2 module is not installed.
+        """
+        # This import must be here because gmpy2 is an optional dependency
+        import gmpy2
+        self.mpq = gmpy2.mpq
+        self.type = type(gmpy2.mpq(0))
+        NumberField.__init__(self)
+
+    def fraction(self, a, b):
+        """See NumberField.fraction()."""
+        return self.mpq(a, b)
+
+    def isElement(self, x):
+        """See NumberField.isElement()."""
+        return isinstance(x, self.type)
+
+
+def getField(field=None):
+    """Returns the number field with the selected name (NumberField).
+
+    field - name of the field (one of FIELDS or None for DEFAULT_FIELD);
+            if it is already a NumberField, it is returned unchanged
+
+    Raises ValueError if there is no such field. Raises ImportError
+    if the field needs a module which is not installed.
+    """
+    if isinstance(field, NumberField):
+        return field
+    elif field is None or field == 'rational':
+        return RationalField()
+    elif field == 'fraction':
+        return FractionField()
+    elif field == 'float':
+        return FloatField()
+    elif field == 'gmpy':
+        return GmpyField()
+    else:
+        raise ValueError, 'Unknown number field: %s.' % field
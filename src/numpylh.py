@@ -0,0 +1,355 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains a floating-point pivoting engine for the
+Lemke-Howson algorithm. The tableaux is stored in a NumPy array
+(float64) and both the min-ratio test and the pivoting step are done
+by vectorized operations over whole rows.
+
+Payoffs of every player are mapped onto the interval [1, 2] by a positive
+affine transformation (equilibria do not change), so the tolerance does not
+depend on the magnitude of payoffs. A coefficient is
+considered zero when it is tiny relative to the numbers it was computed from
+(or lower than the tolerance relative to the largest coefficient of its column
+in the min-ratio test). Values of basis variables are never rounded to zero.
+
+This module requires NumPy (http://numpy.scipy.org/).
+"""
+
+
+import numpy
+
+import lh
+
+
+# Default tolerance - coefficients, ratios and probabilities lower than this
+# (in absolute value, coefficients relative to their column) are considered
+# zero
+DEFAULT_TOLERANCE = 1e-9
+
+# Relative rounding error of numbers computed by a pivoting step - results
+# of cancellation lower than this (relative to the added numbers) are zero
+# and values lower than -ROUNDING_ERROR mean that the basis is not feasible
+ROUNDING_ERROR = 1e-12
+
+
+def createTableaux(m1, m2, cnst=0):
+    """Creates a tableaux from the two selected matrices and returns it
+    as a float64 NumPy array. The layout of the tableaux is the same as
+    in lh.createTableaux(), but indices are zero-based (the first column
+    of the array contains indices of the basis variables, the second column
+    contains their current values) and payoffs of every player are mapped
+    onto the interval [1, 2] (see fillTableaux()).
+
+    m1 - first matrix (Matrix instance)
+    m2 - second matrix (Matrix instance)
+    cnst - constant added to all payoffs (see lh.createTableaux())
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    if m1.getNumRows() != m2.getNumRows() or m1.getNumCols() != m2.getNumCols():
+        raise ValueError, 'Selected matrices does not have the same number ' +\
+                'of rows and columns'
+
+    S = m1.getNumRows() + m1.getNumCols()
+    t = numpy.empty((S, S + 2), dtype=numpy.float64)
+    fillTableaux(t, m1, m2, cnst)
+    return t
+
+
+def fillTableaux(t, m1, m2, cnst=0):
+    """Fills the selected tableaux with the initial tableaux of the selected
+    game whose payoffs are increased by the selected constant, i.e. with
+    createTableaux(m1 + cnst, m2 + cnst) (the array is reused and filled
+    by whole blocks, both matrices are converted into arrays at once).
+    Payoffs of every player are then mapped onto the interval [1, 2]
+    by a positive affine transformation, which does not change equilibria,
+    so the tableaux does not depend on the magnitude of payoffs (nor on cnst,
+    up to rounding errors).
+
+    t - tableaux created for a game with the same numbers of strategies
+        (NumPy array created by createTableaux())
+    m1 - first matrix (Matrix instance)
+    m2 - second matrix (Matrix instance)
+    cnst - constant added to all payoffs (number, see
+           lh.getNormalizationConstant())
+    """
+    p1SCount = m1.getNumRows()
+    p2SCount = m1.getNumCols()
+    S = t.shape[0]
+    t.fill(0.0)
+    t[:, 0] = numpy.arange(-1, -S - 1, -1)
+    t[:, 1] = 1.0
+    # Rows of m1 and columns of m2 (negated payoffs)
+    t[:p1SCount, p1SCount + 2:] = numpy.array(m1.getItems(),
+        dtype=numpy.float64).reshape(p1SCount, p2SCount)
+    t[p1SCount:, 2:p1SCount + 2] = numpy.array(m2.getItems(),
+        dtype=numpy.float64).reshape(p1SCount, p2SCount).T
+    for block in (t[:p1SCount, p1SCount + 2:], t[p1SCount:, 2:p1SCount + 2]):
+        # Payoffs of every player are mapped onto [1, 2] (see above)
+        block += cnst
+        lowest = block.min()
+        spread = block.max() - lowest
+        block -= lowest
+        if spread > 0:
+            block /= spread
+        block += 1.0
+        numpy.negative(block, block)
+
+
+def makePivotingStep(t, p1SCount, ebVar, tol=DEFAULT_TOLERANCE, stats=None):
+    """Makes a single pivoting step in the selected tableaux by
+    bringing the selected variable into the basis. All changes are done
+    in the original tableaux. Returns the variable that left the basis.
+
+    t - tableaux (NumPy array created by createTableaux())
+    p1SCount - number of strategies of player 1 (number)
+    ebVar - variable that will enter the basis (number)
+    tol - coefficients lower than tol multiplied by the largest coefficient
+          of their column (in absolute value) are considered zero (number)
+    stats - statistics of the current pivoting step are recorded into this
+            object (pivotstats.PivotStats or None if they should not be
+            recorded); bit sizes are not recorded because items are floats
+
+    Preconditions:
+        - 0 < abs(ebVar) <= number of tableaux rows
+        - 0 < p1SCount < number of tableaux rows
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    S = t.shape[0]
+    # 1st precondition
+    if abs(ebVar) <= 0 or abs(ebVar) > S:
+        raise ValueError, 'Selected variable index is invalid.'
+    # 2nd precondition
+    if p1SCount < 0 or S <= p1SCount:
+        raise ValueError, 'Invalid number of strategies of player 1.'
+
+    # Select the appropriate part of the tableaux (a view, so all changes
+    # are done in the original tableaux)
+    # (slack variables of the part have labels firstLabel..firstLabel
+    # + number of rows of the part - 1)
+    if -p1SCount <= ebVar < 0 or ebVar > p1SCount:
+        (block, firstLabel) = (t[:p1SCount], 1)
+    else:
+        (block, firstLabel) = (t[p1SCount:], p1SCount + 1)
+    ebCol = 1 + abs(ebVar)
+    ebCoeffs = block[:, ebCol].copy()
+
+    # Min-ratio rule (only rows with a negative coefficient are considered)
+    colScale = numpy.abs(ebCoeffs).max()
+    candidates = ebCoeffs < -tol * colScale
+    if not candidates.any():
+        raise ValueError, 'No variable can leave the basis.'
+    ratios = numpy.empty(len(ebCoeffs))
+    ratios.fill(numpy.inf)
+    ratios[candidates] = -block[candidates, 1] / ebCoeffs[candidates]
+    lbVarRow = int(numpy.argmin(ratios))
+    # Ratios are tied if they differ by less than the tolerance relative
+    # to the lowest ratio or to the ratio of the largest value and the largest
+    # coefficient (values which should be zero are only almost zero)
+    minRatio = ratios[lbVarRow]
+    tieTol = tol * (abs(minRatio) + numpy.abs(block[:, 1]).max() / colScale)
+    tiedRows = numpy.flatnonzero(ratios <= minRatio + tieTol)
+    if len(tiedRows) > 1:
+        # Degenerate step (see lh.breakRatioTie())
+        def perturbation(i, j):
+            label = firstLabel + j
+            eps = -block[i, 1 + label]
+            if block[i, 0] == -label:
+                eps += 1.0
+            return eps
+        lbVarRow = lh.breakRatioTie([int(i) for i in tiedRows],
+            lambda i: -ebCoeffs[i], perturbation, block.shape[0], tol)
+    if stats is not None:
+        stats.recordRatioTest(len(ebCoeffs), int(candidates.sum()))
+
+    return _pivot(block, ebVar, ebCoeffs, lbVarRow, tol)
+
+
+def _pivot(block, ebVar, ebCoeffs, lbVarRow, tol):
+    """Makes a pivoting step in the selected part of the tableaux on the
+    selected row and the column of the selected variable (the coefficient
+    must be nonzero). Returns the variable that left the basis.
+
+    block - part of the tableaux (view of the NumPy array)
+    ebVar - variable that will enter the basis (number)
+    ebCoeffs - copy of the column of the entering variable (NumPy array,
+               it is changed by this function)
+    lbVarRow - row of the variable that will leave the basis (number)
+    tol - tolerance (number)
+    """
+    ebCol = 1 + abs(ebVar)
+    lbVar = int(block[lbVarRow, 0])
+
+    # Update the row in which the variable that will leave the basis was
+    # found in the previous step (it is divided by the negated coefficient,
+    # which is negative in steps selected by the min-ratio rule)
+    pivotRow = block[lbVarRow]
+    pivotRow[0] = ebVar
+    pivotRow[ebCol] = 0.0
+    pivotRow[1 + abs(lbVar)] = -1.0
+    pivotRow[1:] /= -ebCoeffs[lbVarRow]
+
+    # Update other rows in the appropriate part of the tableaux
+    ebCoeffs[lbVarRow] = 0.0
+    update = numpy.outer(ebCoeffs, pivotRow[1:])
+    coeffs = block[:, 2:]
+    # Coefficients that should be zero are results of cancellation, so they
+    # are tiny relative to the larger of the added numbers
+    # (values of basis variables are kept as they are, they can be
+    # arbitrarily small in games with large payoffs)
+    scale = numpy.maximum(numpy.abs(coeffs), numpy.abs(update[:, 1:]))
+    block[:, 1:] += update
+    coeffs[numpy.abs(coeffs) < ROUNDING_ERROR * scale] = 0.0
+    block[:, ebCol] = 0.0
+
+    return lbVar
+
+
+def pivotToBasis(t, p1SCount, basis, tol=DEFAULT_TOLERANCE):
+    """Makes pivoting steps in the selected tableaux until its basis is the
+    selected basis and returns True if the resulting basis is feasible (all
+    values are greater than -tol), False otherwise (see
+    lh.pivotSplitToBasis()).
+
+    t - tableaux (NumPy array created by createTableaux())
+    p1SCount - number of strategies of player 1 (number)
+    basis - basis variables (list of numbers, see lh.checkBasis())
+    tol - tolerance (number, see makePivotingStep())
+
+    Raises ValueError if the basis is invalid or singular.
+    """
+    S = t.shape[0]
+    lh.checkBasis(basis, p1SCount, S)
+
+    targets = set(basis)
+    for ebVar in basis:
+        if ebVar in t[:, 0]:
+            continue
+        if -p1SCount <= ebVar < 0 or ebVar > p1SCount:
+            block = t[:p1SCount]
+        else:
+            block = t[p1SCount:]
+        # The leaving variable is the basis variable that is not in the
+        # selected basis with the largest coefficient (in absolute value)
+        # of the entering variable
+        ebCoeffs = block[:, 1 + abs(ebVar)].copy()
+        coeffs = numpy.abs(ebCoeffs)
+        for (i, var) in enumerate(block[:, 0]):
+            if int(var) in targets:
+                coeffs[i] = 0.0
+        lbVarRow = int(numpy.argmax(coeffs))
+        if coeffs[lbVarRow] <= tol * numpy.abs(ebCoeffs).max():
+            raise ValueError, 'Selected basis is singular.'
+        _pivot(block, ebVar, ebCoeffs, lbVarRow, tol)
+
+    return bool((t[:, 1] > -tol).all())
+
+
+def getEquilibrium(t, p1SCount, tol=DEFAULT_TOLERANCE):
+    """Returns the normalized equilibrium from the given tableaux
+    (tuple of two tuples of floats, probabilities of every player sum to 1).
+    Probabilities lower than tol are considered zero (payoffs in the tableaux
+    are at most 2, so probabilities of every player sum to at least 1/2
+    before they are normalized).
+
+    t - tableaux (NumPy array created by createTableaux())
+    p1SCount - number of strategies of player 1 (number)
+    tol - tolerance (number)
+
+    Preconditions:
+        - 0 < p1SCount < number of tableaux rows
+
+    Raises ValueError if some of the preconditions are not met or if
+    the computation has lost precision (the basis is not feasible or
+    the probabilities of some player sum to at most tol).
+    """
+    S = t.shape[0]
+    if p1SCount < 0 or S <= p1SCount:
+        raise ValueError, 'Invalid number of strategies of player 1.'
+
+    # Values of all basis variables are nonnegative on a Lemke-Howson path
+    if (t[:, 1] < -ROUNDING_ERROR).any():
+        raise ValueError, 'Equilibrium lost in rounding errors.'
+
+    eqs = numpy.zeros(S)
+    for i in xrange(0, S):
+        strat = int(t[i, 0])
+        prob = t[i, 1]
+        if strat > 0 and prob > tol:
+            eqs[strat - 1] = prob
+
+    def normalizeEqPart(eqPart):
+        probSum = eqPart.sum()
+        if not probSum > tol:
+            raise ValueError, 'Equilibrium lost in rounding errors.'
+        return tuple([float(x) for x in eqPart / probSum])
+
+    return (normalizeEqPart(eqs[:p1SCount]), normalizeEqPart(eqs[p1SCount:]))
+
+
+class FloatEngine(object):
+    """Pivoting engine for lh.lemkeHowson() working with float64 NumPy
+    arrays. Found equilibria are tuples of floats."""
+
+    def __init__(self, tol=DEFAULT_TOLERANCE):
+        """Creates the engine.
+
+        tol - relative tolerance (see makePivotingStep())
+        """
+        self.tol = tol
+
+    def normalizeMatrices(self, m1, m2):
+        """See lh.normalizeMatrices()."""
+        return lh.normalizeMatrices(m1, m2)
+
+    def getNormalizationConstant(self, m1, m2):
+        """Returns 0 - payoffs are mapped onto [1, 2] when the tableaux
+        is filled (see fillTableaux()), so no constant has to be added
+        (adding 1 to tiny payoffs would only lose their precision)."""
+        return 0
+
+    def createTableaux(self, m1, m2, cnst=0):
+        """See createTableaux()."""
+        return createTableaux(m1, m2, cnst)
+
+    def fillTableaux(self, t, m1, m2, cnst=0):
+        """See fillTableaux()."""
+        fillTableaux(t, m1, m2, cnst)
+
+    def copyTableaux(self, t):
+        """Returns a copy of the selected tableaux."""
+        return t.copy()
+
+    def getBasis(self, t):
+        """Returns basis variables of the selected tableaux (list
+        of numbers)."""
+        return [int(x) for x in t[:, 0]]
+
+    def makePivotingStep(self, t, p1SCount, ebVar, stats=None):
+        """See makePivotingStep()."""
+        return makePivotingStep(t, p1SCount, ebVar, self.tol, stats)
+
+    def pivotToBasis(self, t, p1SCount, basis):
+        """See pivotToBasis()."""
+        return pivotToBasis(t, p1SCount, basis, self.tol)
+
+    def getEquilibrium(self, t, p1SCount):
+        """See getEquilibrium()."""
+        return getEquilibrium(t, p1SCount, self.tol)
+
+    def equilibriaEqual(self, eq1, eq2):
+        """Returns True if the two selected equilibria are equal (every
+        probability differs by at most the tolerance), False otherwise."""
+        for (eqPart1, eqPart2) in zip(eq1, eq2):
+            for (p1, p2) in zip(eqPart1, eqPart2):
+                if abs(p1 - p2) > self.tol:
+                    return False
+        return True
@@ -0,0 +1,149 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module runs Lemke-Howson paths from different initially dropped
+labels concurrently in a pool of worker processes.
+
+Paths started from different labels are independent of each other, so
+every worker gets the normalized game only once (when the worker is
+started) and then follows one path per received label.
+
+This module requires python 2.6 (the multiprocessing module).
+"""
+
+
+import lh
+
+
+# State of a worker process (set by _initWorker())
+_workerEngine = None
+_workerTableaux = None
+_workerP1SCount = None
+_workerLimits = None
+
+
+def _initWorker(backend, tol, field, limits, m1, m2, cnst):
+    """Initializes a worker process - creates the engine and the initial
+    tableaux for the selected game normalized by the selected constant."""
+    global _workerEngine, _workerTableaux, _workerP1SCount, _workerLimits
+    _workerEngine = lh.getEngine(backend, tol, field)
+    _workerTableaux = _workerEngine.createTableaux(m1, m2, cnst)
+    _workerP1SCount = m1.getNumRows()
+    _workerLimits = limits
+
+
+def _followPathFromLabel(label):
+    """Follows the path from the selected label in a worker process and
+    returns a tuple (label, eq)."""
+    t = _workerEngine.copyTableaux(_workerTableaux)
+    lh.followPath(_workerEngine, t, _workerP1SCount, label,
+        limits=_workerLimits)
+    return (label, _workerEngine.getEquilibrium(t, _workerP1SCount))
+
+
+def _createPool(m1, m2, engine, backend, tol, field, limits, processes):
+    """Normalizes the selected game by the selected engine and returns a pool
+    of worker processes initialized with that game."""
+    # This import must be here because of python 2.5 (it does not have
+    # the multiprocessing module)
+    import multiprocessing
+
+    if m1.getNumRows() != m2.getNumRows() or m1.getNumCols() != m2.getNumCols():
+        raise ValueError, 'Selected matrices does not have the same number ' +\
+                'of rows and columns'
+    return multiprocessing.Pool(processes, _initWorker,
+        (backend, tol, field, limits, m1, m2,
+        engine.getNormalizationConstant(m1, m2)))
+
+
+def lemkeHowsonAllLabels(m1, m2, backend=lh.AUTO_BACKEND, tol=None,
+        processes=None, field=None, limits=None):
+    """Does the same as lh.lemkeHowsonAllLabels(), but paths from different
+    labels are followed concurrently in a pool of worker processes.
+    Results are collected as they are completed.
+
+    m1 - matrix of profits of the first player (Matrix)
+    m2 - matrix of profits of the second player (Matrix)
+    backend - pivoting engine to be used (see lh.lemkeHowson())
+    tol - tolerance used by floating-point backends (see lh.lemkeHowson())
+    processes - number of worker processes (number or None for the number
+                of CPUs)
+    field - number field used by the backend (see lh.lemkeHowson())
+    limits - limits of every path (see lh.lemkeHowson())
+
+    Returns the same result as lh.lemkeHowsonAllLabels().
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+
+    Raises ValueError if the first precondition is not met or if
+    the selected backend or field does not exist. Raises
+    pathlimits.PathLimitError (its subclass) if some path exceeds some
+    of the selected limits.
+    """
+    backend = lh.selectBackend(m1, m2, backend)
+    engine = lh.getEngine(backend, tol, field)
+    pool = _createPool(m1, m2, engine, backend, tol, field, limits,
+        processes)
+    try:
+        labels = xrange(1, m1.getNumRows() + m1.getNumCols() + 1)
+        results = list(pool.imap_unordered(_followPathFromLabel, labels))
+    finally:
+        pool.terminate()
+
+    # Results come in the order in which they were completed, so sort them
+    # to get the same order of equilibria as in lh.lemkeHowsonAllLabels()
+    results.sort()
+    eqs = []
+    for (label, eq) in results:
+        for (foundEq, foundLabels) in eqs:
+            if engine.equilibriaEqual(foundEq, eq):
+                foundLabels.append(label)
+                break
+        else:
+            eqs.append((eq, [label]))
+    return eqs
+
+
+def lemkeHowsonFirst(m1, m2, backend=lh.AUTO_BACKEND, tol=None,
+        processes=None, field=None, limits=None):
+    """Follows paths from all initially dropped labels concurrently in
+    a pool of worker processes and returns the first found equilibrium.
+    Remaining workers are terminated as soon as the first equilibrium
+    is found.
+
+    m1 - matrix of profits of the first player (Matrix)
+    m2 - matrix of profits of the second player (Matrix)
+    backend - pivoting engine to be used (see lh.lemkeHowson())
+    tol - tolerance used by floating-point backends (see lh.lemkeHowson())
+    processes - number of worker processes (number or None for the number
+                of CPUs)
+    field - number field used by the backend (see lh.lemkeHowson())
+    limits - limits of every path (see lh.lemkeHowson())
+
+    Returns a tuple (eq, label), where eq is the found equilibrium (see
+    lh.lemkeHowson()) and label is the initially dropped label that lead
+    to that equilibrium.
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+
+    Raises ValueError if the first precondition is not met or if
+    the selected backend or field does not exist. Raises
+    pathlimits.PathLimitError (its subclass) if some path exceeds some
+    of the selected limits.
+    """
+    # Check the backend before any worker is started
+    backend = lh.selectBackend(m1, m2, backend)
+    engine = lh.getEngine(backend, tol, field)
+    pool = _createPool(m1, m2, engine, backend, tol, field, limits,
+        processes)
+    try:
+        labels = xrange(1, m1.getNumRows() + m1.getNumCols() + 1)
+        for (label, eq) in pool.imap_unordered(_followPathFromLabel, labels):
+            return (eq, label)
+    finally:
+        pool.terminate()
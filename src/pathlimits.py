@@ -0,0 +1,156 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains limits of Lemke-Howson paths (see lh.lemkeHowson()).
+
+A path is stopped when it needs more pivoting steps or more time than
+allowed, (optionally) when a basis is repeated, which means that the path
+cycles, or when it is cancelled (e.g. from another thread). In such a case,
+an exception with the state of the path is raised.
+Limits are checked only when a PathLimits instance is passed
+to lh.lemkeHowson() (or to lh.followPath()), so there is no overhead
+when they are not needed. PathLimits is only a configuration; the state
+of every path is kept in a PathChecker returned by PathLimits.startPath(),
+so the same limits can be shared by paths followed concurrently (e.g.
+in threads of a server).
+"""
+
+
+import time
+
+
+class PathLimitError(Exception):
+    """Base class of exceptions raised when a path exceeds a limit.
+
+    Attributes:
+        basis - basis variables when the path was stopped (list of numbers
+                in the order of tableaux rows, see lh.createTableaux())
+        pivots - number of pivoting steps made on the path (number)
+        history - variables that entered the basis on the path, in the order
+                  of pivoting steps (list of numbers; the first one is
+                  the initially dropped label)
+    """
+
+    def __init__(self, message, basis, pivots, history):
+        Exception.__init__(self, message)
+        self.message = message
+        self.basis = basis
+        self.pivots = pivots
+        self.history = history
+
+    def __reduce__(self):
+        """Returns the state of this exception for the pickle module
+        (exceptions are pickled when raised in worker processes)."""
+        return (self.__class__,
+            (self.message, self.basis, self.pivots, self.history))
+
+
+class PivotLimitExceededError(PathLimitError):
+    """Exception to be raised when a path needs too many pivoting steps."""
+    pass
+
+
+class TimeLimitExceededError(PathLimitError):
+    """Exception to be raised when a path takes too much time."""
+    pass
+
+
+class CycleDetectedError(PathLimitError):
+    """Exception to be raised when a basis is repeated on a path."""
+    pass
+
+
+class PathCancelledError(PathLimitError):
+    """Exception to be raised when a path is cancelled."""
+    pass
+
+
+class PathLimits(object):
+    """Limits of Lemke-Howson paths.
+
+    The same instance can be used for more paths, even for paths followed
+    concurrently in different threads (the limits apply to every path
+    separately, see startPath()).
+
+    Attributes:
+        maxPivots - maximal number of pivoting steps of a path (number
+                    or None for no limit)
+        timeout - maximal time spent on a path in seconds (number or None
+                  for no limit)
+        detectCycles - if True, a hash of the basis is stored before every
+                       pivoting step and the path is stopped when the same
+                       basis (with the same entering variable) is reached
+                       again; the check is probabilistic (a hash collision
+                       would stop a valid path), but cheap in memory
+        isCancelled - function without arguments which is called before
+                      every pivoting step and returns True if the path should
+                      be stopped (or None if paths cannot be cancelled);
+                      it can be used to cancel a path from another thread
+    """
+
+    def __init__(self, maxPivots=None, timeout=None, detectCycles=False,
+            isCancelled=None):
+        """Creates limits (see the class description)."""
+        self.maxPivots = maxPivots
+        self.timeout = timeout
+        self.detectCycles = detectCycles
+        self.isCancelled = isCancelled
+
+    def startPath(self, engine, t):
+        """Starts checking of a path which is followed by the selected engine
+        in the selected tableaux and returns a PathChecker with the state
+        of that path."""
+        return PathChecker(self, engine, t)
+
+
+class PathChecker(object):
+    """Checker of PathLimits on a single path (see PathLimits.startPath())."""
+
+    def __init__(self, limits, engine, t):
+        """Starts checking of the selected limits on a path which
+        is followed by the selected engine in the selected tableaux."""
+        self.__limits = limits
+        self.__engine = engine
+        self.__tableaux = t
+        self.__startTime = time.time()
+        self.__history = []
+        self.__seenBases = set()
+
+    def checkPivot(self, ebVar):
+        """Checks the limits before a pivoting step in which the selected
+        variable enters the basis.
+
+        Raises PivotLimitExceededError, TimeLimitExceededError
+        or CycleDetectedError if the corresponding limit is exceeded.
+        Raises PathCancelledError if the path is cancelled.
+        """
+        limits = self.__limits
+        pivots = len(self.__history)
+        if limits.isCancelled is not None and limits.isCancelled():
+            self.__fail(PathCancelledError,
+                'Path cancelled after %d pivoting steps.' % pivots)
+        if limits.maxPivots is not None and pivots >= limits.maxPivots:
+            self.__fail(PivotLimitExceededError,
+                'More than %d pivoting steps.' % limits.maxPivots)
+        if limits.timeout is not None and \
+                time.time() - self.__startTime > limits.timeout:
+            self.__fail(TimeLimitExceededError,
+                'More than %g seconds.' % limits.timeout)
+        if limits.detectCycles:
+            basisHash = hash((ebVar,
+                frozenset(self.__engine.getBasis(self.__tableaux))))
+            if basisHash in self.__seenBases:
+                self.__fail(CycleDetectedError,
+                    'Basis repeated after %d pivoting steps.' % pivots)
+            self.__seenBases.add(basisHash)
+        self.__history.append(ebVar)
+
+    def __fail(self, errorClass, message):
+        """Raises the selected exception with the current state
+        of the path."""
+        history = self.__history
+        raise errorClass(message, self.__engine.getBasis(self.__tableaux),
+            len(history), history[:])
@@ -0,0 +1,164 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains a collector of statistics about pivoting steps
+(see lh.lemkeHowson()).
+
+Statistics are collected only when a PivotStats instance is passed
+to lh.lemkeHowson() (or to lh.followPath()), so there is no overhead
+when they are not needed.
+"""
+
+
+import time
+
+import rational
+
+
+def bitLength(n):
+    """Returns the number of bits needed to represent the absolute value
+    of the selected integer (0 for 0)."""
+    n = abs(n)
+    try:
+        return n.bit_length()
+    except AttributeError:
+        # Python < 2.7
+        bits = 0
+        while n:
+            n >>= 1
+            bits += 1
+        return bits
+
+
+def maxBitSizes(items):
+    """Returns a tuple (nomBits, denomBits) with the maximal number of bits
+    of nominators and denominators of the selected numbers (integers
+    have denominator 1, floats are skipped because they have a fixed size).
+
+    items - iterable of integers, Rationals and other exact numbers with
+            numerator and denominator attributes (e.g. fractions.Fraction)
+    """
+    nomBits = 0
+    denomBits = 1
+    for x in items:
+        if isinstance(x, rational.Rational):
+            nomBits = max(nomBits, bitLength(x.nom()))
+            denomBits = max(denomBits, bitLength(x.denom()))
+        elif isinstance(x, float):
+            continue
+        else:
+            nomBits = max(nomBits, bitLength(getattr(x, 'numerator', x)))
+            denomBits = max(denomBits,
+                bitLength(getattr(x, 'denominator', 1)))
+    return (nomBits, denomBits)
+
+
+class PivotStats(object):
+    """Statistics of pivoting steps.
+
+    Every pivoting step is recorded as a dictionary with the following keys:
+        label - the initially dropped label of the path (number)
+        entering - variable that entered the basis (number)
+        leaving - variable that left the basis (number)
+        time - time spent on the step in seconds, without the time spent
+               on finding bit sizes (see startBitSizeScan()) (number)
+        scanLength - number of rows scanned by the min-ratio test (number)
+        candidates - number of rows that could leave the basis (number)
+        nomBits - maximal number of bits of a nominator in the updated part
+                  of the tableaux (number or None if not supported by
+                  the engine)
+        denomBits - maximal number of bits of a denominator in the updated
+                    part of the tableaux (number or None if not supported
+                    by the engine)
+
+    Attributes:
+        pivots - recorded pivoting steps (list of dictionaries)
+    """
+
+    def __init__(self):
+        """Creates an empty collection of statistics."""
+        self.pivots = []
+        self.__label = None
+        self.__current = None
+        self.__startTime = None
+        self.__scanStartTime = None
+        self.__scanTime = 0
+
+    def startPath(self, label):
+        """Starts recording of a path from the selected initially dropped
+        label."""
+        self.__label = label
+
+    def startPivot(self, ebVar):
+        """Starts recording of a pivoting step in which the selected
+        variable enters the basis."""
+        self.__current = {'label': self.__label, 'entering': ebVar,
+            'leaving': None, 'time': None, 'scanLength': None,
+            'candidates': None, 'nomBits': None, 'denomBits': None}
+        self.__scanTime = 0
+        self.__startTime = time.time()
+
+    def recordRatioTest(self, scanLength, candidates):
+        """Records the number of rows scanned by the min-ratio test
+        and the number of rows that could leave the basis in the current
+        pivoting step."""
+        self.__current['scanLength'] = scanLength
+        self.__current['candidates'] = candidates
+
+    def startBitSizeScan(self):
+        """Starts the scan of the tableaux for bit sizes in the current
+        pivoting step. The time from this call to recordBitSizes()
+        is not included in the time of the step (the scan is done only
+        because of the statistics)."""
+        self.__scanStartTime = time.time()
+
+    def recordBitSizes(self, nomBits, denomBits):
+        """Records the maximal number of bits of nominators and denominators
+        in the part of the tableaux updated in the current pivoting step
+        (and ends the scan started by startBitSizeScan(), if any)."""
+        if self.__scanStartTime is not None:
+            self.__scanTime += time.time() - self.__scanStartTime
+            self.__scanStartTime = None
+        self.__current['nomBits'] = nomBits
+        self.__current['denomBits'] = denomBits
+
+    def endPivot(self, lbVar):
+        """Ends recording of the current pivoting step in which the selected
+        variable left the basis."""
+        self.__current['time'] = time.time() - self.__startTime - \
+            self.__scanTime
+        self.__current['leaving'] = lbVar
+        self.pivots.append(self.__current)
+        self.__current = None
+
+    def getPivotCount(self):
+        """Returns the number of recorded pivoting steps."""
+        return len(self.pivots)
+
+    def getTotalTime(self):
+        """Returns the total time spent on recorded pivoting steps
+        in seconds."""
+        return sum([p['time'] for p in self.pivots])
+
+    def toDict(self):
+        """Returns all statistics in a dictionary with keys pivotCount,
+        totalTime and pivots (see the class description)."""
+        return {'pivotCount': self.getPivotCount(),
+            'totalTime': self.getTotalTime(),
+            'pivots': self.pivots}
+
+    def writeJson(self, stream):
+        """Writes all statistics (see toDict()) into the selected stream
+        in the JSON format.
+
+        This method requires python 2.6 (the json module).
+        """
+        # This import must be here because of python 2.5 (it does not have
+        # the json module)
+        import json
+
+        json.dump(self.toDict(), stream, indent=1, sort_keys=True)
+        stream.write('\n')
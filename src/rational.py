@@ -9,6 +9,7 @@ of rational numbers with common operations over them.
 """
 
 
+import operator
 import re
 
 
@@ -17,6 +18,16 @@ class InvalidRationalReprError(Exception):
 	pass
 
 
+# Regular expressions for textual representations of rational numbers
+# (see fromText())
+_FRACTION_RE = re.compile(ur'^\s*(-?\d+)\s*(/\s*(\d+))?\s*$', re.U)
+_DECIMAL_RE = re.compile(
+    ur'^\s*([-+]?)(\d*)(\.(\d*))?([eE]([-+]?\d+))?\s*$', re.U)
+# The largest accepted absolute value of the exponent of a decimal number
+# (10^exp is computed exactly, so huge exponents would take ages)
+MAX_DECIMAL_EXPONENT = 1000
+
+
 def fromText(text):
     """Creates and returns a Rational class instance from the selected
     text (string).
@@ -29,36 +40,125 @@ def fromText(text):
         x
         x/y
         -x/y
-    where x and y are positive numbers.
+        decimal numbers (e.g. 0.35, -.5, +2.)
+        decimal numbers in the scientific notation (e.g. 1e3, 2.5E-4)
+    where x and y are positive numbers. Decimal numbers are converted
+    exactly (e.g. 0.35 is 7/20). The exponent of a decimal number (including
+    its digits after the point) must not exceed MAX_DECIMAL_EXPONENT
+    in absolute value.
 
     Raises InvalidRationalReprError if the text cannot be converted into
     a rational number.
     """
-    rationalRegExp = re.compile(ur'^\s*(-?\d+)\s*(/\s*(\d+))?\s*$', re.U)
-    m = re.match(rationalRegExp, text)
+    m = _FRACTION_RE.match(text)
     if m != None:
         a = long(m.group(1))
         b = long(m.group(3)) if m.group(2) != None else 1
         return Rational(a, b)
-    else:
-        raise InvalidRationalReprError
 
-
-def _gcd(a, b):
-    """Returns the greatest common divisor of a and b."""
-    if a < b:
-        a, b = b, a
-    while b != 0:
-        a, b = b, a % b
-    return a
+    m = _DECIMAL_RE.match(text)
+    if m == None or (m.group(2) == '' and not m.group(4)):
+        # There has to be at least one digit before or after the point
+        raise InvalidRationalReprError
+    digits = m.group(2) + (m.group(4) or '')
+    a = long(digits)
+    if m.group(1) == '-':
+        a = -a
+    # The number is a * 10^exp
+    exp = int(m.group(6) or 0) - len(m.group(4) or '')
+    if abs(exp) > MAX_DECIMAL_EXPONENT:
+        raise InvalidRationalReprError
+    if exp >= 0:
+        return Rational(a * 10 ** exp)
+    return Rational(a, 10 ** -exp)
+
+
+try:
+    # math.gcd() is implemented in C, but it is available only since
+    # python 3.5
+    from math import gcd as _gcd
+except ImportError:
+    def _gcd(a, b):
+        """Returns the greatest common divisor of a and b (both a and b
+        must be nonnegative)."""
+        while b:
+            a, b = b, a % b
+        return a
+
+
+def commonDenominator(numbers):
+    """Returns the least common denominator of the selected numbers,
+    i.e. the smallest positive integer d such that d * x is an integer
+    for every selected number x.
+
+    numbers - iterable of integers (int, long) and Rational instances
+    """
+    d = 1
+    for x in numbers:
+        if isinstance(x, Rational) and d % x._b != 0:
+            d = d * (x._b // _gcd(d, x._b))
+    return d
+
+
+def scaleToIntegers(items, cnst=0):
+    """Returns a list of the selected numbers increased by cnst. If some
+    of them is a Rational, all of them are multiplied by their least common
+    denominator, so Rationals become integers (int, long) that are as small
+    as possible.
+
+    items - list of integers (int, long), floats and Rational instances
+    cnst - constant added to all items (integer or Rational)
+
+    Multiplying all payoffs of a player by a positive constant does not
+    change equilibria of the game, so engines use this function to pivot
+    on integers. If there is nothing to do, items itself is returned,
+    so the returned list must not be modified.
+    """
+    if cnst != 0:
+        items = [x + cnst for x in items]
+    d = 1
+    integral = True
+    for x in items:
+        if isinstance(x, Rational):
+            integral = False
+            if d % x._b != 0:
+                d = d * (x._b // _gcd(d, x._b))
+    if integral:
+        return items
+    scaledItems = []
+    for x in items:
+        if isinstance(x, Rational):
+            scaledItems.append(int(x._a * (d // x._b)))
+        else:
+            scaledItems.append(x * d)
+    return scaledItems
+
+
+def _isInteger(x):
+    """Returns True if x is an ordinary integer number (int, long),
+    False otherwise."""
+    return isinstance(x, (int, long))
+
+
+def _fromNormalized(a, b):
+    """Returns a new Rational a/b without any normalization.
+
+    a and b must be already normalized (b > 0 and a, b are coprime).
+    """
+    r = object.__new__(Rational)
+    r._a = a
+    r._b = b
+    return r
 
 
-class Rational:
+class Rational(object):
     """This class represents rational numbers (nominator/denominator).
 
     Instances of this class are immutable.
     """
 
+    __slots__ = ('_a', '_b')
+
     def __init__(self, a, b=1):
         """Creates a new rational number.
 
@@ -79,63 +179,83 @@ class Rational:
 
         Raises ValueError if some of the preconditons are not met.
         """
-        if b == 0:
-            raise ValueError, 'b must be nonzero.'
-
-        try:
-            # Lets suppose that a is a rational number
-            self.__a = a.nom()
-            self.__b = a.denom()
-
+        if isinstance(a, Rational):
             if b != 1:
                 raise ValueError, 'If a is a rational number, b must be 1.'
-        except AttributeError:
-            # a and b must be ordinary numbers
-            self.__a = a
-            self.__b = b
-
+            self._a = a._a
+            self._b = a._b
+        elif b == 1:
+            # Nothing to normalize
+            self._a = a
+            self._b = 1
+        elif b == 0:
+            raise ValueError, 'b must be nonzero.'
+        else:
             # Sign normalization
-            if self.__b < 0:
-                self.__a = -self.__a
-                self.__b = abs(self.__b)
+            if b < 0:
+                a = -a
+                b = -b
 
             # Commensurability normalization
-            d = _gcd(abs(self.__a), abs(self.__b))
-            self.__a //= d
-            self.__b //= d
+            d = _gcd(abs(a), b)
+            if d != 1:
+                a //= d
+                b //= d
+            self._a = a
+            self._b = b
+
+    def __reduce__(self):
+        """Returns the state of this rational for the pickle module."""
+        return (Rational, (self._a, self._b))
 
     def nom(self):
         """Returns the nominator part of the number (if the rational number
         was negative, the returned result is also negative).
         """
-        return self.__a
+        return self._a
 
     def denom(self):
         """Returns the denominator part of the number (if the rational number
         was negative, the returned result is positive).
         """
-        return self.__b
+        return self._b
 
     def recip(self):
         """Returns the reciprocal version of this rational (i.e. nominator
         will be switched with denominator).
         """
-        return Rational(self.denom(), self.nom())
+        if self._a < 0:
+            return _fromNormalized(-self._b, -self._a)
+        elif self._a == 0:
+            raise ValueError, 'b must be nonzero.'
+        return _fromNormalized(self._b, self._a)
 
     def __add__(self, r):
         """Adds r to self (r can be a number or other Rational).
 
         Returned number is normalized (based on Commensurability).
         """
-        try:
+        a = self._a
+        b = self._b
+        if isinstance(r, Rational):
             # Adding other rational
-            tmpa = self.nom() * r.denom() + r.nom() * self.denom()
-            tmpb = self.denom() * r.denom()
-        except AttributeError:
-            # Adding a number
-            tmpa = self.nom() + self.denom() * r
-            tmpb = self.denom()
-        return Rational(tmpa, tmpb)
+            rb = r._b
+            if b == rb:
+                if b == 1:
+                    return _fromNormalized(a + r._a, 1)
+                return Rational(a + r._a, b)
+            d = _gcd(b, rb)
+            if d == 1:
+                # The result is already normalized
+                return _fromNormalized(a * rb + r._a * b, b * rb)
+            tmpa = a * (rb // d) + r._a * (b // d)
+            d2 = _gcd(abs(tmpa), d)
+            return _fromNormalized(tmpa // d2, (b // d) * (rb // d2))
+        elif _isInteger(r):
+            # Adding an integer (the result is already normalized)
+            return _fromNormalized(a + b * r, b)
+        # Adding other number
+        return Rational(a + b * r, b)
 
     def __radd__(self, r):
         """Does the same as __add__()."""
@@ -146,15 +266,26 @@ class Rational:
 
         Returned number is normalized (based on Commensurability).
         """
-        try:
+        a = self._a
+        b = self._b
+        if isinstance(r, Rational):
             # Multing with other rational
-            tmpa = self.nom() * r.nom()
-            tmpb = self.denom() * r.denom()
-        except AttributeError:
-            # Multing with a number
-            tmpa = self.nom() * r
-            tmpb = self.denom()
-        return Rational(tmpa, tmpb)
+            ra = r._a
+            rb = r._b
+            if b == 1 and rb == 1:
+                return _fromNormalized(a * ra, 1)
+            d1 = _gcd(abs(a), rb)
+            d2 = _gcd(abs(ra), b)
+            return _fromNormalized((a // d1) * (ra // d2),
+                (b // d2) * (rb // d1))
+        elif _isInteger(r):
+            # Multing with an integer
+            if b == 1:
+                return _fromNormalized(a * r, 1)
+            d = _gcd(abs(r), b)
+            return _fromNormalized(a * (r // d), b // d)
+        # Multing with other number
+        return Rational(a * r, b)
 
     def __rmul__(self, r):
         """Does the same as __mul__()."""
@@ -165,82 +296,125 @@ class Rational:
 
         Returned number is normalized (based on Commensurability).
         """
-        try:
+        a = self._a
+        b = self._b
+        if isinstance(r, Rational):
             # Dividing with other rational
-            tmpa = self.nom() * r.denom()
-            tmpb = self.denom() * r.nom()
-        except AttributeError:
-            # Dividing with a number
-            tmpa = self.nom()
-            tmpb = self.denom() * r
-        return Rational(tmpa, tmpb)
+            ra = r._a
+            rb = r._b
+            if ra == 0:
+                raise ValueError, 'b must be nonzero.'
+            d1 = _gcd(abs(a), abs(ra))
+            d2 = _gcd(b, rb)
+            tmpa = (a // d1) * (rb // d2)
+            tmpb = (b // d2) * (ra // d1)
+        elif _isInteger(r):
+            # Dividing with an integer
+            if r == 0:
+                raise ValueError, 'b must be nonzero.'
+            d = _gcd(abs(a), abs(r))
+            tmpa = a // d
+            tmpb = b * (r // d)
+        else:
+            # Dividing with other number
+            return Rational(a, b * r)
+        # Sign normalization
+        if tmpb < 0:
+            return _fromNormalized(-tmpa, -tmpb)
+        return _fromNormalized(tmpa, tmpb)
 
     def __rdiv__(self, r):
         """Does the same as __div__()."""
         return self.__div__(r)
 
+    def __float__(self):
+        """Returns the nearest floating-point number to this rational
+        number."""
+        return operator.truediv(self._a, self._b)
+
     def __abs__(self):
         """Returns the absolute value of this rational."""
-        return Rational(abs(self.nom()), self.denom())
+        if self._a < 0:
+            return _fromNormalized(-self._a, self._b)
+        return self
 
     def __neg__(self):
         """Returns the negated value if this rational."""
-        return Rational(-self.nom(), self.denom())
+        return _fromNormalized(-self._a, self._b)
 
     def __eq__(self, r):
         """Returns True, if this object is equal to the r object (rational
         number or an ordinary number), False otherwise.
         """
-        try:
+        if isinstance(r, Rational):
             # Compare with other rational
-            return self.nom() == r.nom() and self.denom() == r.denom()
-        except AttributeError:
-            # Compare with a number
-            return self.nom() == r and self.denom() == 1
+            return self._a == r._a and self._b == r._b
+        # Compare with a number
+        return self._b == 1 and self._a == r
 
     def __ne__(self, r):
         """Returns True, if this object is NOT equal to the r object (rational
         number or an ordinary number), False otherwise.
         """
-        return not (self == r)
+        return not self.__eq__(r)
+
+    def __hash__(self):
+        """Returns the hash of this rational (rationals with denominator 1
+        have the same hash as the corresponding integers)."""
+        if self._b == 1:
+            return hash(self._a)
+        return hash((self._a, self._b))
 
     def __lt__(self, r):
         """Returns True if self < r, False otherwise. r can be a rational
         number of an ordinary number.
         """
-        try:
+        if isinstance(r, Rational):
             # Compare with other rational
-            # Transform both rationals to the same denominator and compare
-            # their nominators
-            return (self.nom() * r.denom()) < (r.nom() * self.denom())
-        except AttributeError:
-            # Compare with a number
-            return self.nom() < (r * self.denom())
+            # Transform both rationals to the same denominator (if needed)
+            # and compare their nominators
+            if self._b == r._b:
+                return self._a < r._a
+            return self._a * r._b < r._a * self._b
+        # Compare with a number
+        return self._a < r * self._b
 
     def __le__(self, r):
         """Returns True if self <= r, False otherwise. r can be a rational
         number of an ordinary number.
         """
-        return self < r or self == r
+        if isinstance(r, Rational):
+            if self._b == r._b:
+                return self._a <= r._a
+            return self._a * r._b <= r._a * self._b
+        return self._a <= r * self._b
 
     def __gt__(self, r):
         """Returns True if self > r, False otherwise. r can be a rational
         number of an ordinary number.
         """
-        return not (self < r) and self != r
+        if isinstance(r, Rational):
+            if self._b == r._b:
+                return self._a > r._a
+            return self._a * r._b > r._a * self._b
+        return self._a > r * self._b
 
     def __ge__(self, r):
         """Returns True if self >= r, False otherwise. r can be a rational
         number of an ordinary number.
         """
-        return self > r or self == r
+        if isinstance(r, Rational):
+            if self._b == r._b:
+                return self._a >= r._a
+            return self._a * r._b >= r._a * self._b
+        return self._a >= r * self._b
 
     def __str__(self):
         """Returns the string representation of the current rational number
         in the form a/b (if the number is negative, then there will be a '-'
         character before a).
         """
-        return "%d/%d" % (self.nom(), self.denom())
+        return "%d/%d" % (self._a, self._b)
 
     def __repr__(self):
         """Returns the same as __str__()."""
@@ -0,0 +1,329 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains a server which keeps the solver loaded and solves
+games sent over a local socket (a Unix domain socket or a TCP socket),
+so the start of the program is not paid for every game.
+
+Every connection can send any number of requests, responses are sent
+in the order of requests. A request is either
+    - a game in the text format (see io.parseInputMatrices()) followed
+      by a line containing only io.GAME_SEPARATOR; the response is a single
+      line in the format of the batch mode (see batch.printResult()),
+      games are numbered from 1 in every connection
+    - a single line with a JSON object {"id": ..., "m1": ..., "m2": ...,
+      "label": ...} (see io.gameFromJson(), "id" and "label" are optional,
+      "label" is the initially dropped label); the response is a single line
+      with a JSON object containing "id" (the same as in the request),
+      "status" ("ok" or "error"), "eq" (see io.equilibriumToJson())
+      or "error" (the error message), "seconds" (time spent on solving
+      the game) and "totalSeconds" (time spent on the whole request,
+      including waiting for a free worker process)
+
+Connections are handled by threads. Games are solved in a pool of worker
+processes, or directly by the threads when only one process is used.
+Games of the same size are solved by reused solvers (see
+solver.LemkeHowsonSolver).
+
+This module requires python 2.6 (the json and multiprocessing modules).
+"""
+
+
+import json
+import os
+import socket
+import SocketServer
+import stat
+import time
+
+import batch
+import io
+import lh
+
+
+# Host of TCP servers whose address contains only the port
+DEFAULT_HOST = '127.0.0.1'
+
+# Solvers reused in a worker process (see _solveInWorker())
+_workerSolvers = {}
+
+
+def _solveInWorker(game, backend, tol, field, limits, initBasisVar):
+    """Solves the selected game in a worker process (see
+    batch.solveGame())."""
+    return batch.solveGame(game, backend, tol, field, limits, _workerSolvers,
+        initBasisVar)
+
+
+def _isLoopbackHost(host):
+    """Returns True if the selected host (string) is 'localhost'
+    or an IPv4 loopback address (127.x.x.x), False otherwise."""
+    if host == 'localhost':
+        return True
+    parts = host.split('.')
+    return len(parts) == 4 and parts[0] == '127' and \
+        all([p.isdigit() and int(p) <= 255 for p in parts])
+
+
+def parseAddress(text):
+    """Returns the address of a server from its textual representation.
+    PORT and HOST:PORT are addresses of TCP sockets (returned as tuples
+    (host, port), the host is DEFAULT_HOST if it is omitted), everything
+    else is a path to a Unix domain socket (returned as it is).
+
+    text - textual representation of the address (string)
+
+    The server is reachable only locally, so HOST has to be 'localhost'
+    or an IPv4 loopback address (127.x.x.x).
+
+    Raises ValueError if HOST is not a loopback address.
+    """
+    (host, sep, port) = text.rpartition(':')
+    if port.isdigit() and '/' not in host:
+        host = host or DEFAULT_HOST
+        if not _isLoopbackHost(host):
+            raise ValueError, 'Host is not a loopback address: %s.' % host
+        return (host, int(port))
+    return text
+
+
+class _RequestHandler(SocketServer.StreamRequestHandler):
+    """Handler of a single connection (see the module description)."""
+
+    def handle(self):
+        """Handles all requests from the connection."""
+        # Solvers are reused only by requests of the same connection,
+        # because they cannot be shared among threads
+        solvers = {}
+        lines = []
+        gameNum = 0
+        try:
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    break
+                line = line.rstrip('\r\n')
+                if not lines and line.lstrip().startswith('{'):
+                    self.__handleJson(line, solvers)
+                elif line.strip() == io.GAME_SEPARATOR:
+                    # Empty games are omitted
+                    if lines:
+                        gameNum += 1
+                        self.__handleText(gameNum, lines, solvers)
+                        lines = []
+                elif lines or line.strip() != '':
+                    lines.append(line)
+            # The last game does not need to be followed by the separator
+            if lines:
+                self.__handleText(gameNum + 1, lines, solvers)
+        except socket.error:
+            # The client has closed the connection
+            pass
+
+    def __handleText(self, gameNum, lines, solvers):
+        """Solves the game from the selected lines and sends the result."""
+        try:
+            game = io.parseInputMatrices('\n'.join(lines))
+        except ValueError, e:
+            game = e
+        result = self.server.solverServer.solveGame(game, solvers)
+        batch.printResult(gameNum, result, self.wfile)
+        self.wfile.flush()
+
+    def __handleJson(self, line, solvers):
+        """Solves the game from the selected JSON line and sends
+        the result."""
+        startTime = time.time()
+        requestId = None
+        initBasisVar = 1
+        try:
+            obj = json.loads(line)
+            if isinstance(obj, dict):
+                requestId = obj.get('id')
+                initBasisVar = obj.get('label', 1)
+                if not isinstance(initBasisVar, (int, long)) or \
+                        isinstance(initBasisVar, bool):
+                    raise ValueError, 'Invalid initial basis variable.'
+            game = io.gameFromJson(obj)
+        except ValueError, e:
+            game = e
+        (eq, error, seconds) = self.server.solverServer.solveGame(game,
+            solvers, initBasisVar)
+
+        response = {'id': requestId, 'seconds': seconds,
+            'totalSeconds': time.time() - startTime}
+        if error is None:
+            response['status'] = 'ok'
+            response['eq'] = io.equilibriumToJson(eq)
+        else:
+            response['status'] = 'error'
+            response['error'] = error
+        self.wfile.write(json.dumps(response, sort_keys=True) + '\n')
+        self.wfile.flush()
+
+
+class _TCPServer(SocketServer.ThreadingTCPServer):
+    """Threading TCP server used by SolverServer."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _UnixServer(SocketServer.ThreadingUnixStreamServer):
+    """Threading Unix domain socket server used by SolverServer."""
+    daemon_threads = True
+
+
+class SolverServer(object):
+    """Server solving games sent over a socket (see the module description).
+
+    Attributes:
+        address - address on which the server listens (a tuple (host, port)
+                  for TCP sockets, a path for Unix domain sockets)
+    """
+
+    def __init__(self, address, backend=lh.AUTO_BACKEND, tol=None,
+            field=None, limits=None, processes=1):
+        """Creates the server and starts listening on the selected address.
+        Requests are handled after serveForever() is called.
+
+        address - address of the server (see parseAddress(), the host
+                  of a TCP socket has to be a loopback address); port 0
+                  selects a free port
+        backend - pivoting engine to be used (see lh.lemkeHowson())
+        tol - tolerance used by floating-point backends (see
+              lh.lemkeHowson())
+        field - number field used by the backend (see lh.lemkeHowson())
+        limits - limits of every path (see batch.solveGame())
+        processes - number of worker processes (number); if it is 1, games
+                    are solved by threads handling connections
+
+        Raises ValueError if the selected backend or field does not exist,
+        if the backend does not support the field or if the host of a TCP
+        socket is not a loopback address. Raises socket.error
+        if the server cannot listen on the selected address.
+        """
+        # Check the backend and the field before any game is received
+        if backend == lh.AUTO_BACKEND:
+            for autoBackend in ('rational', 'sparse'):
+                lh.getEngine(autoBackend, tol, field)
+        else:
+            lh.getEngine(backend, tol, field)
+        self.__params = (backend, tol, field, limits)
+
+        if isinstance(address, tuple):
+            if not _isLoopbackHost(address[0]):
+                raise ValueError, 'Host is not a loopback address: %s.' % \
+                    address[0]
+            self.__server = _TCPServer(address, _RequestHandler)
+        else:
+            # Remove a socket left by a server that was not closed
+            if os.path.exists(address) and \
+                    stat.S_ISSOCK(os.stat(address).st_mode):
+                os.remove(address)
+            self.__server = _UnixServer(address, _RequestHandler)
+        self.__server.solverServer = self
+        self.address = self.__server.server_address
+
+        self.__pool = None
+        if processes > 1:
+            # This import must be here because of python 2.5 (it does not
+            # have the multiprocessing module)
+            import multiprocessing
+            self.__pool = multiprocessing.Pool(processes)
+
+    def serveForever(self, pollInterval=0.5):
+        """Handles requests until shutdown() is called.
+
+        pollInterval - how often (in seconds) a call of shutdown() is checked
+        """
+        self.__server.serve_forever(pollInterval)
+
+    def shutdown(self):
+        """Stops serveForever() (it must be called from another thread)."""
+        self.__server.shutdown()
+
+    def close(self):
+        """Stops listening, terminates worker processes and removes
+        the Unix domain socket (if it is used)."""
+        self.__server.server_close()
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool = None
+        if not isinstance(self.address, tuple) and \
+                os.path.exists(self.address):
+            os.remove(self.address)
+
+    def solveGame(self, game, solvers=None, initBasisVar=1):
+        """Solves the selected game in a worker process (or in the current
+        thread if there are no worker processes) and returns its result
+        (see batch.solveGame()).
+
+        game - tuple of two matrices (m1, m2) or an exception raised while
+               the game was being read
+        solvers - solvers reused by the current thread (see
+                  batch.solveGame())
+        initBasisVar - the initially dropped label (see lh.lemkeHowson())
+        """
+        (backend, tol, field, limits) = self.__params
+        if self.__pool is None or isinstance(game, Exception):
+            return batch.solveGame(game, backend, tol, field, limits, solvers,
+                initBasisVar)
+        return self.__pool.apply(_solveInWorker,
+            (game, backend, tol, field, limits, initBasisVar))
+
+
+class SolverClient(object):
+    """Client of SolverServer."""
+
+    def __init__(self, address):
+        """Connects to the server on the selected address (see
+        parseAddress()).
+
+        Raises socket.error if the connection cannot be established.
+        """
+        if isinstance(address, tuple):
+            self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        else:
+            self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__socket.connect(address)
+        self.__rfile = self.__socket.makefile('rb')
+
+    def solveGame(self, m1, m2):
+        """Sends the selected game in the text format and returns its result
+        as a tuple (status, seconds, text), where status is 'ok' or 'error',
+        seconds is the time spent on solving the game and text is the found
+        equilibrium (see io.equilibriumToStr()) or the error message.
+
+        Raises IOError if the server closes the connection.
+        """
+        self.__socket.sendall(repr(m1) + '\n' + repr(m2) +
+            io.GAME_SEPARATOR + '\n')
+        (gameNum, status, seconds, text) = self.__readLine().split('\t', 3)
+        return (status, float(seconds), text)
+
+    def solveJson(self, request):
+        """Sends the selected request in the JSON format and returns
+        the decoded response.
+
+        request - request (dictionary, see the module description)
+
+        Raises IOError if the server closes the connection.
+        """
+        self.__socket.sendall(json.dumps(request) + '\n')
+        return json.loads(self.__readLine())
+
+    def close(self):
+        """Closes the connection."""
+        self.__rfile.close()
+        self.__socket.close()
+
+    def __readLine(self):
+        """Returns the next line sent by the server (without the trailing
+        new line)."""
+        line = self.__rfile.readline()
+        if not line.endswith('\n'):
+            raise IOError, 'Connection closed by the server.'
+        return line[:-1]
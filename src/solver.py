@@ -0,0 +1,86 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains a reusable Lemke-Howson solver for games
+of the same size.
+
+lh.lemkeHowson() creates normalized copies of both matrices and a new
+tableaux for every game. The solver creates its tableaux only once
+and refills it for every solved game (the payoffs are shifted by the
+normalization constant while the tableaux is being filled, so normalized
+matrices are not created at all). This saves allocations when many
+games of the same size are solved (e.g. in a long-running service).
+"""
+
+
+import lh
+import matrix
+
+
+class LemkeHowsonSolver(object):
+    """Lemke-Howson solver for games with the selected numbers of strategies.
+
+    Attributes:
+        rows - number of strategies of the first player (number)
+        cols - number of strategies of the second player (number)
+        backend - name of the used backend (one of lh.BACKENDS)
+    """
+
+    def __init__(self, rows, cols, backend='rational', tol=None, field=None):
+        """Creates the solver.
+
+        rows - number of strategies of the first player (number)
+        cols - number of strategies of the second player (number)
+        backend - pivoting engine to be used (one of lh.BACKENDS,
+                  lh.AUTO_BACKEND is not supported because the backend
+                  would depend on the solved game)
+        tol - tolerance used by floating-point backends (see
+              lh.lemkeHowson())
+        field - number field used by the backend (see lh.lemkeHowson())
+
+        Raises ValueError if rows or cols is not positive, if the selected
+        backend or field does not exist or if the backend does not support
+        the field. Raises ImportError if the backend or the field needs
+        a module which is not installed.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.backend = backend
+        self.__engine = lh.getEngine(backend, tol, field)
+        # The tableaux is created only once (for an empty game), it is
+        # refilled for every solved game
+        emptyGame = matrix.Matrix(rows, cols)
+        self.__t = self.__engine.createTableaux(emptyGame, emptyGame)
+
+    def solve(self, m1, m2, initBasisVar=1, stats=None, limits=None):
+        """Returns the equilibrium of the selected game (see lh.lemkeHowson(),
+        the result is the same).
+
+        m1 - matrix of profits of the first player (Matrix)
+        m2 - matrix of profits of the second player (Matrix)
+        initBasisVar, stats, limits - see lh.lemkeHowson()
+
+        Preconditions:
+            - both matrices must have self.rows rows and self.cols columns
+            - 0 < initBasisVar <= self.rows + self.cols
+
+        Raises ValueError if some of the preconditions are not met. Raises
+        pathlimits.PathLimitError (its subclass) if the path exceeds some
+        of the selected limits.
+        """
+        for m in (m1, m2):
+            if m.getNumRows() != self.rows or m.getNumCols() != self.cols:
+                raise ValueError, 'Selected matrices does not have ' +\
+                    '%d rows and %d columns.' % (self.rows, self.cols)
+        if initBasisVar <= 0 or initBasisVar > self.rows + self.cols:
+            raise ValueError, 'Invalid initial basis variable.'
+
+        engine = self.__engine
+        t = self.__t
+        engine.fillTableaux(t, m1, m2,
+            engine.getNormalizationConstant(m1, m2))
+        lh.followPath(engine, t, self.rows, initBasisVar, stats, limits)
+        return engine.getEquilibrium(t, self.rows)
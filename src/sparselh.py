@@ -0,0 +1,433 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+"""This module contains a sparse pivoting engine for the Lemke-Howson
+algorithm, which is suitable for games with mostly zero payoffs.
+
+The tableaux has the same meaning as the tableaux from lh.createTableaux(),
+but only nonzero coefficients are stored (every row is a dictionary) and
+every part of the tableaux has an index of rows in which a column has
+a nonzero coefficient. Therefore, the min-ratio test scans only rows with
+a nonzero coefficient of the entering variable and the pivoting step
+updates only these rows and only in columns with a nonzero coefficient
+in the pivot row.
+"""
+
+
+import lh
+import numfields
+import rational
+
+
+class SparseTableaux(object):
+    """Sparse tableaux used by the sparse pivoting engine.
+
+    Rows 0..p1SCount - 1 belong to the first part of the tableaux, the rest
+    to the second part. Variables and labels have the same meaning
+    as in lh.createTableaux().
+
+    Attributes:
+        basis - basis variable of every row (list of numbers)
+        values - value of the basis variable of every row (list of numbers
+                 of the field of the tableaux)
+        rows - nonzero coefficients of every row (list of dictionaries
+               label -> coefficient)
+        cols - indices of rows with a nonzero coefficient in the selected
+               column for both parts of the tableaux (list of two
+               dictionaries label -> set of row indices)
+    """
+
+    __slots__ = ('basis', 'values', 'rows', 'cols')
+
+    def __init__(self, basis, values, rows, cols):
+        """Creates the tableaux from the selected parts."""
+        self.basis = basis
+        self.values = values
+        self.rows = rows
+        self.cols = cols
+
+    def copy(self):
+        """Returns a copy of the tableaux."""
+        return SparseTableaux(self.basis[:], self.values[:],
+            [row.copy() for row in self.rows],
+            [dict([(label, rowSet.copy()) for (label, rowSet) in c.items()])
+                for c in self.cols])
+
+
+def getNormalizationConstant(m1, m2):
+    """Returns the constant that normalizeMatrices() adds to all items
+    of the selected matrices (0 if they do not need to be normalized).
+
+    m1 - first matrix (Matrix)
+    m2 - second matrix (Matrix)
+
+    The Lemke-Howson algorithm needs only nonnegative matrices where m1
+    does not have any column with all zeros and m2 does not have any row
+    with all zeros. If the matrices meet these conditions, no constant
+    is added (so zero payoffs stay zero and the tableaux stays sparse).
+    Otherwise, the constant from lh.getNormalizationConstant() is used.
+    """
+    rows = m1.getNumRows()
+    cols = m1.getNumCols()
+    m1NonzeroCols = set()
+    m2NonzeroRows = set()
+    for (k, (x, y)) in enumerate(zip(m1.getItems(), m2.getItems())):
+        if x < 0 or y < 0:
+            return lh.getNormalizationConstant(m1, m2)
+        if x != 0:
+            m1NonzeroCols.add(k % cols)
+        if y != 0:
+            m2NonzeroRows.add(k // cols)
+    if len(m1NonzeroCols) != cols or len(m2NonzeroRows) != rows:
+        return lh.getNormalizationConstant(m1, m2)
+    return 0
+
+
+def normalizeMatrices(m1, m2):
+    """Returns the selected matrices in a tuple normalized in the same way
+    as lh.normalizeMatrices() does, but only if it is needed (see
+    getNormalizationConstant()); otherwise, they are returned unchanged.
+
+    m1 - first matrix to be normalized (Matrix)
+    m2 - second matrix to be normalized (Matrix)
+    """
+    if getNormalizationConstant(m1, m2) == 0:
+        return (m1, m2)
+    return lh.normalizeMatrices(m1, m2)
+
+
+def createTableaux(m1, m2, field=None, cnst=0):
+    """Creates a sparse tableaux from the two selected matrices
+    (SparseTableaux instance).
+
+    m1 - first matrix (Matrix instance)
+    m2 - second matrix (Matrix instance)
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+    cnst - constant added to all payoffs (see lh.createTableaux())
+
+    Preconditions:
+        - m1 must have the same number of rows and columns as m2
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    if m1.getNumRows() != m2.getNumRows() or m1.getNumCols() != m2.getNumCols():
+        raise ValueError, 'Selected matrices does not have the same number ' +\
+                'of rows and columns'
+
+    S = m1.getNumRows() + m1.getNumCols()
+    t = SparseTableaux(S * [0], S * [0], [{} for i in xrange(0, S)], [{}, {}])
+    fillTableaux(t, m1, m2, cnst, field)
+    return t
+
+
+def fillTableaux(t, m1, m2, cnst=0, field=None):
+    """Fills the selected tableaux with the initial tableaux of the selected
+    game whose payoffs are increased by the selected constant, i.e. with
+    createTableaux(m1 + cnst, m2 + cnst) (lists and dictionaries
+    of the tableaux are reused).
+
+    t - tableaux created for a game with the same numbers of strategies
+        (SparseTableaux)
+    m1 - first matrix (Matrix instance)
+    m2 - second matrix (Matrix instance)
+    cnst - constant added to all payoffs (number, see
+           getNormalizationConstant())
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+    """
+    if field is None:
+        field = numfields.getField()
+
+    p1SCount = m1.getNumRows()
+    p2SCount = m1.getNumCols()
+    S = len(t.basis)
+    t.basis[:] = xrange(-1, -S - 1, -1)
+    t.values[:] = S * [field.one]
+    rows = t.rows
+    for row in rows:
+        row.clear()
+    cols = t.cols
+    for c in cols:
+        c.clear()
+
+    # The first part of the tableaux: s_i = 1 - sum_j m1_ij * y_j
+    # The second part of the tableaux: s_j = 1 - sum_i m2_ij * x_i
+    m1Items = rational.scaleToIntegers(m1.getItems(), cnst)
+    m2Items = rational.scaleToIntegers(m2.getItems(), cnst)
+    for i in xrange(1, p1SCount + 1):
+        rowStart = (i - 1) * p2SCount
+        for (j, (x, y)) in enumerate(zip(
+                m1Items[rowStart:rowStart + p2SCount],
+                m2Items[rowStart:rowStart + p2SCount])):
+            if x != 0:
+                rows[i - 1][p1SCount + j + 1] = -field.convert(x)
+                cols[0].setdefault(p1SCount + j + 1, set()).add(i - 1)
+            if y != 0:
+                rows[p1SCount + j][i] = -field.convert(y)
+                cols[1].setdefault(i, set()).add(p1SCount + j)
+
+
+def makePivotingStep(t, p1SCount, ebVar, stats=None, field=None):
+    """Makes a single pivoting step in the selected tableaux by
+    bringing the selected variable into the basis. All changes are done
+    in the original tableaux. Returns the variable that left the basis.
+
+    t - tableaux (SparseTableaux)
+    p1SCount - number of strategies of player 1 (number)
+    ebVar - variable that will enter the basis (number)
+    stats - statistics of the current pivoting step are recorded into this
+            object (pivotstats.PivotStats or None if they should not be
+            recorded)
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+
+    Preconditions:
+        - 0 < abs(ebVar) <= len(t.basis)
+        - 0 < p1SCount < len(t.basis)
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    S = len(t.basis)
+    # 1st precondition
+    if abs(ebVar) <= 0 or abs(ebVar) > S:
+        raise ValueError, 'Selected variable index is invalid.'
+    # 2nd precondition
+    if p1SCount < 0 or S <= p1SCount:
+        raise ValueError, 'Invalid number of strategies of player 1.'
+    if field is None:
+        field = numfields.getField()
+
+    # Select the appropriate part of the tableaux (slack variables
+    # of the part have labels firstLabel..firstLabel + slackCount - 1)
+    if -p1SCount <= ebVar < 0 or ebVar > p1SCount:
+        cols = t.cols[0]
+        (firstLabel, slackCount) = (1, p1SCount)
+    else:
+        cols = t.cols[1]
+        (firstLabel, slackCount) = (p1SCount + 1, S - p1SCount)
+    ebLabel = abs(ebVar)
+    ebRows = sorted(cols.get(ebLabel, ()))
+
+    # Min-ratio rule (only rows with a negative coefficient are considered;
+    # ties are broken by the lexicographic rule as in lh)
+    minRatio = None
+    tiedRows = []
+    candidates = 0
+    for i in ebRows:
+        coeff = t.rows[i][ebLabel]
+        if coeff < 0:
+            candidates += 1
+            ratio = -t.values[i] / coeff
+            if minRatio == None or ratio < minRatio:
+                minRatio = ratio
+                tiedRows = [i]
+            elif ratio == minRatio:
+                tiedRows.append(i)
+    if not tiedRows:
+        raise ValueError, 'No variable can leave the basis.'
+    lbVarRow = tiedRows[0]
+    if len(tiedRows) > 1:
+        # Degenerate step (see lh.breakRatioTie())
+        def perturbation(i, j):
+            label = firstLabel + j
+            eps = -t.rows[i].get(label, 0)
+            if t.basis[i] == -label:
+                eps = eps + 1
+            return eps
+        lbVarRow = lh.breakRatioTie(tiedRows, lambda i: -t.rows[i][ebLabel],
+            perturbation, slackCount)
+    if stats is not None:
+        stats.recordRatioTest(len(ebRows), candidates)
+
+    return _pivot(t, cols, ebVar, ebRows, lbVarRow, field)
+
+
+def _pivot(t, cols, ebVar, ebRows, lbVarRow, field):
+    """Makes a pivoting step in the selected tableaux on the selected row
+    and the column of the selected variable (the coefficient must be
+    nonzero). Returns the variable that left the basis.
+
+    t - tableaux (SparseTableaux)
+    cols - index of columns of the part of the tableaux (see SparseTableaux)
+    ebVar - variable that will enter the basis (number)
+    ebRows - rows with a nonzero coefficient of the entering variable
+             (list of numbers)
+    lbVarRow - row of the variable that will leave the basis (number)
+    field - number field of the tableaux (numfields.NumberField)
+    """
+    ebLabel = abs(ebVar)
+    lbVar = t.basis[lbVarRow]
+
+    # Update the row in which the variable that will leave the basis was
+    # found in the previous step (it is divided by the negated coefficient,
+    # which is negative in steps selected by the min-ratio rule)
+    pivotRow = t.rows[lbVarRow]
+    scale = -field.one / pivotRow.pop(ebLabel)
+    for label in pivotRow:
+        pivotRow[label] = pivotRow[label] * scale
+    pivotRow[abs(lbVar)] = -scale
+    t.values[lbVarRow] = t.values[lbVarRow] * scale
+    t.basis[lbVarRow] = ebVar
+    cols[ebLabel].discard(lbVarRow)
+    cols.setdefault(abs(lbVar), set()).add(lbVarRow)
+
+    # Update other rows with a nonzero coefficient of the entering variable
+    # (only columns with a nonzero coefficient in the pivot row are changed)
+    pivotValue = t.values[lbVarRow]
+    for i in ebRows:
+        if i != lbVarRow:
+            row = t.rows[i]
+            coeff = row.pop(ebLabel)
+            for (label, x) in pivotRow.iteritems():
+                newX = row.get(label, 0) + coeff * x
+                if newX != 0:
+                    if label not in row:
+                        cols.setdefault(label, set()).add(i)
+                    row[label] = newX
+                elif label in row:
+                    del row[label]
+                    cols[label].discard(i)
+            t.values[i] = t.values[i] + coeff * pivotValue
+            cols[ebLabel].discard(i)
+
+    return lbVar
+
+
+def pivotToBasis(t, p1SCount, basis, field=None):
+    """Makes pivoting steps in the selected tableaux until its basis is the
+    selected basis and returns True if the resulting basis is feasible, False
+    otherwise (see lh.pivotSplitToBasis()).
+
+    t - tableaux (SparseTableaux)
+    p1SCount - number of strategies of player 1 (number)
+    basis - basis variables (list of numbers, see lh.checkBasis())
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+
+    Raises ValueError if the basis is invalid or singular.
+    """
+    S = len(t.basis)
+    lh.checkBasis(basis, p1SCount, S)
+    if field is None:
+        field = numfields.getField()
+
+    targets = set(basis)
+    for ebVar in basis:
+        if ebVar in t.basis:
+            continue
+        if -p1SCount <= ebVar < 0 or ebVar > p1SCount:
+            cols = t.cols[0]
+        else:
+            cols = t.cols[1]
+        # The leaving variable is the basis variable that is not in the
+        # selected basis with the largest coefficient (in absolute value)
+        # of the entering variable
+        ebLabel = abs(ebVar)
+        ebRows = sorted(cols.get(ebLabel, ()))
+        lbVarRow = None
+        for i in ebRows:
+            coeff = abs(t.rows[i][ebLabel])
+            if t.basis[i] not in targets and \
+                    (lbVarRow is None or coeff > maxCoeff):
+                (lbVarRow, maxCoeff) = (i, coeff)
+        if lbVarRow is None:
+            raise ValueError, 'Selected basis is singular.'
+        _pivot(t, cols, ebVar, ebRows, lbVarRow, field)
+
+    for value in t.values:
+        if value < 0:
+            return False
+    return True
+
+
+def getEquilibrium(t, p1SCount, field=None):
+    """Returns the normalized equilibrium from the given tableaux (tuple
+    of two tuples of numbers of the selected field, see
+    lh.normalizeEquilibrium()).
+
+    t - tableaux (SparseTableaux)
+    p1SCount - number of strategies of player 1 (number)
+    field - number field of the tableaux (numfields.NumberField or None
+            for numfields.DEFAULT_FIELD)
+
+    Preconditions:
+        - 0 < p1SCount < len(t.basis)
+
+    Raises ValueError if some of the preconditions are not met.
+    """
+    S = len(t.basis)
+    if p1SCount < 0 or S <= p1SCount:
+        raise ValueError, 'Invalid number of strategies of player 1.'
+
+    if field is None:
+        field = numfields.getField()
+
+    eqs = S * [field.zero]
+    for i in xrange(0, S):
+        strat = t.basis[i]
+        prob = t.values[i]
+        if strat > 0 and prob > 0:
+            eqs[strat - 1] = prob
+
+    return lh.normalizeEquilibrium((tuple(eqs[0:p1SCount]),
+        tuple(eqs[p1SCount:])), field)
+
+
+class SparseEngine(object):
+    """Pivoting engine for lh.lemkeHowson() working with sparse tableaux
+    of exact rational numbers. Found equilibria are tuples of numbers
+    of the selected field (Rationals by default)."""
+
+    def __init__(self, field=None):
+        """Creates the engine.
+
+        field - number field of tableaux (numfields.NumberField or None
+                for numfields.DEFAULT_FIELD)
+        """
+        self.field = numfields.getField(field)
+
+    def normalizeMatrices(self, m1, m2):
+        """See normalizeMatrices()."""
+        return normalizeMatrices(m1, m2)
+
+    def getNormalizationConstant(self, m1, m2):
+        """See getNormalizationConstant()."""
+        return getNormalizationConstant(m1, m2)
+
+    def createTableaux(self, m1, m2, cnst=0):
+        """See createTableaux()."""
+        return createTableaux(m1, m2, self.field, cnst)
+
+    def fillTableaux(self, t, m1, m2, cnst=0):
+        """See fillTableaux()."""
+        fillTableaux(t, m1, m2, cnst, self.field)
+
+    def copyTableaux(self, t):
+        """Returns a copy of the selected tableaux."""
+        return t.copy()
+
+    def getBasis(self, t):
+        """Returns basis variables of the selected tableaux (list
+        of numbers)."""
+        return t.basis[:]
+
+    def makePivotingStep(self, t, p1SCount, ebVar, stats=None):
+        """See makePivotingStep()."""
+        return makePivotingStep(t, p1SCount, ebVar, stats, self.field)
+
+    def pivotToBasis(self, t, p1SCount, basis):
+        """See pivotToBasis()."""
+        return pivotToBasis(t, p1SCount, basis, self.field)
+
+    def getEquilibrium(self, t, p1SCount):
+        """See getEquilibrium()."""
+        return getEquilibrium(t, p1SCount, self.field)
+
+    def equilibriaEqual(self, eq1, eq2):
+        """Returns True if the two selected equilibria are equal,
+        False otherwise."""
+        return self.field.equilibriaEqual(eq1, eq2)
@@ -0,0 +1,125 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import StringIO
+import unittest
+import sys
+
+from .. import batch
+from .. import io
+from .. import lh
+from .. import rational as r
+
+
+EX1_TEXT = '2 0\n0 2\n\n0 2\n2 0\n'
+EX1_GAME = io.parseInputMatrices(EX1_TEXT)
+EX1_EQ = ((r.Rational(1, 2), r.Rational(1, 2)),
+          (r.Rational(1, 2), r.Rational(1, 2)))
+EX2_TEXT = '1 3 0\n0 0 2\n2 1 1\n\n2 1 0\n1 3 1\n0 0 3\n'
+EX2_GAME = io.parseInputMatrices(EX2_TEXT)
+EX2_EQ = ((r.Rational(6, 13), r.Rational(3, 13), r.Rational(4, 13)),
+          (r.Rational(1, 9), r.Rational(1, 3), r.Rational(5, 9)))
+INVALID_TEXT = '1 2\n'
+INVALID_GAME = ValueError('Input text does not contain two valid matrices.')
+
+
+class StreamStub(object):
+    def __init__(self):
+        self.data = ''
+    def write(self, data):
+        self.data += data
+
+
+class SolveGameTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testValidGameIsSolved(self):
+        (eq, error, seconds) = batch.solveGame(EX1_GAME)
+        self.assertEqual(EX1_EQ, eq)
+        self.assertEqual(None, error)
+        self.assertTrue(seconds >= 0)
+
+    def testGameIsSolvedFromSelectedLabel(self):
+        for solvers in (None, {}):
+            (eq, error, seconds) = batch.solveGame(EX2_GAME, solvers=solvers,
+                initBasisVar=4)
+            self.assertEqual(lh.lemkeHowson(EX2_GAME[0], EX2_GAME[1],
+                initBasisVar=4), eq)
+
+    def testErrorIsReturnedForGameThatCouldNotBeRead(self):
+        (eq, error, seconds) = batch.solveGame(INVALID_GAME)
+        self.assertEqual(None, eq)
+        self.assertEqual('Input text does not contain two valid matrices.',
+            error)
+
+    def testErrorIsReturnedForGameThatCouldNotBeSolved(self):
+        (eq, error, seconds) = batch.solveGame(EX1_GAME, 'unknown')
+        self.assertEqual(None, eq)
+        self.assertEqual('Unknown backend: unknown.', error)
+
+
+class SolveGamesTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioResultsAreInInputOrder(self, processes):
+        games = [EX2_GAME, INVALID_GAME, EX1_GAME, EX2_GAME] * 3
+        results = list(batch.solveGames(games, processes=processes))
+        self.assertEqual([EX2_EQ, None, EX1_EQ, EX2_EQ] * 3,
+            [eq for (eq, error, seconds) in results])
+        self.assertEqual([False, True, False, False] * 3,
+            [error is not None for (eq, error, seconds) in results])
+
+    def testResultsAreInInputOrderWhenSolvedOneByOne(self):
+        self.scenarioResultsAreInInputOrder(1)
+
+    def testResultsAreInInputOrderWhenSolvedInWorkerPool(self):
+        self.scenarioResultsAreInInputOrder(2)
+
+
+class RunBatchTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testOneLineIsPrintedForEveryGame(self):
+        stream = StreamStub()
+        text = EX1_TEXT + '---\n' + INVALID_TEXT + '---\n' + EX2_TEXT
+        failures = batch.runBatch(StringIO.StringIO(text), stream)
+        self.assertEqual(1, failures)
+        lines = [line.split('\t') for line in stream.data.splitlines()]
+        self.assertEqual(['1', '2', '3'], [line[0] for line in lines])
+        self.assertEqual(['ok', 'error', 'ok'], [line[1] for line in lines])
+        self.assertEqual(['((1/2, 1/2), (1/2, 1/2))',
+            'Input text does not contain two valid matrices.',
+            '((6/13, 3/13, 4/13), (1/9, 1/3, 5/9))'],
+            [line[3] for line in lines])
+        for line in lines:
+            self.assertTrue(float(line[2]) >= 0)
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
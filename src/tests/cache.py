@@ -0,0 +1,190 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+
+from .. import cache
+from .. import games
+from .. import lh
+from .. import matrix
+from .. import numfields
+
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+# The first game with payoffs decreased by 3 (both games are shifted
+# to the same game)
+EX2_M1 = matrix.fromText('-1 -3\n-3 -1\n')
+EX2_M2 = matrix.fromText('-3 -1\n-1 -3\n')
+# The first game with payoffs increased by 10
+EX4_M1 = matrix.fromText('12 10\n10 12\n')
+EX4_M2 = matrix.fromText('10 12\n12 10\n')
+EX3_M1 = matrix.fromText('1 3 0\n0 0 2\n2 1 1\n')
+EX3_M2 = matrix.fromText('2 1 0\n1 3 1\n0 0 3\n')
+
+
+def permuteGame(m1, m2, rowOrder, colOrder):
+    """Returns the selected game with rows and columns in the selected
+    order (lists of zero-based indices)."""
+    return tuple([matrix.Matrix(len(rowOrder), len(colOrder),
+        [m.getItem(i + 1, j + 1) for i in rowOrder for j in colOrder])
+        for m in (m1, m2)])
+
+
+class GetCanonicalOrderTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testPermutedGamesHaveSameCanonicalForm(self):
+        (m1, m2) = games.randomGame(5, 4, 100, seed=1)
+        (pm1, pm2) = permuteGame(m1, m2, [3, 0, 4, 2, 1], [2, 3, 1, 0])
+        self.assertEqual(
+            permuteGame(m1, m2, *cache.getCanonicalOrder(m1, m2)),
+            permuteGame(pm1, pm2, *cache.getCanonicalOrder(pm1, pm2)))
+
+
+class SolutionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def testRepeatedGameIsAnsweredFromCache(self):
+        c = cache.SolutionCache()
+        self.assertEqual(lh.lemkeHowson(EX3_M1, EX3_M2),
+            c.lemkeHowson(EX3_M1, EX3_M2))
+        self.assertEqual(lh.lemkeHowson(EX3_M1, EX3_M2),
+            c.lemkeHowson(EX3_M1, EX3_M2))
+        self.assertEqual((1, 1), (c.hits, c.misses))
+
+    def testGamesShiftedToSameGameShareEntry(self):
+        c = cache.SolutionCache()
+        c.lemkeHowson(EX1_M1, EX1_M2)
+        self.assertEqual(lh.lemkeHowson(EX2_M1, EX2_M2),
+            c.lemkeHowson(EX2_M1, EX2_M2))
+        self.assertEqual(1, c.hits)
+
+    def testGameShiftedByPositiveConstantSharesEntry(self):
+        c = cache.SolutionCache()
+        c.lemkeHowson(EX2_M1, EX2_M2)
+        self.assertEqual(lh.lemkeHowson(EX4_M1, EX4_M2),
+            c.lemkeHowson(EX4_M1, EX4_M2))
+        (m1, m2) = games.randomGame(4, 5, 100, seed=3)
+        for backend in ('rational', 'integer'):
+            c.lemkeHowson(m1, m2, backend)
+            shifted = [matrix.Matrix(4, 5, [x + 7 for x in m.getItems()])
+                for m in (m1, m2)]
+            self.assertEqual(lh.lemkeHowson(m1, m2, backend),
+                c.lemkeHowson(shifted[0], shifted[1], backend))
+        self.assertEqual((3, 3), (c.hits, c.misses))
+
+    def testFieldNameAndFieldObjectShareEntry(self):
+        c = cache.SolutionCache()
+        c.lemkeHowson(EX3_M1, EX3_M2, field='rational')
+        c.lemkeHowson(EX3_M1, EX3_M2, field=numfields.RationalField())
+        c.lemkeHowson(EX3_M1, EX3_M2)
+        self.assertEqual((2, 1), (c.hits, c.misses))
+
+    def testDifferentLabelsAndBackendsHaveDifferentEntries(self):
+        c = cache.SolutionCache()
+        c.lemkeHowson(EX3_M1, EX3_M2, initBasisVar=1)
+        c.lemkeHowson(EX3_M1, EX3_M2, initBasisVar=2)
+        c.lemkeHowson(EX3_M1, EX3_M2, 'integer', initBasisVar=2)
+        self.assertEqual((0, 3), (c.hits, c.misses))
+
+    def testPermutedGameIsNotRecognizedByDefault(self):
+        c = cache.SolutionCache()
+        c.lemkeHowson(EX3_M1, EX3_M2)
+        c.lemkeHowson(*permuteGame(EX3_M1, EX3_M2, [2, 0, 1], [1, 2, 0]))
+        self.assertEqual(0, c.hits)
+
+    def testPermutedGameIsAnsweredFromCacheWhenCanonicalized(self):
+        (m1, m2) = games.randomGame(5, 4, 100, seed=2)
+        (rowOrder, colOrder) = ([3, 0, 4, 2, 1], [2, 3, 1, 0])
+        (pm1, pm2) = permuteGame(m1, m2, rowOrder, colOrder)
+        c = cache.SolutionCache(canonicalizePermutations=True)
+        for label in xrange(1, 10):
+            c.lemkeHowson(m1, m2, initBasisVar=label)
+        for label in xrange(1, 10):
+            self.assertEqual(lh.lemkeHowson(pm1, pm2, initBasisVar=label),
+                c.lemkeHowson(pm1, pm2, initBasisVar=label))
+        self.assertEqual((9, 9), (c.hits, c.misses))
+
+    def testLeastRecentlyUsedEntryIsEvicted(self):
+        c = cache.SolutionCache()
+        c.lemkeHowson(EX1_M1, EX1_M2)
+        entrySize = c.size
+        # Two entries of the size of the first one fit into the cache
+        c = cache.SolutionCache(maxBytes=2 * entrySize + 1)
+        c.lemkeHowson(EX1_M1, EX1_M2, initBasisVar=1)
+        c.lemkeHowson(EX1_M1, EX1_M2, initBasisVar=2)
+        c.lemkeHowson(EX1_M1, EX1_M2, initBasisVar=1)
+        c.lemkeHowson(EX1_M1, EX1_M2, initBasisVar=3)
+        self.assertEqual(2, len(c))
+        self.assertTrue(c.size <= 2 * entrySize + 1)
+        c.lemkeHowson(EX1_M1, EX1_M2, initBasisVar=1)
+        self.assertEqual(2, c.hits)
+        c.lemkeHowson(EX1_M1, EX1_M2, initBasisVar=2)
+        self.assertEqual(4, c.misses)
+
+    def testEntryLargerThanMaximalSizeIsNotKeptInMemory(self):
+        c = cache.SolutionCache(maxBytes=10)
+        c.lemkeHowson(EX1_M1, EX1_M2)
+        c.lemkeHowson(EX1_M1, EX1_M2)
+        self.assertEqual((0, 0, 2), (len(c), c.size, c.misses))
+
+    def testEntriesAreKeptInFile(self):
+        fileName = os.path.join(self.dir, 'cache')
+        c = cache.SolutionCache(fileName=fileName)
+        c.lemkeHowson(EX3_M1, EX3_M2)
+        c.close()
+        c = cache.SolutionCache(fileName=fileName)
+        self.assertEqual(lh.lemkeHowson(EX3_M1, EX3_M2),
+            c.lemkeHowson(EX3_M1, EX3_M2))
+        c.lemkeHowson(EX3_M1, EX3_M2)
+        c.close()
+        self.assertEqual((1, 1, 0), (c.diskHits, c.hits, c.misses))
+
+    def testClearRemovesEntriesFromMemory(self):
+        c = cache.SolutionCache()
+        c.lemkeHowson(EX1_M1, EX1_M2)
+        c.clear()
+        self.assertEqual((0, 0), (len(c), c.size))
+        c.lemkeHowson(EX1_M1, EX1_M2)
+        self.assertEqual(2, c.misses)
+
+    def testValueErrorRaisedWhenInitialBasisVariableIsInvalid(self):
+        c = cache.SolutionCache()
+        self.assertRaises(ValueError, c.lemkeHowson, EX1_M1, EX1_M2,
+            initBasisVar=5)
+
+    def testValueErrorRaisedWhenMatricesHaveDifferentDimensions(self):
+        c = cache.SolutionCache()
+        self.assertRaises(ValueError, c.lemkeHowson,
+            matrix.fromText('1\n2\n'), matrix.fromText('1\n'))
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,135 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import Queue
+import threading
+import unittest
+import sys
+
+from .. import executor
+from .. import games
+from .. import lh
+from .. import matrix
+from .. import pathlimits
+
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+# A game with a path that takes several seconds to follow
+LONG_M1, LONG_M2 = games.savaniVonStengelGame(14)
+
+
+class SolverExecutorTests(unittest.TestCase):
+    def setUp(self):
+        self.executors = []
+
+    def tearDown(self):
+        for e in self.executors:
+            e.shutdown()
+
+    def createExecutor(self, *args, **kwargs):
+        e = executor.SolverExecutor(*args, **kwargs)
+        self.executors.append(e)
+        return e
+
+    def testGamesAreSolvedByThreadsAndProcesses(self):
+        gameList = [games.randomGame(4, 4, 10, seed=seed)
+            for seed in xrange(0, 6)]
+        expResults = [lh.lemkeHowson(m1, m2, initBasisVar=3)
+            for (m1, m2) in gameList]
+        for kind in executor.EXECUTOR_KINDS:
+            e = self.createExecutor(kind, workers=2)
+            futures = [e.submit(m1, m2, 3) for (m1, m2) in gameList]
+            self.assertEqual(expResults, [f.result() for f in futures])
+
+    def testDoneCallbackIsCalledWithFuture(self):
+        e = self.createExecutor()
+        called = threading.Event()
+        results = []
+        def callback(future):
+            results.append(future.result())
+            called.set()
+        e.submit(EX1_M1, EX1_M2).addDoneCallback(callback)
+        called.wait(10)
+        self.assertEqual([lh.lemkeHowson(EX1_M1, EX1_M2)], results)
+
+    def testExceptionsAreRaisedByResult(self):
+        for kind in executor.EXECUTOR_KINDS:
+            e = self.createExecutor(kind)
+            future = e.submit(EX1_M1, EX1_M2, 5)
+            self.assertRaises(ValueError, future.result)
+            self.assertTrue(isinstance(future.exception(), ValueError))
+
+    def testLimitsAreAppliedToEveryGame(self):
+        for kind in executor.EXECUTOR_KINDS:
+            e = self.createExecutor(kind)
+            limits = pathlimits.PathLimits(maxPivots=5)
+            future = e.submit(LONG_M1, LONG_M2, limits=limits)
+            self.assertRaises(pathlimits.PivotLimitExceededError,
+                future.result)
+
+    def testRunningGameIsStoppedWhenCancelled(self):
+        for kind in executor.EXECUTOR_KINDS:
+            e = self.createExecutor(kind, workers=1)
+            future = e.submit(LONG_M1, LONG_M2)
+            self.assertRaises(executor.TimeoutError, future.result, 0.2)
+            self.assertTrue(future.cancel())
+            self.assertTrue(future.cancelled() and future.done())
+            self.assertRaises(executor.CancelledError, future.result)
+            # The only worker is free again long before the path would end
+            self.assertEqual(lh.lemkeHowson(EX1_M1, EX1_M2),
+                e.submit(EX1_M1, EX1_M2).result(1.5))
+
+    def testQueuedGameIsNotSolvedWhenCancelled(self):
+        for kind in executor.EXECUTOR_KINDS:
+            e = self.createExecutor(kind, workers=1)
+            running = e.submit(LONG_M1, LONG_M2)
+            queued = e.submit(LONG_M1, LONG_M2)
+            queued.cancel()
+            running.cancel()
+            self.assertEqual(lh.lemkeHowson(EX1_M1, EX1_M2),
+                e.submit(EX1_M1, EX1_M2).result(1.5))
+
+    def testSubmitRaisesFullWhenTooManyGamesAreUnfinished(self):
+        for kind in executor.EXECUTOR_KINDS:
+            e = self.createExecutor(kind, workers=1, maxQueued=1)
+            futures = [e.submit(LONG_M1, LONG_M2) for i in xrange(0, 2)]
+            self.assertRaises(Queue.Full, e.submit, EX1_M1, EX1_M2,
+                block=False)
+            for future in futures:
+                future.cancel()
+            self.assertEqual(lh.lemkeHowson(EX1_M1, EX1_M2),
+                e.submit(EX1_M1, EX1_M2).result(1.5))
+
+    def testSolvedGameCannotBeCancelled(self):
+        e = self.createExecutor()
+        future = e.submit(EX1_M1, EX1_M2)
+        future.result()
+        self.assertFalse(future.cancel())
+        self.assertFalse(future.cancelled())
+
+    def testValueErrorRaisedWhenGameIsSubmittedAfterShutdown(self):
+        e = self.createExecutor()
+        e.shutdown()
+        self.assertRaises(ValueError, e.submit, EX1_M1, EX1_M2)
+
+    def testValueErrorRaisedWhenKindIsInvalid(self):
+        self.assertRaises(ValueError, executor.SolverExecutor, 'fiber')
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
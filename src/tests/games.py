@@ -0,0 +1,103 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import unittest
+import sys
+
+from .. import games
+from .. import lh
+from .. import pivotstats
+
+
+class RandomGameTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testGameHasSelectedDimensions(self):
+        (m1, m2) = games.randomGame(3, 5, seed=1)
+        for m in (m1, m2):
+            self.assertEqual(3, m.getNumRows())
+            self.assertEqual(5, m.getNumCols())
+
+    def testPayoffsAreInSelectedRange(self):
+        (m1, m2) = games.randomGame(4, 4, maxPayoff=2, seed=1)
+        for m in (m1, m2):
+            for i in xrange(1, 5):
+                for item in m.getRow(i):
+                    self.assertTrue(0 <= item <= 2)
+
+    def testSameSeedGivesSameGame(self):
+        self.assertEqual(games.randomGame(4, 3, seed=7),
+            games.randomGame(4, 3, seed=7))
+
+    def testValueErrorIsRaisedOnInvalidNumberOfStrategies(self):
+        self.assertRaises(ValueError, games.randomGame, 0, 3)
+
+
+class CoordinationGameTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testAllLabelsFindPureEquilibria(self):
+        (m1, m2) = games.coordinationGame(3)
+        eqs = lh.lemkeHowsonAllLabels(m1, m2, 'integer')
+        self.assertEqual(3, len(eqs))
+
+    def testValueErrorIsRaisedOnInvalidNumberOfStrategies(self):
+        self.assertRaises(ValueError, games.coordinationGame, 0)
+
+
+class SavaniVonStengelGameTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def getPathLengths(self, d):
+        (m1, m2) = games.savaniVonStengelGame(d)
+        lengths = []
+        for label in xrange(1, 2 * d + 1):
+            stats = pivotstats.PivotStats()
+            lh.lemkeHowson(m1, m2, 'integer', initBasisVar=label, stats=stats)
+            lengths.append(stats.getPivotCount())
+        return lengths
+
+    def testPathLengthsOfGame4x4(self):
+        self.assertEqual([12, 8, 8, 12, 12, 8, 8, 12], self.getPathLengths(4))
+
+    def testShortestPathGrowsWithSize(self):
+        self.assertEqual(16, min(self.getPathLengths(6)))
+        self.assertEqual(24, min(self.getPathLengths(8)))
+
+    def testRationalBackendFindsSameEquilibrium(self):
+        (m1, m2) = games.savaniVonStengelGame(6)
+        self.assertEqual(lh.lemkeHowson(m1, m2, 'integer'),
+            lh.lemkeHowson(m1, m2, 'rational'))
+
+    def testValueErrorIsRaisedOnOddNumberOfStrategies(self):
+        self.assertRaises(ValueError, games.savaniVonStengelGame, 5)
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,172 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import unittest
+import sys
+
+from .. import games
+from .. import incremental
+from .. import lh
+from .. import matrix
+from .. import rational as r
+
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+EX2_M1 = matrix.fromText('1 3 0\n0 0 2\n2 1 1\n')
+EX2_M2 = matrix.fromText('2 1 0\n1 3 1\n0 0 3\n')
+# A game with two pure equilibria
+EX3_M1 = matrix.fromText('2 0\n0 1\n')
+EX3_M2 = matrix.fromText('2 0\n0 1\n')
+# A game with fractional payoffs and a single (mixed) equilibrium
+EX4_M1 = matrix.fromText('1/2 0\n0 1/4\n', r.fromText)
+EX4_M2 = matrix.fromText('0 1/2\n3/4 0\n', r.fromText)
+
+
+def fractionalRandomGame(rows, cols, seed):
+    """Returns a random game whose payoffs are fractions with denominators
+    2, 3 and 4."""
+    (m1, m2) = games.randomGame(rows, cols, 20, seed=seed)
+    return tuple([matrix.Matrix(rows, cols,
+        [r.Rational(x, k % 3 + 2) for (k, x) in enumerate(m.getItems())])
+        for m in (m1, m2)])
+
+
+class IncrementalSolverTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioUpdateFindsSameEquilibriumAsWarmStart(self, solver, update):
+        basis = solver.getBasis()
+        update(solver)
+        (eq, newBasis) = lh.lemkeHowsonFromBasis(solver.m1, solver.m2, basis,
+            'rational')
+        self.assertEqual(eq, solver.getEquilibrium())
+
+    def testInitialEquilibriumIsSameAsFromLemkeHowson(self):
+        solver = incremental.IncrementalSolver(EX2_M1, EX2_M2, 2)
+        self.assertEqual(lh.lemkeHowson(EX2_M1, EX2_M2, initBasisVar=2),
+            solver.getEquilibrium())
+
+    def testSelectedMatricesAreNotChanged(self):
+        m1 = EX1_M1.copy()
+        solver = incremental.IncrementalSolver(m1, EX1_M2)
+        solver.setPayoff(1, 1, 1, 3)
+        self.assertEqual(EX1_M1, m1)
+        self.assertEqual(matrix.fromText('3 0\n0 2\n'), solver.m1)
+
+    def testFeasibleBasisIsKeptAfterPayoffChange(self):
+        solver = incremental.IncrementalSolver(EX1_M1, EX1_M2)
+        basis = solver.getBasis()
+        solver.setPayoff(1, 1, 1, 3)
+        expEq = ((r.Rational(1, 2), r.Rational(1, 2)),
+                 (r.Rational(2, 5), r.Rational(3, 5)))
+        self.assertEqual(expEq, solver.getEquilibrium())
+        self.assertEqual(basis, solver.getBasis())
+        self.assertEqual(0, solver.resolves)
+
+    def testGameIsSolvedFromScratchWhenBasisBecomesInfeasible(self):
+        solver = incremental.IncrementalSolver(EX3_M1, EX3_M2, 2)
+        solver.setPayoff(2, 2, 1, 2)
+        m2 = matrix.fromText('2 0\n2 1\n')
+        self.assertEqual(lh.lemkeHowson(EX3_M1, m2, initBasisVar=2),
+            solver.getEquilibrium())
+        self.assertEqual(1, solver.resolves)
+
+    def testGameIsSolvedFromScratchWhenPayoffIsNotPositive(self):
+        solver = incremental.IncrementalSolver(EX1_M1, EX1_M2)
+        solver.setPayoff(1, 2, 1, -1)
+        m1 = matrix.fromText('2 0\n-1 2\n')
+        self.assertEqual(lh.lemkeHowson(m1, EX1_M2), solver.getEquilibrium())
+        self.assertEqual(1, solver.resolves)
+
+    def testPayoffChangesOfBothPlayersGiveSameEquilibriaAsWarmStart(self):
+        (m1, m2) = games.randomGame(5, 4, 20, seed=1)
+        solver = incremental.IncrementalSolver(m1, m2)
+        for (i, j, value) in [(1, 1, 7), (3, 2, 15), (5, 4, 1), (2, 3, 20)]:
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoff(1, i, j, value))
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoff(2, i, j, value))
+        self.assertEqual(8, solver.updates)
+
+    def testRowChangesGiveSameEquilibriaAsWarmStart(self):
+        (m1, m2) = games.randomGame(4, 5, 20, seed=2)
+        solver = incremental.IncrementalSolver(m1, m2)
+        for (i, values) in [(1, [3, 9, 1, 4, 4]), (4, [20, 1, 1, 8, 2])]:
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoffRow(1, i, values))
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoffRow(2, i, values))
+
+    def testColumnChangesGiveSameEquilibriaAsWarmStart(self):
+        (m1, m2) = games.randomGame(4, 5, 20, seed=3)
+        solver = incremental.IncrementalSolver(m1, m2)
+        for (j, values) in [(2, [3, 9, 1, 4]), (5, [20, 1, 1, 8])]:
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoffCol(1, j, values))
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoffCol(2, j, values))
+
+    def testFractionalPayoffChangesGiveSameEquilibriumAsLemkeHowson(self):
+        solver = incremental.IncrementalSolver(EX4_M1, EX4_M2)
+        solver.setPayoff(1, 1, 1, r.Rational(3, 4))
+        solver.setPayoff(2, 2, 1, r.Rational(1, 4))
+        self.assertEqual(lh.lemkeHowson(solver.m1, solver.m2),
+            solver.getEquilibrium())
+        self.assertEqual(0, solver.resolves)
+        # A new denominator changes the scale of payoffs of the player
+        solver.setPayoff(1, 2, 2, r.Rational(1, 3))
+        self.assertEqual(lh.lemkeHowson(solver.m1, solver.m2),
+            solver.getEquilibrium())
+        self.assertEqual(1, solver.resolves)
+
+    def testFractionalPayoffChangesGiveSameEquilibriaAsWarmStart(self):
+        (m1, m2) = fractionalRandomGame(4, 5, seed=4)
+        solver = incremental.IncrementalSolver(m1, m2)
+        for (i, j, value) in [(1, 1, r.Rational(7, 4)), (3, 2, 5),
+                (4, 5, r.Rational(1, 12)), (2, 3, r.Rational(9, 2))]:
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoff(1, i, j, value))
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoff(2, i, j, value))
+        for (i, values) in [(2, [r.Rational(x, 4) for x in (3, 9, 1, 4, 6)]),
+                (4, [r.Rational(x, 3) for x in (20, 1, 2, 8, 2)])]:
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoffRow(1, i, values))
+            self.scenarioUpdateFindsSameEquilibriumAsWarmStart(solver,
+                lambda s: s.setPayoffCol(2, i, values[:4]))
+
+    def testValueErrorRaisedWhenPlayerIsInvalid(self):
+        solver = incremental.IncrementalSolver(EX1_M1, EX1_M2)
+        self.assertRaises(ValueError, solver.setPayoff, 3, 1, 1, 1)
+
+    def testIndexErrorRaisedWhenNumberOfValuesIsInvalid(self):
+        solver = incremental.IncrementalSolver(EX1_M1, EX1_M2)
+        self.assertRaises(IndexError, solver.setPayoffRow, 1, 1, [1, 2, 3])
+        self.assertRaises(IndexError, solver.setPayoffCol, 2, 1, [1])
+
+    def testValueErrorRaisedWhenMatricesHaveDifferentDimensions(self):
+        self.assertRaises(ValueError, incremental.IncrementalSolver,
+            matrix.fromText('1\n2\n'), matrix.fromText('1\n'))
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,154 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import os
+import unittest
+import sys
+
+from .. import intlh
+from .. import io
+from .. import lh
+from .. import matrix
+
+
+SAMPLE_GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', 'sample-games')
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+EX2_M1 = matrix.fromText('1 3 0\n0 0 2\n2 1 1\n')
+EX2_M2 = matrix.fromText('2 1 0\n1 3 1\n0 0 3\n')
+EX3_M1 = matrix.fromText('124 170 197\n146 253 114\n267 110 262\n')
+EX3_M2 = matrix.fromText('270 194 100\n148 161 175\n163 260 268\n')
+EX4_M1 = matrix.fromText('3 6 7\n3 8 9\n5 5 0\n')
+EX4_M2 = matrix.fromText('2 7 8\n4 4 1\n6 2 3\n')
+
+
+class CreateTableauxTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testEx1InitializesCorrectly(self):
+        t = intlh.createTableaux(EX1_M1, EX1_M2)
+        expT = matrix.fromText('-1 1 1 0 2 0\n' +\
+                               '-2 1 0 1 0 2\n' +\
+                               '-3 1 0 2 1 0\n' +\
+                               '-4 1 2 0 0 1\n')
+        self.assertEqual(expT, t.m)
+        self.assertEqual([1, 1], t.dets)
+
+    def testFilledTableauxIsSameAsTableauxOfShiftedMatrices(self):
+        t = intlh.createTableaux(EX2_M1, EX2_M2)
+        intlh.makePivotingStep(t, 3, 1)
+        intlh.fillTableaux(t, EX2_M1, EX2_M2, 1)
+        expT = intlh.createTableaux(*lh.normalizeMatrices(EX2_M1, EX2_M2))
+        self.assertEqual(expT.m, t.m)
+        self.assertEqual(expT.dets, t.dets)
+
+    def testTableauxWithConstantIsSameAsTableauxOfShiftedMatrices(self):
+        m1 = matrix.fromText('1 -2\n0 3\n4 1\n')
+        m2 = matrix.fromText('2 0\n-1 1\n3 3\n')
+        self.assertEqual(intlh.createTableaux(*lh.normalizeMatrices(m1,
+            m2)).m, intlh.createTableaux(m1, m2, 3).m)
+
+    def testValueErrorIsRaisedWhenMatricesHaveDifferentNumberOfRows(self):
+        try:
+            intlh.createTableaux(matrix.Matrix(3, 4), matrix.Matrix(2, 4))
+        except ValueError:
+            pass
+        else:
+            self.fail('ValueError should have been thrown.')
+
+
+class MakePivotingStepTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testEx1MakeFirstPivotingStep(self):
+        t = intlh.createTableaux(EX1_M1, EX1_M2)
+        lb = intlh.makePivotingStep(t, EX1_M1.getNumRows(), 1)
+        expT = matrix.fromText('-1 1 1 0 2 0\n' +\
+                               '-2 1 0 1 0 2\n' +\
+                               '-3 2 0 4 2 0\n' +\
+                               ' 1 1 2 0 0 1\n')
+        self.assertEqual(-4, lb)
+        self.assertEqual(expT, t.m)
+        self.assertEqual([1, 2], t.dets)
+
+    def testItemsStayIntegersAfterPivotingSteps(self):
+        t = intlh.createTableaux(EX2_M1, EX2_M2)
+        p1SCount = EX2_M1.getNumRows()
+        lb = intlh.makePivotingStep(t, p1SCount, 1)
+        lb = intlh.makePivotingStep(t, p1SCount, -lb)
+        lb = intlh.makePivotingStep(t, p1SCount, -lb)
+        for i in xrange(1, t.m.getNumRows() + 1):
+            for item in t.m.getRow(i):
+                self.assertTrue(isinstance(item, (int, long)))
+
+    def testValueErrorIsRaisedOnInvalidVariable(self):
+        t = intlh.createTableaux(EX1_M1, EX1_M2)
+        try:
+            intlh.makePivotingStep(t, EX1_M1.getNumRows(), 5)
+        except ValueError:
+            pass
+        else:
+            self.fail('ValueError should have been thrown.')
+
+
+class LemkeHowsonTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioBothBackendsFindSameEquilibrium(self, m1, m2):
+        expEq = lh.lemkeHowson(m1, m2)
+        eq = lh.lemkeHowson(m1, m2, backend='integer')
+        self.assertEqual(expEq, eq)
+        self.assertEqual(repr(expEq), repr(eq))
+
+    def testEx1BothBackendsFindSameEquilibrium(self):
+        self.scenarioBothBackendsFindSameEquilibrium(EX1_M1, EX1_M2)
+
+    def testEx2BothBackendsFindSameEquilibrium(self):
+        self.scenarioBothBackendsFindSameEquilibrium(EX2_M1, EX2_M2)
+
+    def testEx3BothBackendsFindSameEquilibrium(self):
+        self.scenarioBothBackendsFindSameEquilibrium(EX3_M1, EX3_M2)
+
+    def testEx4BothBackendsFindSameEquilibrium(self):
+        self.scenarioBothBackendsFindSameEquilibrium(EX4_M1, EX4_M2)
+
+    def testBothBackendsFindSameEquilibriumOnSampleGames(self):
+        for fileName in sorted(os.listdir(SAMPLE_GAMES_DIR)):
+            f = open(os.path.join(SAMPLE_GAMES_DIR, fileName))
+            try:
+                m1, m2 = io.parseInputMatrices(f.read())
+            finally:
+                f.close()
+            self.scenarioBothBackendsFindSameEquilibrium(m1, m2)
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
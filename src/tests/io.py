@@ -4,11 +4,13 @@
 # Author:  Petr Zemek <s3rvac@gmail.com>, 2009
 #
 
+import StringIO
 import unittest
 import sys
 import tempfile
 
 from .. import io
+from .. import lh
 from .. import matrix as m
 from .. import rational as r
 
@@ -43,6 +45,32 @@ class ParseInputMatricesTests(unittest.TestCase):
         expM2 = m.fromText('9 8 7\n6 5 4\n3 2 1\n')
         self.scenarioValidMatricesAreParsedCorrectly(text, expM1, expM2)
 
+    def testMatrixWithDecimalPayoffsIsParsedExactly(self):
+        text = '0.35 1\n-0.5 2e-1\n\n1 2\n3 4\n'
+        expM1 = m.Matrix(2, 2,
+            [r.Rational(7, 20), 1, r.Rational(-1, 2), r.Rational(1, 5)])
+        expM2 = m.fromText('1 2\n3 4\n')
+        self.scenarioValidMatricesAreParsedCorrectly(text, expM1, expM2)
+
+    def testMatrixWithFractionPayoffsIsParsedExactly(self):
+        text = '1 2\n3 4\n\n1/2 2/3\n-1/4 1\n'
+        expM1 = m.fromText('1 2\n3 4\n')
+        expM2 = m.Matrix(2, 2,
+            [r.Rational(1, 2), r.Rational(2, 3), r.Rational(-1, 4), 1])
+        self.scenarioValidMatricesAreParsedCorrectly(text, expM1, expM2)
+
+    def testIntegralPayoffsOfFractionalMatrixAreIntegers(self):
+        (m1, m2) = io.parseInputMatrices('0.5 2\n1.0 3\n\n1 2\n3 4\n')
+        self.assertEqual([r.Rational(1, 2), 2, 1, 3], list(m1.getItems()))
+        self.assertTrue(isinstance(m1.getItems()[1], int))
+        self.assertTrue(isinstance(m1.getItems()[2], int))
+
+    def testParsedGameHasSameEquilibriumInAllExactBackends(self):
+        (m1, m2) = io.parseInputMatrices('0.5 0.25\n0.1 1\n\n1 0.2\n0 3\n')
+        expEq = lh.lemkeHowson(m1, m2)
+        for backend in ('integer', 'sparse'):
+            self.assertEqual(expEq, lh.lemkeHowson(m1, m2, backend=backend))
+
     def scenarioValueErrorIsRaisedOnInvalidText(self, text):
         try:
             io.parseInputMatrices(text)
@@ -66,12 +94,24 @@ class ParseInputMatricesTests(unittest.TestCase):
     def testValueErrorIsRaisedOnMissingSecondMatrix(self):
         self.scenarioValueErrorIsRaisedOnInvalidText('1\n\n')
 
+    def testValueErrorIsRaisedOnZeroDenominator(self):
+        self.scenarioValueErrorIsRaisedOnInvalidText('1/0\n\n1\n')
+
     def testValueErrorIsRaisedOnMissingExtraNewLine(self):
         self.scenarioValueErrorIsRaisedOnInvalidText('1\n1\n')
 
     def testValueErrorIsRaisedOnRedundantCharactes(self):
         self.scenarioValueErrorIsRaisedOnInvalidText('1\n\n1\n\nfgh\n\n')
 
+    def testValueErrorIsRaisedOnTwoEmptyLinesBetweenMatrices(self):
+        self.scenarioValueErrorIsRaisedOnInvalidText('1\n\n\n1\n')
+
+    def testValueErrorIsRaisedOnEmptyLineAtTheBeginning(self):
+        self.scenarioValueErrorIsRaisedOnInvalidText('\n1\n\n1\n')
+
+    def testValueErrorIsRaisedOnMissingColumn(self):
+        self.scenarioValueErrorIsRaisedOnInvalidText('1 2\n3\n\n1 2\n3 4\n')
+
     def testValueErrorIsRaisedOnDifferentNumberOfRows(self):
         self.scenarioValueErrorIsRaisedOnInvalidText('1 2\n3 4\n5 6\n\n4 5\n6 7\n')
 
@@ -79,6 +119,214 @@ class ParseInputMatricesTests(unittest.TestCase):
         self.scenarioValueErrorIsRaisedOnInvalidText('1 2 3\n4 5 6\n\n4 5\n6 7\n')
 
 
+class ReadInputMatricesTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testMatricesAreReadFromStream(self):
+        stream = StringIO.StringIO('1 2\n3 4\n\n5 6\n7 8\n')
+        m1, m2 = io.readInputMatrices(stream)
+        self.assertEqual('1 2\n3 4\n', repr(m1))
+        self.assertEqual('5 6\n7 8\n', repr(m2))
+
+    def testValueErrorIsRaisedOnInvalidStream(self):
+        stream = StringIO.StringIO('1 2\n3 4\n\n5 6\n')
+        try:
+            io.readInputMatrices(stream)
+        except ValueError, e:
+            self.assertEqual('Input text contains two matrices with ' +\
+                'different number of rows or columns.', str(e))
+        else:
+            self.fail('ValueError should have been thrown.')
+
+
+class IterInputGamesTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioGamesAreYielded(self, text, expGames):
+        games = io.iterInputGames(StringIO.StringIO(text))
+        self.assertEqual(expGames,
+            [(repr(m1), repr(m2)) for (m1, m2) in games])
+
+    def testSingleGameIsYielded(self):
+        self.scenarioGamesAreYielded('1 2\n\n3 4\n', [('1 2\n', '3 4\n')])
+
+    def testGamesAreSplitOnSeparatorLines(self):
+        text = '1\n\n2\n---\n3\n\n4\n\n  ---  \n5\n\n6'
+        self.scenarioGamesAreYielded(text,
+            [('1\n', '2\n'), ('3\n', '4\n'), ('5\n', '6\n')])
+
+    def testEmptyGamesAndEmptyLinesBeforeGamesAreOmitted(self):
+        text = '---\n\n1\n\n2\n---\n\n---\n'
+        self.scenarioGamesAreYielded(text, [('1\n', '2\n')])
+
+    def testGamesAreYieldedOneAtATime(self):
+        stream = StringIO.StringIO('1\n\n2\n---\n3\n\n4\n')
+        games = io.iterInputGames(stream)
+        (m1, m2) = games.next()
+        self.assertEqual('2\n', repr(m2))
+        self.assertEqual('3\n', stream.readline())
+
+    def testValueErrorIsRaisedOnInvalidGame(self):
+        games = io.iterInputGames(StringIO.StringIO('1\n\n2\n---\n3\n'))
+        games.next()
+        try:
+            games.next()
+        except ValueError, e:
+            self.assertEqual('Input text does not contain two valid matrices.',
+                str(e))
+        else:
+            self.fail('ValueError should have been thrown.')
+
+    def testInvalidGamesAreYieldedAsErrorsWhenRequested(self):
+        text = '1 2\n\n3\n---\nx\n\n1\n---\n1\n\n2\n'
+        games = list(io.iterInputGames(StringIO.StringIO(text),
+            yieldErrors=True))
+        self.assertEqual(3, len(games))
+        self.assertTrue(isinstance(games[0], ValueError))
+        self.assertEqual('Input text contains two matrices with different ' +\
+            'number of rows or columns.', str(games[0]))
+        self.assertTrue(isinstance(games[1], ValueError))
+        self.assertEqual('Input text does not contain two valid matrices.',
+            str(games[1]))
+        self.assertEqual('1\n', repr(games[2][0]))
+
+
+class BinaryGameFileTests(unittest.TestCase):
+    def setUp(self):
+        self.m1 = m.fromText('1 3 0\n0 0 2\n2 1 1\n')
+        self.m2 = m.fromText('2 1 0\n1 3 1\n0 0 3\n')
+        self.files = []
+
+    def tearDown(self):
+        for f in self.files:
+            f.close()
+
+    def writeGame(self, m1, m2, itemType='int64'):
+        f = tempfile.NamedTemporaryFile()
+        self.files.append(f)
+        io.writeBinaryGame(m1, m2, f, itemType)
+        f.flush()
+        return f.name
+
+    def writeText(self, text):
+        f = tempfile.NamedTemporaryFile()
+        self.files.append(f)
+        f.write(text)
+        f.flush()
+        return f.name
+
+    def scenarioGameIsReadAsWritten(self, m1, m2, itemType):
+        readM1, readM2 = io.readBinaryGame(self.writeGame(m1, m2, itemType))
+        self.assertEqual(m1, readM1)
+        self.assertEqual(m2, readM2)
+
+    def testInt64GameIsReadAsWritten(self):
+        self.scenarioGameIsReadAsWritten(self.m1, self.m2, 'int64')
+
+    def testFloat64GameIsReadAsWritten(self):
+        m1 = m.Matrix(1, 2, [0.5, -2.25])
+        m2 = m.Matrix(1, 2, [1e10, 3.0])
+        self.scenarioGameIsReadAsWritten(m1, m2, 'float64')
+
+    def testRationalGameIsReadAsWritten(self):
+        m1 = m.Matrix(1, 2, [r.Rational(1, 3), 2])
+        m2 = m.Matrix(1, 2, [r.Rational(-5, 7), 0])
+        self.scenarioGameIsReadAsWritten(m1, m2, 'rational')
+
+    def testMatricesReadFromBinaryGameFileAreReadOnly(self):
+        readM1, readM2 = io.readBinaryGame(self.writeGame(self.m1, self.m2))
+        self.assertRaises(TypeError, readM1.setItem, 1, 1, 5)
+
+    def testCopyOfReadMatrixCanBeChanged(self):
+        readM1, readM2 = io.readBinaryGame(self.writeGame(self.m1, self.m2))
+        copyM1 = readM1.copy()
+        copyM1.setItem(1, 1, 5)
+        self.assertEqual(5, copyM1.getItem(1, 1))
+        self.assertEqual(1, readM1.getItem(1, 1))
+
+    def testValueErrorIsRaisedWhenWritingInvalidItemType(self):
+        self.assertRaises(ValueError, self.writeGame, self.m1, self.m2,
+            'unknown')
+
+    def testValueErrorIsRaisedWhenItemCannotBeStored(self):
+        self.assertRaises(ValueError, self.writeGame, m.fromText('1\n'),
+            m.Matrix(1, 1, [2 ** 70]))
+
+    def testValueErrorIsRaisedOnTextFile(self):
+        self.assertRaises(ValueError, io.readBinaryGame,
+            self.writeText('1 2\n\n3 4\n'))
+
+    def testValueErrorIsRaisedOnTruncatedFile(self):
+        data = open(self.writeGame(self.m1, self.m2), 'rb').read()
+        self.assertRaises(ValueError, io.readBinaryGame,
+            self.writeText(data[:-1]))
+
+    def testBinaryGameFileIsDetected(self):
+        self.assertTrue(io.isBinaryGameFile(self.writeGame(self.m1, self.m2)))
+        self.assertFalse(io.isBinaryGameFile(self.writeText('1\n\n1\n')))
+
+    def testReadGameFileReadsBothFormats(self):
+        text = '1 3 0\n0 0 2\n2 1 1\n\n2 1 0\n1 3 1\n0 0 3\n'
+        for fileName in [self.writeText(text),
+                self.writeGame(self.m1, self.m2)]:
+            readM1, readM2 = io.readGameFile(fileName)
+            self.assertEqual(self.m1, readM1)
+            self.assertEqual(self.m2, readM2)
+
+    def testGameReadFromBinaryGameFileHasTheSameEquilibrium(self):
+        readM1, readM2 = io.readBinaryGame(self.writeGame(self.m1, self.m2))
+        self.assertEqual(lh.lemkeHowson(self.m1, self.m2),
+            lh.lemkeHowson(readM1, readM2))
+
+
+class JsonTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testGameIsCreatedFromJsonObject(self):
+        (m1, m2) = io.gameFromJson({'m1': [[0.35, 1], [-0.5, 0.2]],
+            'm2': [[1, 2], ['1/2', '3']]})
+        self.assertEqual(m.fromText('7/20 1\n-1/2 1/5\n', r.fromText), m1)
+        self.assertEqual(m.fromText('1 2\n1/2 3\n', r.fromText), m2)
+
+    def scenarioValueErrorIsRaisedOnInvalidObject(self, obj):
+        self.assertRaises(ValueError, io.gameFromJson, obj)
+
+    def testValueErrorIsRaisedOnInvalidObjects(self):
+        self.scenarioValueErrorIsRaisedOnInvalidObject([[1]])
+        self.scenarioValueErrorIsRaisedOnInvalidObject({'m1': [[1]]})
+        self.scenarioValueErrorIsRaisedOnInvalidObject({'m1': [],
+            'm2': []})
+        self.scenarioValueErrorIsRaisedOnInvalidObject({'m1': [[1, 2], [3]],
+            'm2': [[1, 2], [3, 4]]})
+        self.scenarioValueErrorIsRaisedOnInvalidObject({'m1': [[1]],
+            'm2': [[True]]})
+        self.scenarioValueErrorIsRaisedOnInvalidObject({'m1': [[1]],
+            'm2': [['1 2']]})
+        self.scenarioValueErrorIsRaisedOnInvalidObject({'m1': [[1]],
+            'm2': [[1, 2]]})
+
+    def testExactEquilibriumIsConvertedIntoStrings(self):
+        eq = ((r.Rational(1, 2), r.Rational(1, 2)), (r.Rational(1), 0))
+        self.assertEqual([['1/2', '1/2'], ['1', '0']],
+            io.equilibriumToJson(eq))
+
+    def testFloatsInEquilibriumAreKept(self):
+        self.assertEqual([[1.0], [0.25, 0.75]],
+            io.equilibriumToJson(((1.0,), (0.25, 0.75))))
+
+
 class PrintEquilibriumTests(unittest.TestCase):
     def setUp(self):
         pass
@@ -113,6 +361,40 @@ class PrintEquilibriumTests(unittest.TestCase):
         eq = ((r.Rational(0, 1),), (r.Rational(1, 2), r.Rational(1, 2)))
         self.scenarioEquilibriumIsPrintedCorrectly(eq, '((0), (1/2, 1/2))')
 
+    def testFractionsArePrintedInSameFormAsRationals(self):
+        import fractions
+        eq = ((fractions.Fraction(1),),
+              (fractions.Fraction(1, 2), fractions.Fraction(1, 2)))
+        self.scenarioEquilibriumIsPrintedCorrectly(eq, '((1), (1/2, 1/2))')
+
+    def testFloatsArePrintedByRepr(self):
+        eq = ((1.0,), (0.25, 0.75))
+        self.scenarioEquilibriumIsPrintedCorrectly(eq, '((1.0), (0.25, 0.75))')
+
+
+class PrintAllLabelsGameInfoTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testAllEquilibriaArePrintedWithTheirLabels(self):
+        class StreamStub(object):
+            def __init__(self):
+                self.data = ''
+            def write(self, data):
+                self.data += data
+        stream = StreamStub()
+        m1 = m.fromText('1 0\n0 1\n')
+        eqs = [(((r.Rational(1),), (r.Rational(1),)), [1, 3]),
+               (((r.Rational(1, 2),), (r.Rational(1, 2),)), [2])]
+        io.printAllLabelsGameInfo(m1, m1, eqs, stream)
+        expText = 'Player 1:\n1 0\n0 1\n\nPlayer 2:\n1 0\n0 1\n\n' +\
+                  'Found MNE: ((1), (1)) (labels: 1, 3)\n' +\
+                  'Found MNE: ((1/2), (1/2)) (labels: 2)\n'
+        self.assertEqual(expText, stream.data)
+
 
 def suite():
     """Returns a test suite that contains all tests from this module."""
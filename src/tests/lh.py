@@ -7,6 +7,7 @@
 import unittest
 import sys
 
+from .. import games
 from .. import lh
 from .. import matrix
 from .. import rational as r
@@ -33,6 +34,10 @@ EX9_M1 = matrix.fromText('4 7\n8 1\n')
 EX9_M2 = matrix.fromText('6 3\n2 9\n')
 EX10_M1 = matrix.fromText('3 5 6\n6 1 5\n')
 EX10_M2 = matrix.fromText('4 2 4\n2 4 1\n')
+# A degenerate game on which the path from the label 7 cycles when ties
+# in the min-ratio test are broken by choosing the first row
+EX11_M1 = matrix.fromText('0 0 2 2\n2 2 0 1\n3 0 1 3\n2 1 3 1\n')
+EX11_M2 = matrix.fromText('0 0 1 3\n2 0 0 2\n1 2 0 2\n1 3 0 1\n')
 
 # itemFromStrFunc for creating tableaux from text,
 # which creates rational numbers only from rational numbers
@@ -120,6 +125,15 @@ class CreateTableauxTests(unittest.TestCase):
                    '-5 1 -8 -10 -12  0  0\n'
         self.scenarioCreateCorrectTableaux(EX3_M1, EX3_M2, expTText)
 
+    def testTableauxWithConstantIsSameAsTableauxOfNormalizedMatrices(self):
+        self.assertEqual(lh.createTableaux(*lh.normalizeMatrices(EX4_M1,
+            EX4_M2)), lh.createTableaux(EX4_M1, EX4_M2, 2))
+
+    def testSplitTableauxWithConstantIsSameAsOfNormalizedMatrices(self):
+        t = lh.createSplitTableaux(EX4_M1, EX4_M2, cnst=2)
+        expT = lh.createSplitTableaux(*lh.normalizeMatrices(EX4_M1, EX4_M2))
+        self.assertEqual(expT.parts, t.parts)
+
     def scenarioValueErrorIsRaisedWhenMatricesDoNotHaveSameNumberOfRowsAndColumns(self, m1, m2):
         try:
             t = lh.createTableaux(m1, m2)
@@ -349,6 +363,79 @@ class MakePivotingStepTests(unittest.TestCase):
         self.scenarioValueErrorIsRaisedOnPreconditionViolation(t, t.getNumRows(), t.getNumRows() + 1)
 
 
+class SplitTableauxTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioSplitTableauxIsSameAsTableaux(self, m1, m2):
+        self.assertEqual(lh.createTableaux(m1, m2),
+            lh.splitTableauxToTableaux(lh.createSplitTableaux(m1, m2)))
+
+    def scenarioPivotingStepsAreSameAsInTableaux(self, m1, m2, initBasisVar):
+        p1SCount = m1.getNumRows()
+        t = lh.createTableaux(m1, m2)
+        splitT = lh.createSplitTableaux(m1, m2)
+        ebVar = initBasisVar
+        while True:
+            lbVar = lh.makeSplitPivotingStep(splitT, p1SCount, ebVar)
+            self.assertEqual(lh.makePivotingStep(t, p1SCount, ebVar), lbVar)
+            self.assertEqual(t, lh.splitTableauxToTableaux(splitT))
+            if abs(lbVar) == initBasisVar:
+                break
+            ebVar = -lbVar
+
+    def testEx1SplitTableauxIsSameAsTableaux(self):
+        self.scenarioSplitTableauxIsSameAsTableaux(EX1_M1, EX1_M2)
+
+    def testEx3SplitTableauxIsSameAsTableaux(self):
+        self.scenarioSplitTableauxIsSameAsTableaux(EX3_M1, EX3_M2)
+
+    def testEx3PartsHaveOnlyColumnsOfNonbasicVariables(self):
+        t = lh.createSplitTableaux(EX3_M1, EX3_M2)
+        self.assertEqual(3, t.parts[0].getNumRows())
+        self.assertEqual(4, t.parts[0].getNumCols())
+        self.assertEqual(2, t.parts[1].getNumRows())
+        self.assertEqual(5, t.parts[1].getNumCols())
+        self.assertEqual([[4, 5], [1, 2, 3]], t.nonbasis)
+
+    def testEx2PivotingStepsAreSameAsInTableaux(self):
+        for label in xrange(1, 7):
+            self.scenarioPivotingStepsAreSameAsInTableaux(EX2_M1, EX2_M2,
+                label)
+
+    def testEx3PivotingStepsAreSameAsInTableaux(self):
+        for label in xrange(1, 6):
+            self.scenarioPivotingStepsAreSameAsInTableaux(EX3_M1, EX3_M2,
+                label)
+
+    def testEx10PivotingStepsAreSameAsInTableaux(self):
+        for label in xrange(1, 6):
+            self.scenarioPivotingStepsAreSameAsInTableaux(EX10_M1, EX10_M2,
+                label)
+
+    def testCopyIsIndependentOfOriginal(self):
+        t = lh.createSplitTableaux(EX1_M1, EX1_M2)
+        copyT = t.copy()
+        lh.makeSplitPivotingStep(copyT, 2, 1)
+        self.assertEqual(lh.createTableaux(EX1_M1, EX1_M2),
+            lh.splitTableauxToTableaux(t))
+
+    def testValueErrorRaisedWhenEnteringVariableIsInvalid(self):
+        t = lh.createSplitTableaux(EX1_M1, EX1_M2)
+        self.assertRaises(ValueError, lh.makeSplitPivotingStep, t, 2, 5)
+
+    def testValueErrorRaisedWhenEnteringVariableIsInBasis(self):
+        t = lh.createSplitTableaux(EX1_M1, EX1_M2)
+        self.assertRaises(ValueError, lh.makeSplitPivotingStep, t, 2, -1)
+
+    def testValueErrorRaisedWhenMatricesHaveDifferentDimensions(self):
+        self.assertRaises(ValueError, lh.createSplitTableaux,
+            matrix.fromText('1\n2\n'), matrix.fromText('1\n'))
+
+
 class GetEquilibirumTests(unittest.TestCase):
     def setUp(self):
         pass
@@ -561,8 +648,9 @@ class LemkeHowsonTests(unittest.TestCase):
         self.scenarioValidRun(EX7_M1, EX7_M2, expEq)
 
     def testEx8ValidRun(self):
-        expEq = ((r.Rational(0), r.Rational(0), r.Rational(1)),
-                 (r.Rational(1), r.Rational(0), r.Rational(0)))
+        # The game is degenerate (ties are broken by the lexicographic rule)
+        expEq = ((r.Rational(0), r.Rational(1), r.Rational(0)),
+                 (r.Rational(0), r.Rational(1), r.Rational(0)))
         self.scenarioValidRun(EX8_M1, EX8_M2, expEq)
 
     def testEx9ValidRun(self):
@@ -571,10 +659,18 @@ class LemkeHowsonTests(unittest.TestCase):
         self.scenarioValidRun(EX9_M1, EX9_M2, expEq)
 
     def testEx10ValidRun(self):
-        expEq = ((r.Rational(1, 2), r.Rational(1, 2)),
-                 (r.Rational(4, 7), r.Rational(3, 7), r.Rational(0)))
+        # The game is degenerate (ties are broken by the lexicographic rule)
+        expEq = ((r.Rational(1), r.Rational(0)),
+                 (r.Rational(0), r.Rational(0), r.Rational(1)))
         self.scenarioValidRun(EX10_M1, EX10_M2, expEq)
 
+    def testAllBackendsDoNotCycleOnDegenerateGame(self):
+        expEq = ((r.Rational(0), r.Rational(0), r.Rational(1), r.Rational(0)),
+                 (r.Rational(0), r.Rational(0), r.Rational(0), r.Rational(1)))
+        for backend in ('rational', 'integer', 'sparse'):
+            self.assertEqual(expEq,
+                lh.lemkeHowson(EX11_M1, EX11_M2, backend, initBasisVar=7))
+
     def scenarioValueErrorIsRaisedWhenMatricesHaveDifferentDimensions(self, m1, m2):
         try:
             lh.lemkeHowson(m1, m2)
@@ -593,6 +689,297 @@ class LemkeHowsonTests(unittest.TestCase):
         m2 = matrix.fromText('1\n2\n')
         self.scenarioValueErrorIsRaisedWhenMatricesHaveDifferentDimensions(m1, m2)
 
+    def testValueErrorRaisedWhenInitialBasisVariableIsInvalid(self):
+        for initBasisVar in [0, -1, 5]:
+            try:
+                lh.lemkeHowson(EX1_M1, EX1_M2, initBasisVar=initBasisVar)
+            except ValueError:
+                pass
+            else:
+                self.fail('ValueError should have been thrown.')
+
+    def testValueErrorRaisedWhenUnknownBackendIsSelected(self):
+        try:
+            lh.lemkeHowson(EX1_M1, EX1_M2, backend='unknown')
+        except ValueError:
+            pass
+        else:
+            self.fail('ValueError should have been thrown.')
+
+
+class BreakRatioTieTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testRowWithLowestRatioOfFirstPerturbationIsSelected(self):
+        # Ratios of the first perturbation: 1/2, 1/4 and 1/1
+        perturbations = {0: [1, 0], 1: [1, 5], 2: [2, 0]}
+        coeffs = {0: 2, 1: 4, 2: 2}
+        self.assertEqual(1, lh.breakRatioTie([0, 1, 2], coeffs.get,
+            lambda row, k: perturbations[row][k], 2))
+
+    def testNextPerturbationIsUsedWhenFirstOneIsTied(self):
+        perturbations = {0: [1, 3], 1: [2, -1], 2: [1, 2]}
+        coeffs = {0: 1, 1: 2, 2: 1}
+        self.assertEqual(1, lh.breakRatioTie([0, 1, 2], coeffs.get,
+            lambda row, k: perturbations[row][k], 2))
+
+    def testRationalPerturbationsAreCompared(self):
+        perturbations = {3: [r.Rational(1, 3)], 5: [r.Rational(1, 4)]}
+        coeffs = {3: r.Rational(1, 2), 5: r.Rational(1, 3)}
+        # Ratios: 2/3 and 3/4
+        self.assertEqual(3, lh.breakRatioTie([3, 5], coeffs.get,
+            lambda row, k: perturbations[row][k], 1))
+
+    def testFloatDifferencesWithinToleranceAreTies(self):
+        perturbations = {0: [1.0, 1.0], 1: [1.0 + 1e-12, 0.0]}
+        coeffs = {0: 1.0, 1: 1.0}
+        self.assertEqual(1, lh.breakRatioTie([0, 1], coeffs.get,
+            lambda row, k: perturbations[row][k], 2, 1e-9))
+
+
+class SelectBackendTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testDensityIsRatioOfNonzeroPayoffs(self):
+        self.assertEqual(0.5, lh.getDensity(EX1_M1, EX1_M2))
+
+    def testSparseBackendIsSelectedForSparseGame(self):
+        m = matrix.Matrix(10, 10)
+        m.setItem(1, 1, 1)
+        self.assertEqual('sparse', lh.selectBackend(m, m))
+
+    def testRationalBackendIsSelectedForDenseGame(self):
+        self.assertEqual('rational', lh.selectBackend(EX2_M1, EX2_M2))
+
+    def testSelectedBackendIsNotChanged(self):
+        self.assertEqual('integer',
+            lh.selectBackend(EX2_M1, EX2_M2, 'integer'))
+
+
+class LemkeHowsonAllLabelsTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testCoordinationGameHasAllPureEquilibriaFound(self):
+        m = matrix.fromText('1 0 0\n0 1 0\n0 0 1\n')
+        eqs = lh.lemkeHowsonAllLabels(m, m)
+        pure = lambda i: tuple([r.Rational(1 if j == i else 0)
+            for j in xrange(0, 3)])
+        expEqs = [((pure(0), pure(0)), [1, 4]),
+                  ((pure(1), pure(1)), [2, 5]),
+                  ((pure(2), pure(2)), [3, 6])]
+        self.assertEqual(expEqs, eqs)
+
+    def testGameWithSingleEquilibriumIsFoundFromAllLabels(self):
+        eqs = lh.lemkeHowsonAllLabels(EX1_M1, EX1_M2)
+        expEq = ((r.Rational(1, 2), r.Rational(1, 2)),
+                 (r.Rational(1, 2), r.Rational(1, 2)))
+        self.assertEqual([(expEq, [1, 2, 3, 4])], eqs)
+
+    def testEquilibriaAreSameAsFromLemkeHowsonWithSameLabel(self):
+        eqs = lh.lemkeHowsonAllLabels(EX2_M1, EX2_M2)
+        for (eq, labels) in eqs:
+            for label in labels:
+                self.assertEqual(eq,
+                    lh.lemkeHowson(EX2_M1, EX2_M2, initBasisVar=label))
+
+    def testIntegerBackendFindsSameEquilibria(self):
+        m = matrix.fromText('1 0 0\n0 1 0\n0 0 1\n')
+        self.assertEqual(lh.lemkeHowsonAllLabels(m, m),
+            lh.lemkeHowsonAllLabels(m, m, backend='integer'))
+
+    def testValueErrorRaisedWhenMatricesHaveDifferentDimensions(self):
+        try:
+            lh.lemkeHowsonAllLabels(matrix.fromText('1\n2\n'),
+                matrix.fromText('1\n'))
+        except ValueError:
+            pass
+        else:
+            self.fail('ValueError should have been thrown.')
+
+
+class FillSplitTableauxTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testGetNormalizationConstantIsConstantAddedByNormalizeMatrices(self):
+        (normM1, normM2) = lh.normalizeMatrices(EX4_M1, EX4_M2)
+        self.assertEqual(2, lh.getNormalizationConstant(EX4_M1, EX4_M2))
+        self.assertEqual(normM1.getItem(1, 1), EX4_M1.getItem(1, 1) + 2)
+
+    def testGetNormalizationConstantIsZeroForPositiveMatrices(self):
+        self.assertEqual(0, lh.getNormalizationConstant(EX3_M1, EX3_M2))
+
+    def testFilledTableauxIsSameAsTableauxOfNormalizedMatrices(self):
+        t = lh.createSplitTableaux(EX9_M1, EX9_M2)
+        lh.makeSplitPivotingStep(t, 2, 1)
+        lh.fillSplitTableaux(t, EX4_M1, EX4_M2, 2)
+        expT = lh.createSplitTableaux(*lh.normalizeMatrices(EX4_M1, EX4_M2))
+        self.assertEqual(expT.parts, t.parts)
+        self.assertEqual(expT.nonbasis, t.nonbasis)
+
+
+class CheckBasisTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testInitialBasisIsValid(self):
+        lh.checkBasis([-1, -2, -3, -4, -5], 2, 5)
+
+    def testFinalBasisIsValid(self):
+        lh.checkBasis([3, -2, 1, -4], 2, 4)
+
+    def testValueErrorRaisedWhenLabelIsMissing(self):
+        self.assertRaises(ValueError, lh.checkBasis, [3, -3, 1, -4], 2, 4)
+
+    def testValueErrorRaisedWhenBasisHasInvalidLength(self):
+        self.assertRaises(ValueError, lh.checkBasis, [3, -2, 1], 2, 4)
+
+    def testValueErrorRaisedWhenVariableIsInvalid(self):
+        self.assertRaises(ValueError, lh.checkBasis, [3, -2, 1, 5], 2, 4)
+
+    def testValueErrorRaisedWhenPartsHaveInvalidSizes(self):
+        self.assertRaises(ValueError, lh.checkBasis, [-1, -2, 3, 4], 2, 4)
+
+
+class LemkeHowsonFromBasisTests(unittest.TestCase):
+    def setUp(self):
+        # A game with two pure equilibria
+        self.m1 = matrix.fromText('2 0\n0 1\n')
+        self.m2 = matrix.fromText('2 0\n0 1\n')
+
+    def tearDown(self):
+        pass
+
+    def testColdStartFindsSameEquilibriumAsLemkeHowson(self):
+        (eq, basis) = lh.lemkeHowsonFromBasis(EX2_M1, EX2_M2)
+        self.assertEqual(lh.lemkeHowson(EX2_M1, EX2_M2), eq)
+
+    def testColdStartReturnsFinalBasis(self):
+        (eq, basis) = lh.lemkeHowsonFromBasis(self.m1, self.m2)
+        self.assertEqual([3, -2, 1, -4], basis)
+
+    def testWarmStartFromFinalBasisFindsSameEquilibrium(self):
+        (eq, basis) = lh.lemkeHowsonFromBasis(self.m1, self.m2,
+            initBasisVar=2)
+        self.assertEqual((eq, basis),
+            lh.lemkeHowsonFromBasis(self.m1, self.m2, basis))
+
+    def testWarmStartKeepsFeasibleBasisOfChangedGame(self):
+        (eq, basis) = lh.lemkeHowsonFromBasis(EX1_M1, EX1_M2)
+        m1 = matrix.fromText('3 0\n0 2\n')
+        expEq = ((r.Rational(1, 2), r.Rational(1, 2)),
+                 (r.Rational(2, 5), r.Rational(3, 5)))
+        self.assertEqual((expEq, basis),
+            lh.lemkeHowsonFromBasis(m1, EX1_M2, basis))
+
+    def testPathIsFollowedWhenBasisIsInfeasibleInChangedGame(self):
+        (eq, basis) = lh.lemkeHowsonFromBasis(self.m1, self.m2,
+            initBasisVar=2)
+        m2 = matrix.fromText('2 0\n2 1\n')
+        self.assertEqual(lh.lemkeHowsonFromBasis(self.m1, m2),
+            lh.lemkeHowsonFromBasis(self.m1, m2, basis))
+
+    def testPathIsFollowedWhenBasisIsSingularInChangedGame(self):
+        (eq, basis) = lh.lemkeHowsonFromBasis(EX1_M1, EX1_M2)
+        m1 = matrix.fromText('2 2\n2 2\n')
+        self.assertEqual(lh.lemkeHowsonFromBasis(m1, EX1_M2),
+            lh.lemkeHowsonFromBasis(m1, EX1_M2, basis))
+
+    def testAllBackendsKeepFeasibleBasis(self):
+        (eq, basis) = lh.lemkeHowsonFromBasis(self.m1, self.m2,
+            initBasisVar=2)
+        for backend in lh.BACKENDS:
+            try:
+                (eq, warmBasis) = lh.lemkeHowsonFromBasis(self.m1, self.m2,
+                    basis, backend)
+            except ImportError:
+                continue
+            self.assertEqual(sorted(basis), sorted(warmBasis))
+            self.assertEqual(((0, 1), (0, 1)), eq)
+
+    def testValueErrorRaisedWhenBasisIsNotComplementary(self):
+        self.assertRaises(ValueError, lh.lemkeHowsonFromBasis,
+            self.m1, self.m2, [3, -3, 1, -4])
+
+
+class LemkeHowsonStepsTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testLastStatusContainsSameEquilibriumAsLemkeHowson(self):
+        for backend in lh.BACKENDS:
+            try:
+                statuses = list(lh.lemkeHowsonSteps(EX7_M1, EX7_M2, backend,
+                    initBasisVar=2))
+            except ImportError:
+                continue
+            self.assertTrue(statuses[-1].isDone())
+            self.assertEqual(lh.lemkeHowson(EX7_M1, EX7_M2, backend,
+                initBasisVar=2), statuses[-1].eq)
+
+    def testStatusIsYieldedAfterEveryPivotingStep(self):
+        (m1, m2) = games.savaniVonStengelGame(4)
+        statuses = list(lh.lemkeHowsonSteps(m1, m2))
+        self.assertEqual(range(1, len(statuses) + 1),
+            [s.pivots for s in statuses])
+        self.assertEqual([False] * (len(statuses) - 1) + [True],
+            [s.isDone() for s in statuses])
+        self.assertEqual(1, statuses[0].label)
+        self.assertEqual(None, statuses[0].support)
+
+    def testStatusIsYieldedAfterSelectedNumberOfPivotingSteps(self):
+        (m1, m2) = games.savaniVonStengelGame(4)
+        pivots = len(list(lh.lemkeHowsonSteps(m1, m2)))
+        statuses = list(lh.lemkeHowsonSteps(m1, m2, every=3))
+        self.assertEqual(range(3, pivots, 3) + [pivots],
+            [s.pivots for s in statuses])
+
+    def testSupportContainsStrategiesInBasis(self):
+        statuses = list(lh.lemkeHowsonSteps(EX2_M1, EX2_M2, support=True))
+        self.assertEqual(((1,), ()), statuses[0].support)
+        eq = statuses[-1].eq
+        self.assertEqual(tuple([tuple([i + 1 for i in xrange(0, len(p))
+            if p[i] != 0]) for p in eq]), statuses[-1].support)
+
+    def testInterleavedGamesAreSolvedAsSeparateGames(self):
+        gameList = [games.randomGame(5, 5, 10, seed=seed)
+            for seed in xrange(0, 5)]
+        paths = [lh.lemkeHowsonSteps(m1, m2) for (m1, m2) in gameList]
+        eqs = len(paths) * [None]
+        while None in eqs:
+            for k in xrange(0, len(paths)):
+                if eqs[k] is None:
+                    eqs[k] = paths[k].next().eq
+        self.assertEqual([lh.lemkeHowson(m1, m2) for (m1, m2) in gameList],
+            eqs)
+
+    def testValueErrorRaisedBeforeFirstStepWhenArgumentsAreInvalid(self):
+        self.assertRaises(ValueError, lh.lemkeHowsonSteps, EX1_M1, EX1_M2,
+            initBasisVar=5)
+        self.assertRaises(ValueError, lh.lemkeHowsonSteps, EX1_M1, EX1_M2,
+            every=0)
+
 
 def suite():
     """Returns a test suite that contains all tests from this module."""
@@ -184,6 +184,98 @@ class MatrixTests(unittest.TestCase):
         m2.setItem(2, 2, r.Rational(4))
         self.assertEqual(m1, m2)
 
+    def testGetItemsReturnsCopyOfItemsRowByRow(self):
+        m = matrix.Matrix(2, 2, [1, 2, 3, 4])
+        items = m.getItems()
+        self.assertEqual([1, 2, 3, 4], items)
+        items[0] = 5
+        self.assertEqual(1, m.getItem(1, 1))
+
+    def testGetRowReturnsCopyOfRow(self):
+        m = matrix.fromText('1 2 3\n4 5 6\n')
+        row = m.getRow(2)
+        self.assertEqual([4, 5, 6], row)
+        row[0] = 7
+        self.assertEqual(4, m.getItem(2, 1))
+
+    def testGetRowFromColReturnsOnlyRestOfRow(self):
+        m = matrix.fromText('1 2 3\n4 5 6\n')
+        self.assertEqual([2, 3], m.getRow(1, 2))
+
+    def testSetRowSetsAllItemsInRow(self):
+        m = matrix.Matrix(2, 3)
+        m.setRow(2, [7, 8, 9])
+        self.assertEqual('0 0 0\n7 8 9\n', repr(m))
+
+    def testSetRowFromColSetsOnlyRestOfRow(self):
+        m = matrix.Matrix(2, 3)
+        m.setRow(1, [7, 8], 2)
+        self.assertEqual('0 7 8\n0 0 0\n', repr(m))
+
+    def testIndexErrorIsThrownWhenSettingTooLongRow(self):
+        m = matrix.Matrix(2, 3)
+        try:
+            m.setRow(1, [1, 2, 3], 2)
+        except IndexError:
+            pass
+        else:
+            self.fail('IndexError should have been thrown.')
+
+    def testScaleRowMultipliesItemsFromSelectedCol(self):
+        m = matrix.fromText('1 2 3\n4 5 6\n')
+        m.scaleRow(1, r.Rational(1, 2), 2)
+        self.assertEqual([1, r.Rational(1), r.Rational(3, 2)], m.getRow(1))
+        self.assertEqual([4, 5, 6], m.getRow(2))
+
+    def testAxpyRowAddsMultipleOfOtherRow(self):
+        m = matrix.fromText('1 2 3\n4 5 6\n')
+        m.axpyRow(2, 1, -2)
+        self.assertEqual([2, 1, 0], m.getRow(2))
+        self.assertEqual([1, 2, 3], m.getRow(1))
+
+    def testAxpyRowFromColChangesOnlyRestOfRow(self):
+        m = matrix.fromText('1 2 3\n4 5 6\n')
+        m.axpyRow(1, 2, 1, 3)
+        self.assertEqual([1, 2, 9], m.getRow(1))
+
+    def testGetColSliceReturnsSelectedPartOfColumn(self):
+        m = matrix.fromText('1 2\n3 4\n5 6\n7 8\n')
+        self.assertEqual([4, 6], m.getColSlice(2, 2, 3))
+        self.assertEqual([1, 3, 5, 7], m.getColSlice(1, 1, 4))
+
+    def testSetColSliceSetsSelectedPartOfColumn(self):
+        m = matrix.Matrix(3, 2)
+        m.setColSlice(2, 2, [5, 6])
+        self.assertEqual('0 0\n0 5\n0 6\n', repr(m))
+
+    def testIndexErrorIsThrownWhenSettingTooLongColumn(self):
+        m = matrix.Matrix(3, 2)
+        try:
+            m.setColSlice(1, 2, [1, 2, 3])
+        except IndexError:
+            pass
+        else:
+            self.fail('IndexError should have been thrown.')
+
+    def testCopyReturnsEqualButIndependentMatrix(self):
+        m1 = matrix.fromText('1 2\n3 4\n')
+        m2 = m1.copy()
+        self.assertEqual(m1, m2)
+        m2.setItem(1, 1, 5)
+        self.assertEqual(1, m1.getItem(1, 1))
+
+    def testMatrixCanBeCreatedFromListOfItems(self):
+        m = matrix.Matrix(2, 3, [1, 2, 3, 4, 5, 6])
+        self.assertEqual('1 2 3\n4 5 6\n', repr(m))
+
+    def testValueErrorIsThrownWhenNumberOfItemsDoesNotMatch(self):
+        try:
+            matrix.Matrix(2, 3, [1, 2, 3, 4, 5])
+        except ValueError:
+            pass
+        else:
+            self.fail('ValueError should have been thrown.')
+
 
 class MatrixFromTextTests(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,141 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import fractions
+import unittest
+import sys
+
+from .. import lh
+from .. import matrix
+from .. import numfields
+from .. import rational as r
+
+
+EX_M1 = matrix.fromText('1 3 0\n0 0 2\n2 1 1\n')
+EX_M2 = matrix.fromText('2 1 0\n1 3 1\n0 0 3\n')
+# The exact equilibrium of the game above (from the label 1)
+EX_EQ = ((r.Rational(6, 13), r.Rational(3, 13), r.Rational(4, 13)),
+         (r.Rational(1, 9), r.Rational(1, 3), r.Rational(5, 9)))
+
+
+class GetFieldTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testDefaultFieldIsRational(self):
+        self.assertEqual(numfields.DEFAULT_FIELD, numfields.getField().name)
+
+    def testFieldsHaveSelectedNames(self):
+        for name in ('rational', 'fraction', 'float'):
+            self.assertEqual(name, numfields.getField(name).name)
+
+    def testFieldIsReturnedUnchanged(self):
+        field = numfields.FloatField()
+        self.assertTrue(field is numfields.getField(field))
+
+    def testValueErrorIsRaisedOnUnknownField(self):
+        self.assertRaises(ValueError, numfields.getField, 'complex')
+
+
+class NumberFieldTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testFractionCreatesNumberOfField(self):
+        self.assertEqual(r.Rational(1, 3),
+            numfields.getField('rational').fraction(2, 6))
+        self.assertEqual(fractions.Fraction(1, 3),
+            numfields.getField('fraction').fraction(2, 6))
+        self.assertEqual(0.5, numfields.getField('float').fraction(1, 2))
+
+    def testIntegerIsConvertedIntoField(self):
+        x = numfields.getField('fraction').convert(3)
+        self.assertTrue(isinstance(x, fractions.Fraction))
+        self.assertEqual(3, x)
+
+    def testRationalIsConvertedIntoField(self):
+        self.assertEqual(fractions.Fraction(-3, 4),
+            numfields.getField('fraction').convert(r.Rational(-3, 4)))
+        self.assertEqual(0.75,
+            numfields.getField('float').convert(r.Rational(3, 4)))
+
+    def testNumberOfFieldIsNotConverted(self):
+        x = r.Rational(1, 2)
+        self.assertTrue(x is numfields.getField('rational').convert(x))
+
+    def testFloatEquilibriaAreEqualWithinTolerance(self):
+        field = numfields.getField('float')
+        self.assertTrue(field.equilibriaEqual(((0.5, 0.5), (1.0,)),
+            ((0.5 + 1e-12, 0.5 - 1e-12), (1.0,))))
+        self.assertFalse(field.equilibriaEqual(((0.5, 0.5), (1.0,)),
+            ((0.6, 0.4), (1.0,))))
+
+
+class LemkeHowsonFieldTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testExactBackendsFindSameEquilibriumInFractionField(self):
+        expEq = tuple([tuple([fractions.Fraction(x.nom(), x.denom())
+            for x in eqPart]) for eqPart in EX_EQ])
+        for backend in ('rational', 'integer', 'sparse'):
+            eq = lh.lemkeHowson(EX_M1, EX_M2, backend, field='fraction')
+            self.assertEqual(expEq, eq)
+            for eqPart in eq:
+                for x in eqPart:
+                    self.assertTrue(isinstance(x, fractions.Fraction))
+
+    def testFloatFieldFindsApproximateEquilibrium(self):
+        eq = lh.lemkeHowson(EX_M1, EX_M2, 'rational', field='float')
+        for (eqPart, expEqPart) in zip(eq, EX_EQ):
+            for (x, expX) in zip(eqPart, expEqPart):
+                self.assertTrue(abs(x - float(expX.nom()) / expX.denom())
+                    < 1e-9)
+
+    def testAllLabelsInFractionFieldFindSameEquilibriaAsRational(self):
+        eqs = lh.lemkeHowsonAllLabels(EX_M1, EX_M2, 'rational')
+        fractionEqs = lh.lemkeHowsonAllLabels(EX_M1, EX_M2, 'rational',
+            field='fraction')
+        self.assertEqual([labels for (eq, labels) in eqs],
+            [labels for (eq, labels) in fractionEqs])
+
+    def testNormalizeEquilibriumInFractionField(self):
+        F = fractions.Fraction
+        eq = ((F(1, 5), F(3, 5)), (F(2),))
+        self.assertEqual(((F(1, 4), F(3, 4)), (F(1),)),
+            lh.normalizeEquilibrium(eq, numfields.getField('fraction')))
+
+    def testNormalizeEquilibriumRaisesValueErrorOnNumberFromOtherField(self):
+        eq = ((r.Rational(1, 2), r.Rational(1, 2)), (r.Rational(1),))
+        self.assertRaises(ValueError, lh.normalizeEquilibrium, eq,
+            numfields.getField('fraction'))
+
+    def testValueErrorIsRaisedWhenNumpyBackendGetsExactField(self):
+        self.assertRaises(ValueError, lh.getEngine, 'numpy', None, 'fraction')
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
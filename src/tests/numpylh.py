@@ -0,0 +1,212 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import os
+import unittest
+import sys
+
+from .. import games
+from .. import io
+from .. import lh
+from .. import matrix
+
+# NumPy is an optional dependency, so these tests are run only if it is
+# installed
+try:
+    import numpy
+    from .. import numpylh
+except ImportError:
+    numpy = None
+
+
+SAMPLE_GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', 'sample-games')
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+# A degenerate game (see EX11 in tests of the lh module)
+EX2_M1 = matrix.fromText('0 0 2 2\n2 2 0 1\n3 0 1 3\n2 1 3 1\n')
+EX2_M2 = matrix.fromText('0 0 1 3\n2 0 0 2\n1 2 0 2\n1 3 0 1\n')
+
+
+def scaleMatrix(m, factor):
+    """Returns the selected matrix with all items multiplied by the selected
+    factor (floats)."""
+    return matrix.Matrix(m.getNumRows(), m.getNumCols(),
+        [x * factor for x in m.getItems()])
+
+
+class CreateTableauxTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testEx1InitializesCorrectly(self):
+        # Payoffs of both players are mapped onto [1, 2]
+        t = numpylh.createTableaux(EX1_M1, EX1_M2)
+        expT = [[-1, 1, 0, 0, -2, -1],
+                [-2, 1, 0, 0, -1, -2],
+                [-3, 1, -1, -2, 0, 0],
+                [-4, 1, -2, -1, 0, 0]]
+        self.assertEqual(numpy.float64, t.dtype)
+        self.assertEqual(expT, t.tolist())
+
+    def testFilledTableauxIsSameAsTableauxOfShiftedMatrices(self):
+        t = numpylh.createTableaux(EX2_M1, EX2_M2)
+        numpylh.makePivotingStep(t, 4, 1)
+        numpylh.fillTableaux(t, EX2_M1, EX2_M2, 1)
+        self.assertEqual(numpylh.createTableaux(
+            *lh.normalizeMatrices(EX2_M1, EX2_M2)).tolist(), t.tolist())
+
+    def testTableauxWithConstantIsSameAsTableauxOfShiftedMatrices(self):
+        m1 = matrix.fromText('1 -2\n0 3\n4 1\n')
+        m2 = matrix.fromText('2 0\n-1 1\n3 3\n')
+        self.assertEqual(numpylh.createTableaux(*lh.normalizeMatrices(m1,
+            m2)).tolist(), numpylh.createTableaux(m1, m2, 3).tolist())
+        self.assertEqual([-4.0, 1.0, -1.75, -1.0, -2.0, 0.0, 0.0],
+            numpylh.createTableaux(m1, m2, 3)[3].tolist())
+
+    def testTableauxDoesNotDependOnMagnitudeOfPayoffs(self):
+        for factor in (1e10, 1e-10):
+            self.assertEqual(numpylh.createTableaux(EX1_M1, EX1_M2).tolist(),
+                numpylh.createTableaux(scaleMatrix(EX1_M1, factor),
+                scaleMatrix(EX1_M2, factor)).tolist())
+
+
+class MakePivotingStepTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testEx1MakeFirstPivotingStep(self):
+        t = numpylh.createTableaux(EX1_M1, EX1_M2)
+        lb = numpylh.makePivotingStep(t, EX1_M1.getNumRows(), 1)
+        expT = [[-1, 1, 0, 0, -2, -1],
+                [-2, 1, 0, 0, -1, -2],
+                [-3, 0.5, 0, -1.5, 0, 0.5],
+                [1, 0.5, 0, -0.5, 0, -0.5]]
+        self.assertEqual(-4, lb)
+        self.assertEqual(expT, t.tolist())
+
+    def testValueErrorIsRaisedOnInvalidVariable(self):
+        t = numpylh.createTableaux(EX1_M1, EX1_M2)
+        try:
+            numpylh.makePivotingStep(t, EX1_M1.getNumRows(), 5)
+        except ValueError:
+            pass
+        else:
+            self.fail('ValueError should have been thrown.')
+
+
+class GetEquilibriumTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testValueErrorIsRaisedWhenProbabilitiesSumToZero(self):
+        t = numpylh.createTableaux(EX1_M1, EX1_M2)
+        self.assertRaises(ValueError, numpylh.getEquilibrium, t, 2)
+
+    def testValueErrorIsRaisedWhenBasisIsNotFeasible(self):
+        t = numpylh.createTableaux(EX1_M1, EX1_M2)
+        numpylh.makePivotingStep(t, 2, 1)
+        numpylh.makePivotingStep(t, 2, 4)
+        t[0, 1] = -1e-6
+        self.assertRaises(ValueError, numpylh.getEquilibrium, t, 2)
+
+
+class LemkeHowsonTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def assertEquilibriumAlmostEqual(self, expEq, eq):
+        self.assertEqual(len(expEq[0]), len(eq[0]))
+        self.assertEqual(len(expEq[1]), len(eq[1]))
+        for i in xrange(0, 2):
+            for j in xrange(0, len(eq[i])):
+                self.assertTrue(isinstance(eq[i][j], float))
+                self.assertAlmostEqual(expEq[i][j], eq[i][j], 9)
+
+    def scenarioBothBackendsFindSameEquilibrium(self, m1, m2):
+        expEq = lh.lemkeHowson(m1, m2)
+        expEq = tuple([tuple([float(p.nom()) / p.denom() for p in eqPart])
+            for eqPart in expEq])
+        eq = lh.lemkeHowson(m1, m2, backend='numpy')
+        self.assertEquilibriumAlmostEqual(expEq, eq)
+
+    def testBothBackendsFindSameEquilibriumOnSampleGames(self):
+        for fileName in sorted(os.listdir(SAMPLE_GAMES_DIR)):
+            f = open(os.path.join(SAMPLE_GAMES_DIR, fileName))
+            try:
+                m1, m2 = io.parseInputMatrices(f.read())
+            finally:
+                f.close()
+            self.scenarioBothBackendsFindSameEquilibrium(m1, m2)
+
+    def testEx1ValidRun(self):
+        eq = lh.lemkeHowson(EX1_M1, EX1_M2, backend='numpy')
+        self.assertEquilibriumAlmostEqual(((0.5, 0.5), (0.5, 0.5)), eq)
+
+    def testEx1ValidRunWithCustomTolerance(self):
+        eq = lh.lemkeHowson(EX1_M1, EX1_M2, backend='numpy', tol=1e-6)
+        self.assertEquilibriumAlmostEqual(((0.5, 0.5), (0.5, 0.5)), eq)
+
+    def testBothBackendsFindSameEquilibriumOnGamesWithLargeAndSmallPayoffs(self):
+        for factor in (2e10, 7e12, 1e-10):
+            self.assertEquilibriumAlmostEqual(((0.5, 0.5), (0.5, 0.5)),
+                lh.lemkeHowson(scaleMatrix(EX1_M1, factor),
+                scaleMatrix(EX1_M2, factor), backend='numpy'))
+            for seed in xrange(0, 5):
+                (m1, m2) = games.randomGame(6, 6, 100, seed=seed)
+                expEq = tuple([tuple([float(p.nom()) / p.denom()
+                    for p in eqPart]) for eqPart in lh.lemkeHowson(m1, m2)])
+                self.assertEquilibriumAlmostEqual(expEq, lh.lemkeHowson(
+                    scaleMatrix(m1, factor), scaleMatrix(m2, factor),
+                    backend='numpy'))
+
+    def testBothBackendsFindSameEquilibriumOnGameWithLongPath(self):
+        (m1, m2) = games.savaniVonStengelGame(8)
+        expEq = tuple([tuple([float(p.nom()) / p.denom() for p in eqPart])
+            for eqPart in lh.lemkeHowson(m1, m2)])
+        eq = lh.lemkeHowson(m1, m2, backend='numpy')
+        for i in xrange(0, 2):
+            for j in xrange(0, len(eq[i])):
+                self.assertAlmostEqual(expEq[i][j], eq[i][j], 6)
+
+    def testBothBackendsFindSameEquilibriumOnDegenerateGame(self):
+        for label in xrange(1, 9):
+            expEq = lh.lemkeHowson(EX2_M1, EX2_M2, initBasisVar=label)
+            expEq = tuple([tuple([float(p.nom()) / p.denom()
+                for p in eqPart]) for eqPart in expEq])
+            eq = lh.lemkeHowson(EX2_M1, EX2_M2, backend='numpy',
+                initBasisVar=label)
+            self.assertEquilibriumAlmostEqual(expEq, eq)
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    if numpy is None:
+        return unittest.TestSuite()
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,86 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import unittest
+import sys
+
+from .. import lh
+from .. import matrix
+from .. import parallel
+
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+EX2_M1 = matrix.fromText('1 3 0\n0 0 2\n2 1 1\n')
+EX2_M2 = matrix.fromText('2 1 0\n1 3 1\n0 0 3\n')
+COORD_M = matrix.fromText('1 0 0\n0 1 0\n0 0 1\n')
+
+
+class LemkeHowsonAllLabelsTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioSameResultAsSequentialRun(self, m1, m2, backend):
+        expEqs = lh.lemkeHowsonAllLabels(m1, m2, backend)
+        eqs = parallel.lemkeHowsonAllLabels(m1, m2, backend, processes=2)
+        self.assertEqual(expEqs, eqs)
+
+    def testEx1SameResultAsSequentialRun(self):
+        self.scenarioSameResultAsSequentialRun(EX1_M1, EX1_M2, 'rational')
+
+    def testEx2SameResultAsSequentialRun(self):
+        self.scenarioSameResultAsSequentialRun(EX2_M1, EX2_M2, 'rational')
+
+    def testCoordinationGameSameResultAsSequentialRun(self):
+        self.scenarioSameResultAsSequentialRun(COORD_M, COORD_M, 'integer')
+
+    def testValueErrorRaisedWhenMatricesHaveDifferentDimensions(self):
+        try:
+            parallel.lemkeHowsonAllLabels(matrix.fromText('1\n2\n'),
+                matrix.fromText('1\n'), processes=2)
+        except ValueError:
+            pass
+        else:
+            self.fail('ValueError should have been thrown.')
+
+
+class LemkeHowsonFirstTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testFoundEquilibriumIsReachedFromReturnedLabel(self):
+        (eq, label) = parallel.lemkeHowsonFirst(COORD_M, COORD_M, processes=2)
+        self.assertEqual(lh.lemkeHowson(COORD_M, COORD_M, initBasisVar=label),
+            eq)
+
+    def testValueErrorRaisedWhenUnknownBackendIsSelected(self):
+        try:
+            parallel.lemkeHowsonFirst(EX1_M1, EX1_M2, 'unknown', processes=2)
+        except ValueError:
+            pass
+        else:
+            self.fail('ValueError should have been thrown.')
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,179 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import pickle
+import threading
+import unittest
+import sys
+
+from .. import batch
+from .. import games
+from .. import lh
+from .. import matrix
+from .. import parallel
+from .. import pathlimits
+
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+
+
+class CyclingEngine(object):
+    """Engine whose paths never end (variables 2 and 3 are exchanged
+    forever and the basis does not change)."""
+
+    def getBasis(self, t):
+        return [-1, 2, 3]
+
+    def makePivotingStep(self, t, p1SCount, ebVar, stats=None):
+        return 3 if ebVar != -3 else 2
+
+
+class PathLimitsTests(unittest.TestCase):
+    def setUp(self):
+        # Paths in this game have 8 or 12 pivoting steps
+        (self.m1, self.m2) = games.savaniVonStengelGame(4)
+
+    def tearDown(self):
+        pass
+
+    def testPathWithinLimitsIsNotStopped(self):
+        limits = pathlimits.PathLimits(maxPivots=12, timeout=60,
+            detectCycles=True)
+        self.assertEqual(lh.lemkeHowson(self.m1, self.m2, 'rational'),
+            lh.lemkeHowson(self.m1, self.m2, 'rational', limits=limits))
+
+    def testPivotLimitExceededErrorContainsStateOfPath(self):
+        limits = pathlimits.PathLimits(maxPivots=5)
+        try:
+            lh.lemkeHowson(self.m1, self.m2, 'rational', limits=limits)
+        except pathlimits.PivotLimitExceededError, e:
+            self.assertEqual(5, e.pivots)
+            self.assertEqual(5, len(e.history))
+            self.assertEqual(1, e.history[0])
+            self.assertEqual(8, len(e.basis))
+        else:
+            self.fail('PivotLimitExceededError should have been thrown.')
+
+    def testPathIsCancelledBetweenPivotingSteps(self):
+        calls = []
+        def isCancelled():
+            calls.append(None)
+            return len(calls) > 3
+        limits = pathlimits.PathLimits(isCancelled=isCancelled)
+        try:
+            lh.lemkeHowson(self.m1, self.m2, 'rational', limits=limits)
+        except pathlimits.PathCancelledError, e:
+            self.assertEqual(3, e.pivots)
+        else:
+            self.fail('PathCancelledError should have been thrown.')
+
+    def testAllBackendsReportSameState(self):
+        states = []
+        for backend in ('rational', 'integer', 'sparse'):
+            limits = pathlimits.PathLimits(maxPivots=3)
+            try:
+                lh.lemkeHowson(self.m1, self.m2, backend, limits=limits)
+            except pathlimits.PivotLimitExceededError, e:
+                states.append((e.basis, e.history))
+        self.assertEqual(3, len(states))
+        self.assertEqual(states[0], states[1])
+        self.assertEqual(states[0], states[2])
+
+    def testTimeLimitExceededErrorIsRaised(self):
+        limits = pathlimits.PathLimits(timeout=-1)
+        self.assertRaises(pathlimits.TimeLimitExceededError, lh.lemkeHowson,
+            self.m1, self.m2, 'rational', limits=limits)
+
+    def testCycleIsDetected(self):
+        limits = pathlimits.PathLimits(detectCycles=True)
+        try:
+            lh.followPath(CyclingEngine(), None, 1, 1, limits=limits)
+        except pathlimits.CycleDetectedError, e:
+            self.assertEqual(3, e.pivots)
+            self.assertEqual([1, -3, -2], e.history)
+            self.assertEqual([-1, 2, 3], e.basis)
+        else:
+            self.fail('CycleDetectedError should have been thrown.')
+
+    def testLimitsApplyToEveryPathSeparately(self):
+        limits = pathlimits.PathLimits(maxPivots=12)
+        eqs = lh.lemkeHowsonAllLabels(self.m1, self.m2, 'rational',
+            limits=limits)
+        self.assertEqual(eqs, lh.lemkeHowsonAllLabels(self.m1, self.m2,
+            'rational'))
+
+    def testLimitsCanBeSharedByInterleavedPaths(self):
+        limits = pathlimits.PathLimits(maxPivots=200, detectCycles=True)
+        gameList = [games.randomGame(12, 12, 100, seed=seed)
+            for seed in xrange(0, 4)]
+        paths = [lh.lemkeHowsonSteps(m1, m2, limits=limits)
+            for (m1, m2) in gameList]
+        eqs = len(paths) * [None]
+        while None in eqs:
+            for k in xrange(0, len(paths)):
+                if eqs[k] is None:
+                    eqs[k] = paths[k].next().eq
+        self.assertEqual([lh.lemkeHowson(m1, m2) for (m1, m2) in gameList],
+            eqs)
+
+    def testLimitsCanBeSharedByThreads(self):
+        limits = pathlimits.PathLimits(maxPivots=200, detectCycles=True)
+        gameList = [games.randomGame(12, 12, 100, seed=seed)
+            for seed in xrange(0, 8)]
+        results = {}
+
+        def solve(k):
+            (m1, m2) = gameList[k]
+            try:
+                results[k] = lh.lemkeHowson(m1, m2, limits=limits)
+            except pathlimits.PathLimitError, e:
+                results[k] = e
+
+        threads = [threading.Thread(target=solve, args=(k,))
+            for k in xrange(0, len(gameList))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([lh.lemkeHowson(m1, m2) for (m1, m2) in gameList],
+            [results[k] for k in xrange(0, len(gameList))])
+
+    def testErrorCanBePickled(self):
+        e = pathlimits.PivotLimitExceededError('msg', [-1, 2], 3, [1, -2, 3])
+        e2 = pickle.loads(pickle.dumps(e))
+        self.assertEqual(pathlimits.PivotLimitExceededError, type(e2))
+        self.assertEqual('msg', str(e2))
+        self.assertEqual(([-1, 2], 3, [1, -2, 3]),
+            (e2.basis, e2.pivots, e2.history))
+
+    def testErrorIsRaisedFromWorkerProcesses(self):
+        limits = pathlimits.PathLimits(maxPivots=5)
+        self.assertRaises(pathlimits.PivotLimitExceededError,
+            parallel.lemkeHowsonAllLabels, self.m1, self.m2, 'rational',
+            processes=2, limits=limits)
+
+    def testBatchReportsExceededLimitAsError(self):
+        limits = pathlimits.PathLimits(maxPivots=1)
+        (eq, error, seconds) = batch.solveGame((EX1_M1, EX1_M2), 'rational',
+            limits=limits)
+        self.assertEqual(None, eq)
+        self.assertEqual('More than 1 pivoting steps.', error)
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
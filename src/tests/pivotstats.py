@@ -0,0 +1,142 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import StringIO
+import time
+import unittest
+import sys
+
+from .. import lh
+from .. import matrix
+from .. import pivotstats
+from .. import rational as r
+
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+EX2_M1 = matrix.fromText('1 3 0\n0 0 2\n2 1 1\n')
+EX2_M2 = matrix.fromText('2 1 0\n1 3 1\n0 0 3\n')
+
+
+class BitSizesTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testBitLengthOfZeroIsZero(self):
+        self.assertEqual(0, pivotstats.bitLength(0))
+
+    def testBitLengthOfNegativeNumberIsBitLengthOfItsAbsoluteValue(self):
+        self.assertEqual(3, pivotstats.bitLength(-5))
+
+    def testBitLengthOfLongNumber(self):
+        self.assertEqual(101, pivotstats.bitLength(2 ** 100))
+
+    def testMaxBitSizesOfIntegersAndRationals(self):
+        items = [3, r.Rational(-17, 5), 0, r.Rational(1, 64)]
+        self.assertEqual((5, 7), pivotstats.maxBitSizes(items))
+
+    def testMaxBitSizesOfIntegersHaveDenominatorWithOneBit(self):
+        self.assertEqual((2, 1), pivotstats.maxBitSizes([1, 2, 3]))
+
+
+class PivotStatsTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testTimeOfBitSizeScanIsNotIncludedInTimeOfStep(self):
+        stats = pivotstats.PivotStats()
+        stats.startPath(1)
+        stats.startPivot(1)
+        stats.startBitSizeScan()
+        time.sleep(0.05)
+        stats.recordBitSizes(3, 1)
+        stats.endPivot(-2)
+        self.assertTrue(0 <= stats.pivots[0]['time'] < 0.05)
+        self.assertEqual((3, 1), (stats.pivots[0]['nomBits'],
+            stats.pivots[0]['denomBits']))
+
+
+class LemkeHowsonStatsTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioRecordedPathIsConsistent(self, backend):
+        stats = pivotstats.PivotStats()
+        eq = lh.lemkeHowson(EX2_M1, EX2_M2, backend, initBasisVar=2,
+            stats=stats)
+        self.assertEqual(lh.lemkeHowson(EX2_M1, EX2_M2, backend,
+            initBasisVar=2), eq)
+        self.assertTrue(stats.getPivotCount() > 0)
+        self.assertEqual(2, stats.pivots[0]['entering'])
+        self.assertEqual(2, abs(stats.pivots[-1]['leaving']))
+        for (prev, next) in zip(stats.pivots, stats.pivots[1:]):
+            self.assertEqual(-prev['leaving'], next['entering'])
+        for p in stats.pivots:
+            self.assertEqual(2, p['label'])
+            self.assertEqual(3, p['scanLength'])
+            self.assertTrue(0 < p['candidates'] <= p['scanLength'])
+            self.assertTrue(p['time'] >= 0)
+        return stats
+
+    def testRationalBackendPathIsRecorded(self):
+        stats = self.scenarioRecordedPathIsConsistent('rational')
+        for p in stats.pivots:
+            self.assertTrue(p['nomBits'] > 0)
+            self.assertTrue(p['denomBits'] > 0)
+
+    def testIntegerBackendRecordsSamePathAsRationalBackend(self):
+        ratStats = self.scenarioRecordedPathIsConsistent('rational')
+        intStats = self.scenarioRecordedPathIsConsistent('integer')
+        self.assertEqual(
+            [(p['entering'], p['leaving']) for p in ratStats.pivots],
+            [(p['entering'], p['leaving']) for p in intStats.pivots])
+
+    def testPathsFromAllLabelsAreRecorded(self):
+        stats = pivotstats.PivotStats()
+        lh.lemkeHowsonAllLabels(EX1_M1, EX1_M2, stats=stats)
+        labels = []
+        for p in stats.pivots:
+            if p['label'] not in labels:
+                labels.append(p['label'])
+        self.assertEqual([1, 2, 3, 4], labels)
+
+    def testStatsAreWrittenInJson(self):
+        # This import must be here because of python 2.5 (it does not have
+        # the json module)
+        import json
+
+        stats = pivotstats.PivotStats()
+        lh.lemkeHowson(EX1_M1, EX1_M2, stats=stats)
+        stream = StringIO.StringIO()
+        stats.writeJson(stream)
+        data = json.loads(stream.getvalue())
+        self.assertEqual(stats.getPivotCount(), data['pivotCount'])
+        self.assertEqual([p['entering'] for p in stats.pivots],
+            [p['entering'] for p in data['pivots']])
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
@@ -403,6 +403,87 @@ class RationalTests(unittest.TestCase):
         b = -5
         self.assertTrue(a < b)
 
+    def testAdd1Slash6And1Slash10CreatesNormalizedRational(self):
+        a = r.Rational(1, 6)
+        b = r.Rational(1, 10)
+        c = a + b
+        self.assertEqual(4, c.nom())
+        self.assertEqual(15, c.denom())
+
+    def testAdd1Slash4AndMinus1Slash4CreatesZero(self):
+        a = r.Rational(1, 4)
+        b = r.Rational(-1, 4)
+        c = a + b
+        self.assertEqual(0, c.nom())
+        self.assertEqual(1, c.denom())
+
+    def testMul2Slash9With3Slash4CreatesNormalizedRational(self):
+        a = r.Rational(2, 9)
+        b = r.Rational(3, 4)
+        c = a * b
+        self.assertEqual(1, c.nom())
+        self.assertEqual(6, c.denom())
+
+    def testDivMinus2Slash9With4CreatesNormalizedRational(self):
+        a = r.Rational(-2, 9)
+        b = a / -4
+        self.assertEqual(1, b.nom())
+        self.assertEqual(18, b.denom())
+
+    def testValueErrorIsRaisedWhenDividingByZero(self):
+        a = r.Rational(1, 2)
+        self.assertRaises(ValueError, a.__div__, 0)
+        self.assertRaises(ValueError, a.__div__, r.Rational(0))
+
+    def testRationalsWithSameDenominatorAreComparedCorrectly(self):
+        a = r.Rational(-3, 7)
+        b = r.Rational(2, 7)
+        self.assertTrue(a < b)
+        self.assertTrue(a <= b)
+        self.assertTrue(b > a)
+        self.assertTrue(b >= a)
+
+    def testEqualRationalsHaveSameHash(self):
+        self.assertEqual(hash(r.Rational(1, 2)), hash(r.Rational(2, 4)))
+
+    def testRationalWithDenominator1HasSameHashAsInteger(self):
+        self.assertEqual(hash(3), hash(r.Rational(6, 2)))
+
+    def testRationalCanBeUsedAsDictionaryKey(self):
+        d = {r.Rational(1, 3): 'a'}
+        self.assertEqual('a', d[r.Rational(2, 6)])
+
+    def testFloatReturnsNearestFloatingPointNumber(self):
+        self.assertEqual(-0.75, float(r.Rational(-3, 4)))
+        self.assertEqual(1.0 / 3, float(r.Rational(10 ** 400 + 1,
+            3 * 10 ** 400 + 3)))
+
+    def testCommonDenominatorIsLeastCommonMultipleOfDenominators(self):
+        self.assertEqual(12, r.commonDenominator([1, r.Rational(3, 4), 5,
+            r.Rational(-1, 6), r.Rational(2, 3)]))
+
+    def testCommonDenominatorOfIntegersIs1(self):
+        self.assertEqual(1, r.commonDenominator([1, -2, r.Rational(4, 2)]))
+
+    def testScaleToIntegersMultipliesItemsByCommonDenominator(self):
+        self.assertEqual([7, 20, -10, 4], r.scaleToIntegers([r.Rational(7, 20),
+            1, r.Rational(-1, 2), r.Rational(1, 5)]))
+
+    def testScaleToIntegersAddsConstantBeforeScaling(self):
+        self.assertEqual([3, 4], r.scaleToIntegers([r.Rational(1, 2), 1],
+            r.Rational(1)))
+        self.assertEqual([3, 5], r.scaleToIntegers([1, 3], 2))
+
+    def testScaleToIntegersReturnsIntegralItemsUnchanged(self):
+        items = [1, -2, 3]
+        self.assertTrue(r.scaleToIntegers(items) is items)
+
+    def testRationalCanBePickled(self):
+        import pickle
+        a = r.Rational(-3, 7)
+        for protocol in xrange(0, pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(a, pickle.loads(pickle.dumps(a, protocol)))
+
 
 class FromTextTests(unittest.TestCase):
     def setUp(self):
@@ -432,6 +513,20 @@ class FromTextTests(unittest.TestCase):
     def testRedundantWhiteSpaceAreRemoved(self):
         self.scenarioValidTextReturnsValidResult('  3	/	4 ', r.Rational(3, 4))
 
+    def testDecimalNumberIsConvertedExactly(self):
+        self.scenarioValidTextReturnsValidResult('0.35', r.Rational(7, 20))
+
+    def testNegativeDecimalNumberWithoutIntegerPartReturnsValidResult(self):
+        self.scenarioValidTextReturnsValidResult('-.5', r.Rational(-1, 2))
+
+    def testDecimalNumberWithoutFractionalPartReturnsValidResult(self):
+        self.scenarioValidTextReturnsValidResult('+2.', r.Rational(2))
+
+    def testScientificNotationReturnsValidResult(self):
+        self.scenarioValidTextReturnsValidResult('1e3', r.Rational(1000))
+        self.scenarioValidTextReturnsValidResult('2.5E-4',
+            r.Rational(1, 4000))
+
     def scenarioInvalidRationalReprErrorIsRaisedOnInvalidText(self, text):
         try:
             a = r.fromText(text)
@@ -458,6 +553,26 @@ class FromTextTests(unittest.TestCase):
     def testInvalidRationalReprErrorIsRaisedOnNegativeDenom(self):
         self.scenarioInvalidRationalReprErrorIsRaisedOnInvalidText('1/-5')
 
+    def testInvalidRationalReprErrorIsRaisedOnLonePoint(self):
+        self.scenarioInvalidRationalReprErrorIsRaisedOnInvalidText('.')
+
+    def testInvalidRationalReprErrorIsRaisedOnMissingMantissa(self):
+        self.scenarioInvalidRationalReprErrorIsRaisedOnInvalidText('e5')
+
+    def testInvalidRationalReprErrorIsRaisedOnTwoPoints(self):
+        self.scenarioInvalidRationalReprErrorIsRaisedOnInvalidText('1.2.3')
+
+    def testInvalidRationalReprErrorIsRaisedOnDecimalNom(self):
+        self.scenarioInvalidRationalReprErrorIsRaisedOnInvalidText('1.5/2')
+
+    def testInvalidRationalReprErrorIsRaisedOnHugeExponent(self):
+        self.scenarioInvalidRationalReprErrorIsRaisedOnInvalidText(
+            '1e-999999999')
+        self.scenarioInvalidRationalReprErrorIsRaisedOnInvalidText(
+            '1e999999999')
+        self.scenarioInvalidRationalReprErrorIsRaisedOnInvalidText(
+            '0.' + 1000 * '0' + '1')
+
 
 def suite():
     """Returns a test suite that contains all tests from this module."""
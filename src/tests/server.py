@@ -0,0 +1,187 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import sys
+
+from .. import games
+from .. import io
+from .. import lh
+from .. import matrix
+from .. import server
+
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+EX2_M1 = matrix.fromText('1 3 0\n0 0 2\n2 1 1\n')
+EX2_M2 = matrix.fromText('2 1 0\n1 3 1\n0 0 3\n')
+
+
+class ParseAddressTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testPortIsTCPAddressOnDefaultHost(self):
+        self.assertEqual((server.DEFAULT_HOST, 8000),
+            server.parseAddress('8000'))
+
+    def testHostAndPortIsTCPAddress(self):
+        self.assertEqual(('localhost', 8000),
+            server.parseAddress('localhost:8000'))
+
+    def testLoopbackAddressesAreAccepted(self):
+        self.assertEqual(('127.0.0.1', 8000),
+            server.parseAddress('127.0.0.1:8000'))
+        self.assertEqual(('127.1.2.3', 8000),
+            server.parseAddress('127.1.2.3:8000'))
+
+    def testValueErrorRaisedWhenHostIsNotLoopbackAddress(self):
+        for text in ('0.0.0.0:9000', '192.168.1.1:9000', 'example.com:9000',
+                '127.0.0.256:9000', '127.0.0:9000'):
+            self.assertRaises(ValueError, server.parseAddress, text)
+
+    def testOtherAddressesArePathsToUnixSockets(self):
+        self.assertEqual('lh.sock', server.parseAddress('lh.sock'))
+        self.assertEqual('/tmp/a:1', server.parseAddress('/tmp/a:1'))
+
+
+class SolverServerTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.servers = []
+
+    def tearDown(self):
+        for s in self.servers:
+            s.shutdown()
+            s.close()
+        shutil.rmtree(self.dir)
+
+    def startServer(self, address=None, **kwargs):
+        if address is None:
+            address = os.path.join(self.dir, 'lh.sock')
+        s = server.SolverServer(address, **kwargs)
+        self.servers.append(s)
+        thread = threading.Thread(target=s.serveForever, args=(0.01,))
+        thread.setDaemon(True)
+        thread.start()
+        return s
+
+    def testGameInTextFormatIsSolved(self):
+        s = self.startServer()
+        client = server.SolverClient(s.address)
+        (status, seconds, text) = client.solveGame(EX2_M1, EX2_M2)
+        client.close()
+        self.assertEqual('ok', status)
+        self.assertEqual(io.equilibriumToStr(lh.lemkeHowson(EX2_M1, EX2_M2)),
+            text)
+        self.assertTrue(seconds >= 0)
+
+    def testGameInJsonFormatIsSolved(self):
+        s = self.startServer()
+        client = server.SolverClient(s.address)
+        response = client.solveJson({'id': 7, 'm1': [[2, 0], [0, 2]],
+            'm2': [[0, 2], [2, 0]], 'label': 3})
+        client.close()
+        self.assertEqual(7, response['id'])
+        self.assertEqual('ok', response['status'])
+        self.assertEqual(io.equilibriumToJson(
+            lh.lemkeHowson(EX1_M1, EX1_M2, initBasisVar=3)), response['eq'])
+        self.assertTrue(response['totalSeconds'] >= response['seconds'])
+
+    def testManyRequestsOfBothFormatsAreSentOverOneConnection(self):
+        s = self.startServer()
+        client = server.SolverClient(s.address)
+        for i in xrange(0, 3):
+            self.assertEqual('ok', client.solveGame(EX1_M1, EX1_M2)[0])
+            self.assertEqual('ok', client.solveJson({'m1': [[1]],
+                'm2': [['0.5']]})['status'])
+        client.close()
+
+    def testRawTextGamesAreNumberedInConnection(self):
+        s = self.startServer()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(s.address)
+        sock.sendall('1\n\n1\n---\n---\n1 2\n---\n2\n\n2\n')
+        sock.shutdown(socket.SHUT_WR)
+        data = ''
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+        sock.close()
+        lines = [line.split('\t') for line in data.splitlines()]
+        self.assertEqual([('1', 'ok'), ('2', 'error'), ('3', 'ok')],
+            [(line[0], line[1]) for line in lines])
+
+    def testInvalidRequestsReturnErrors(self):
+        s = self.startServer()
+        client = server.SolverClient(s.address)
+        self.assertEqual('error', client.solveJson({'id': 1, 'm1': [[1]]})[
+            'status'])
+        self.assertEqual('error', client.solveJson({'m1': [[1]],
+            'm2': [[1]], 'label': 3})['status'])
+        self.assertEqual('error', client.solveGame(EX1_M1, EX2_M1)[0])
+        # The connection can still be used
+        self.assertEqual('ok', client.solveGame(EX1_M1, EX1_M2)[0])
+        client.close()
+
+    def testServerListensOnTCPSocket(self):
+        s = self.startServer((server.DEFAULT_HOST, 0))
+        client = server.SolverClient(s.address)
+        self.assertEqual('ok', client.solveGame(EX1_M1, EX1_M2)[0])
+        client.close()
+
+    def testConcurrentRequestsAreSolvedByWorkerProcesses(self):
+        s = self.startServer(processes=2)
+        gameList = [games.randomGame(4, 4, 10, seed=seed)
+            for seed in xrange(0, 6)]
+        results = {}
+
+        def solveAll(k):
+            client = server.SolverClient(s.address)
+            results[k] = [client.solveGame(m1, m2)[2] for (m1, m2) in gameList]
+            client.close()
+
+        threads = [threading.Thread(target=solveAll, args=(k,))
+            for k in xrange(0, 3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expResults = [io.equilibriumToStr(lh.lemkeHowson(m1, m2))
+            for (m1, m2) in gameList]
+        self.assertEqual(3 * [expResults], [results[k] for k in xrange(0, 3)])
+
+    def testValueErrorRaisedWhenBackendIsInvalid(self):
+        self.assertRaises(ValueError, server.SolverServer,
+            os.path.join(self.dir, 'lh.sock'), 'unknown')
+
+    def testValueErrorRaisedWhenHostIsNotLoopbackAddress(self):
+        self.assertRaises(ValueError, server.SolverServer, ('0.0.0.0', 0))
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,108 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import os
+import unittest
+import sys
+
+from .. import games
+from .. import io
+from .. import lh
+from .. import matrix
+from .. import solver
+
+
+SAMPLE_GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', 'sample-games')
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+# A game that needs to be normalized
+EX2_M1 = matrix.fromText('3 1\n-1 2\n')
+EX2_M2 = matrix.fromText('2 3\n4 1\n')
+
+
+def getAvailableBackends():
+    """Returns backends whose dependencies are installed."""
+    backends = []
+    for backend in lh.BACKENDS:
+        try:
+            lh.getEngine(backend)
+        except ImportError:
+            continue
+        backends.append(backend)
+    return backends
+
+
+class LemkeHowsonSolverTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioSolverFindsSameEquilibriaAsLemkeHowson(self, games,
+            backend):
+        (rows, cols) = (games[0][0].getNumRows(), games[0][0].getNumCols())
+        s = solver.LemkeHowsonSolver(rows, cols, backend)
+        for (m1, m2) in games:
+            for label in xrange(1, rows + cols + 1):
+                self.assertEqual(
+                    lh.lemkeHowson(m1, m2, backend, initBasisVar=label),
+                    s.solve(m1, m2, label))
+
+    def testSolverFindsSameEquilibriaAsLemkeHowsonForAllBackends(self):
+        randomGames = [games.randomGame(4, 3, 10, seed=seed)
+            for seed in xrange(0, 5)]
+        for backend in getAvailableBackends():
+            self.scenarioSolverFindsSameEquilibriaAsLemkeHowson(
+                [(EX1_M1, EX1_M2), (EX2_M1, EX2_M2), (EX1_M1, EX1_M2)],
+                backend)
+            self.scenarioSolverFindsSameEquilibriaAsLemkeHowson(randomGames,
+                backend)
+
+    def testSolverFindsSameEquilibriaAsLemkeHowsonOnSampleGames(self):
+        for fileName in sorted(os.listdir(SAMPLE_GAMES_DIR)):
+            f = open(os.path.join(SAMPLE_GAMES_DIR, fileName))
+            try:
+                m1, m2 = io.parseInputMatrices(f.read())
+            finally:
+                f.close()
+            self.scenarioSolverFindsSameEquilibriaAsLemkeHowson([(m1, m2)],
+                'rational')
+
+    def testSolverSupportsFields(self):
+        s = solver.LemkeHowsonSolver(2, 2, field='fraction')
+        self.assertEqual(lh.lemkeHowson(EX2_M1, EX2_M2, field='fraction'),
+            s.solve(EX2_M1, EX2_M2))
+
+    def testValueErrorRaisedWhenGameHasDifferentSize(self):
+        s = solver.LemkeHowsonSolver(2, 2)
+        self.assertRaises(ValueError, s.solve, matrix.fromText('1 2\n'),
+            matrix.fromText('1 2\n'))
+
+    def testValueErrorRaisedWhenInitialBasisVariableIsInvalid(self):
+        s = solver.LemkeHowsonSolver(2, 2)
+        self.assertRaises(ValueError, s.solve, EX1_M1, EX1_M2, 5)
+
+    def testValueErrorRaisedWhenBackendIsAuto(self):
+        self.assertRaises(ValueError, solver.LemkeHowsonSolver, 2, 2,
+            lh.AUTO_BACKEND)
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()
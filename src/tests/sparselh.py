@@ -0,0 +1,218 @@
+# vim:fileencoding=utf8
+#
+# Project: Implementation of the Lemke-Howson algorithm for finding MNE
+# Author:  Petr Zemek <s3rvac@gmail.com>, 2009
+#
+
+import os
+import unittest
+import sys
+
+from .. import io
+from .. import lh
+from .. import matrix
+from .. import sparselh
+
+
+SAMPLE_GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', 'sample-games')
+
+EX1_M1 = matrix.fromText('2 0\n0 2\n')
+EX1_M2 = matrix.fromText('0 2\n2 0\n')
+EX2_M1 = matrix.fromText('1 3 0\n0 0 2\n2 1 1\n')
+EX2_M2 = matrix.fromText('2 1 0\n1 3 1\n0 0 3\n')
+# A sparse game that does not need to be normalized
+EX3_M1 = matrix.fromText('0 0 5 0\n7 0 0 0\n0 0 0 3\n0 2 0 0\n')
+EX3_M2 = matrix.fromText('0 4 0 0\n0 0 0 9\n6 0 0 0\n0 0 1 8\n')
+
+
+def toDenseRows(t):
+    """Returns rows of the selected sparse tableaux in the same form
+    as lh.createTableaux() (list of lists)."""
+    S = len(t.basis)
+    rows = []
+    for i in xrange(0, S):
+        row = [t.basis[i], t.values[i]] + S * [0]
+        for (label, x) in t.rows[i].items():
+            row[label + 1] = x
+        rows.append(row)
+    return rows
+
+
+def getDenseRows(t):
+    """Returns rows of the selected tableaux (Matrix) as a list of lists."""
+    return [t.getRow(i) for i in xrange(1, t.getNumRows() + 1)]
+
+
+class NormalizeMatricesTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testSparseGameIsNotChanged(self):
+        self.assertEqual((EX3_M1, EX3_M2),
+            sparselh.normalizeMatrices(EX3_M1, EX3_M2))
+
+    def testGameWithZeroColumnInFirstMatrixIsNormalized(self):
+        m1 = matrix.fromText('1 0\n1 0\n')
+        m2 = matrix.fromText('1 1\n1 1\n')
+        self.assertEqual(lh.normalizeMatrices(m1, m2),
+            sparselh.normalizeMatrices(m1, m2))
+
+    def testGameWithZeroRowInSecondMatrixIsNormalized(self):
+        m1 = matrix.fromText('1 1\n1 1\n')
+        m2 = matrix.fromText('1 1\n0 0\n')
+        self.assertEqual(lh.normalizeMatrices(m1, m2),
+            sparselh.normalizeMatrices(m1, m2))
+
+    def testGameWithNegativePayoffIsNormalized(self):
+        m1 = matrix.fromText('1 2\n3 4\n')
+        m2 = matrix.fromText('1 -1\n1 1\n')
+        self.assertEqual(lh.normalizeMatrices(m1, m2),
+            sparselh.normalizeMatrices(m1, m2))
+
+
+class GetNormalizationConstantTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testConstantIsZeroForSparseGameThatDoesNotNeedNormalization(self):
+        self.assertEqual(0, sparselh.getNormalizationConstant(EX3_M1, EX3_M2))
+
+    def testConstantIsSameAsInLhForGameWithNegativePayoff(self):
+        m1 = matrix.fromText('1 2\n3 4\n')
+        m2 = matrix.fromText('1 -1\n1 1\n')
+        self.assertEqual(2, sparselh.getNormalizationConstant(m1, m2))
+
+
+class CreateTableauxTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testTableauxIsSameAsDenseTableaux(self):
+        t = sparselh.createTableaux(EX2_M1, EX2_M2)
+        self.assertEqual(getDenseRows(lh.createTableaux(EX2_M1, EX2_M2)),
+            toDenseRows(t))
+
+    def testFilledTableauxIsSameAsTableauxOfShiftedMatrices(self):
+        t = sparselh.createTableaux(EX3_M1, EX3_M2)
+        sparselh.makePivotingStep(t, 4, 1)
+        sparselh.fillTableaux(t, EX3_M1, EX3_M2, 1)
+        self.assertEqual(getDenseRows(lh.createTableaux(
+            *lh.normalizeMatrices(EX3_M1, EX3_M2))), toDenseRows(t))
+
+    def testTableauxWithConstantIsSameAsTableauxOfShiftedMatrices(self):
+        t = sparselh.createTableaux(EX2_M1, EX2_M2, cnst=1)
+        self.assertEqual(getDenseRows(lh.createTableaux(
+            *lh.normalizeMatrices(EX2_M1, EX2_M2))), toDenseRows(t))
+
+    def testOnlyNonzeroItemsAreStored(self):
+        t = sparselh.createTableaux(EX3_M1, EX3_M2)
+        self.assertEqual(9, sum([len(row) for row in t.rows]))
+
+    def testValueErrorRaisedWhenMatricesHaveDifferentDimensions(self):
+        self.assertRaises(ValueError, sparselh.createTableaux,
+            matrix.fromText('1\n2\n'), matrix.fromText('1\n'))
+
+
+class MakePivotingStepTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioPivotingStepsAreSameAsDense(self, m1, m2, initBasisVar):
+        p1SCount = m1.getNumRows()
+        denseT = lh.createTableaux(m1, m2)
+        t = sparselh.createTableaux(m1, m2)
+        ebVar = initBasisVar
+        while True:
+            lbVar = sparselh.makePivotingStep(t, p1SCount, ebVar)
+            self.assertEqual(lh.makePivotingStep(denseT, p1SCount, ebVar),
+                lbVar)
+            self.assertEqual(getDenseRows(denseT), toDenseRows(t))
+            if abs(lbVar) == initBasisVar:
+                break
+            ebVar = -lbVar
+
+    def testEx2PivotingStepsAreSameAsDense(self):
+        for label in xrange(1, 7):
+            self.scenarioPivotingStepsAreSameAsDense(EX2_M1, EX2_M2, label)
+
+    def testEx3PivotingStepsAreSameAsDense(self):
+        for label in xrange(1, 9):
+            self.scenarioPivotingStepsAreSameAsDense(EX3_M1, EX3_M2, label)
+
+    def testZeroItemsAndColumnIndexAreKeptConsistent(self):
+        t = sparselh.createTableaux(EX3_M1, EX3_M2)
+        ebVar = 1
+        while True:
+            lbVar = sparselh.makePivotingStep(t, 4, ebVar)
+            for (k, cols) in enumerate(t.cols):
+                for i in xrange(4 * k, 4 * k + 4):
+                    for (label, x) in t.rows[i].items():
+                        self.assertNotEqual(0, x)
+                        self.assertTrue(i in cols[label])
+                for (label, rowSet) in cols.items():
+                    for i in rowSet:
+                        self.assertTrue(label in t.rows[i])
+            if abs(lbVar) == 1:
+                break
+            ebVar = -lbVar
+
+    def testValueErrorRaisedWhenEnteringVariableIsInvalid(self):
+        t = sparselh.createTableaux(EX1_M1, EX1_M2)
+        self.assertRaises(ValueError, sparselh.makePivotingStep, t, 2, 5)
+
+
+class LemkeHowsonTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def scenarioBothBackendsFindSameEquilibrium(self, m1, m2):
+        for label in xrange(1, m1.getNumRows() + m1.getNumCols() + 1):
+            self.assertEqual(
+                lh.lemkeHowson(m1, m2, 'rational', initBasisVar=label),
+                lh.lemkeHowson(m1, m2, 'sparse', initBasisVar=label))
+
+    def testEx2BothBackendsFindSameEquilibrium(self):
+        self.scenarioBothBackendsFindSameEquilibrium(EX2_M1, EX2_M2)
+
+    def testEx3BothBackendsFindSameEquilibrium(self):
+        self.scenarioBothBackendsFindSameEquilibrium(EX3_M1, EX3_M2)
+
+    def testBothBackendsFindSameEquilibriumOnSampleGames(self):
+        for fileName in sorted(os.listdir(SAMPLE_GAMES_DIR)):
+            f = open(os.path.join(SAMPLE_GAMES_DIR, fileName))
+            try:
+                m1, m2 = io.parseInputMatrices(f.read())
+            finally:
+                f.close()
+            self.scenarioBothBackendsFindSameEquilibrium(m1, m2)
+
+
+def suite():
+    """Returns a test suite that contains all tests from this module."""
+    return unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+
+
+def test():
+    """Runs all unit tests for this module."""
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
+
+
+if __name__ == '__main__':
+    test()